@@ -0,0 +1,29 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import ActivityLog
+from app.schemas.activity import ActivityLogOut
+from app.schemas.pagination import Page
+
+router = APIRouter(route_class=FastJSONRoute)
+
+# ix_activity_logs_timestamp_id / ix_activity_logs_procedure_id_timestamp_id
+ACTIVITY_ORDER = Keyset((ActivityLog.timestamp, ActivityLog.id), descending=True)
+
+
+@router.get("/activity-logs", response_model=Page[ActivityLogOut])
+async def list_activity_logs(
+    procedure_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select_projection(ActivityLogOut, ActivityLog)
+    if procedure_id is not None:
+        stmt = stmt.where(ActivityLog.procedure_id == procedure_id)
+    return page_response(await paginate(session, stmt, ACTIVITY_ORDER, page, schema=ActivityLogOut))
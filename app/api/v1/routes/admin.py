@@ -1,3 +1,35 @@
-from fastapi import APIRouter
+import asyncio
 
-router = APIRouter()
+from fastapi import APIRouter, Depends, Response
+
+from app.core.metrics import (
+    CONTENT_TYPE,
+    metrics_directory,
+    registry,
+    require_allowlisted_client,
+    require_metrics_client,
+)
+from app.core.pool_metrics import pool_stats
+from app.core.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.get("/admin/pool-stats", dependencies=[Depends(require_allowlisted_client)])
+async def read_pool_stats():
+    """Connection pool counters for this worker (checkout wait, saturation, overflow, age).
+
+    Only METRICS_ALLOWLIST clients, like /admin/metrics.
+    """
+    return pool_stats()
+
+
+@router.get("/admin/metrics", dependencies=[Depends(require_metrics_client)])
+async def read_metrics():
+    """Request, template, exception and pool metrics in the Prometheus text format.
+
+    Merged across workers when METRICS_MULTIPROC_DIR is set; only METRICS_ALLOWLIST clients.
+    """
+    # with a multiprocess directory this writes, globs and reads snapshot files: off the loop
+    body = await asyncio.to_thread(registry.export, metrics_directory())
+    return Response(body, media_type=CONTENT_TYPE)
@@ -1,3 +1,71 @@
-from fastapi import APIRouter
+import contextlib
 
-router = APIRouter()
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import get_db_session, get_read_db_session
+from app.core.logging_config import get_logger
+from app.core.passwords import authenticate_user
+from app.core.principal import load_principal
+from app.core.responses import FastJSONRoute
+from app.core.tokens import (
+    REFRESH,
+    TokenError,
+    issue_access_token,
+    issue_refresh_token,
+    revoke_token,
+    verify_token,
+)
+from app.schemas.token import RefreshRequest, RevokeRequest, TokenPair
+from app.schemas.user import UserLogin
+
+router = APIRouter(route_class=FastJSONRoute)
+logger = get_logger(__name__)
+
+
+def token_pair(user_id: int, role: str, team: str | None, session_version: int) -> TokenPair:
+    return TokenPair(
+        access_token=issue_access_token(user_id, role, team),
+        refresh_token=issue_refresh_token(user_id, session_version),
+        expires_in=settings.ACCESS_TOKEN_TTL,
+    )
+
+
+def invalid_token(detail: str) -> HTTPException:
+    return HTTPException(
+        status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+@router.post("/auth/token", response_model=TokenPair)
+async def issue_tokens(credentials: UserLogin, session: AsyncSession = Depends(get_db_session)):
+    """Exchange credentials for an access token (sent as Bearer) and a refresh token."""
+    user = await authenticate_user(session, credentials.username, credentials.password)
+    if user is None:
+        raise invalid_token("Invalid credentials")
+    return token_pair(user.id, user.role.value, user.team, user.session_version)
+
+
+@router.post("/auth/token/refresh", response_model=TokenPair)
+async def refresh_tokens(
+    body: RefreshRequest, session: AsyncSession = Depends(get_read_db_session)
+):
+    """New token pair for a refresh token; the presented refresh token is revoked (rotation)."""
+    try:
+        claims = verify_token(body.refresh_token, REFRESH)
+        principal = await load_principal(session, int(claims["sub"]), claims["ver"])
+    except (TokenError, KeyError, ValueError) as exc:
+        logger.info(f"Rejected refresh token: {exc!r}")
+        raise invalid_token("Invalid refresh token") from exc
+    if principal is None or not principal.is_active:
+        raise invalid_token("Refresh token was revoked")
+    revoke_token(body.refresh_token)
+    return token_pair(principal.id, principal.role.value, principal.team, claims["ver"])
+
+
+@router.post("/auth/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke(body: RevokeRequest):
+    """Deny an access or refresh token until it expires (this worker only)."""
+    with contextlib.suppress(TokenError):  # unsigned tokens are rejected anyway
+        revoke_token(body.token)
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import ComplianceSchedule
+from app.models.enums import TaskStatusEnum
+from app.schemas.compliance import ComplianceScheduleOut
+from app.schemas.pagination import Page
+
+router = APIRouter(route_class=FastJSONRoute)
+
+SCHEDULE_ORDER = Keyset((ComplianceSchedule.due_date, ComplianceSchedule.id))  # soonest first
+
+
+@router.get("/compliance-schedules", response_model=Page[ComplianceScheduleOut])
+async def list_compliance_schedules(
+    status: Optional[TaskStatusEnum] = None,
+    assigned_to: Optional[int] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select_projection(ComplianceScheduleOut, ComplianceSchedule)
+    if status is not None:
+        stmt = stmt.where(ComplianceSchedule.status == status)
+    if assigned_to is not None:
+        stmt = stmt.where(ComplianceSchedule.assigned_to == assigned_to)
+    return page_response(
+        await paginate(session, stmt, SCHEDULE_ORDER, page, schema=ComplianceScheduleOut)
+    )
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.principal import Principal, require_principal
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import Document
+from app.models.enums import UserRoleEnum
+from app.schemas.document import DocumentOut
+from app.schemas.pagination import Page
+
+router = APIRouter(route_class=FastJSONRoute)
+
+DOCUMENT_ORDER = Keyset((Document.uploaded_at, Document.id), descending=True)
+
+
+@router.get("/documents", response_model=Page[DocumentOut])
+async def list_documents(
+    policy_id: Optional[int] = None,
+    procedure_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+    principal: Principal = Depends(require_principal),
+):
+    """Documents uploaded by the principal; owners see all of them."""
+    stmt = select_projection(DocumentOut, Document)
+    if principal.role != UserRoleEnum.OWNER:
+        stmt = stmt.where(Document.uploaded_by == principal.id)
+    if policy_id is not None:
+        stmt = stmt.where(Document.policy_id == policy_id)
+    if procedure_id is not None:
+        stmt = stmt.where(Document.procedure_id == procedure_id)
+    return page_response(await paginate(session, stmt, DOCUMENT_ORDER, page, schema=DocumentOut))
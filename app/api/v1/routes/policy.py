@@ -0,0 +1,56 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import collection_validators, resource_validators
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import Policy
+from app.models.enums import ComplienceStatusEnum
+from app.schemas.pagination import Page
+from app.schemas.policy import PolicyOut
+
+router = APIRouter(route_class=FastJSONRoute)
+
+POLICY_ORDER = Keyset((Policy.id,))
+
+
+@router.get("/policies", response_model=Page[PolicyOut])
+async def list_policies(
+    request: Request,
+    service_id: Optional[int] = None,
+    status: Optional[ComplienceStatusEnum] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select_projection(PolicyOut, Policy)
+    if service_id is not None:
+        stmt = stmt.where(Policy.service_id == service_id)
+    if status is not None:
+        stmt = stmt.where(Policy.status == status)
+    validators = await collection_validators(session, stmt, Policy.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    return validators.apply(
+        page_response(await paginate(session, stmt, POLICY_ORDER, page, schema=PolicyOut))
+    )
+
+
+@router.get("/policies/{policy_id}", response_model=PolicyOut)
+async def read_policy(
+    policy_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    validators = await resource_validators(session, Policy.updated_at, Policy.id == policy_id)
+    if validators is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Policy not found")
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    stmt = select_projection(PolicyOut, Policy).where(Policy.id == policy_id)
+    return (await session.execute(stmt)).one()
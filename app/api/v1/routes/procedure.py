@@ -0,0 +1,73 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import collection_validators, resource_validators
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import ChecklistItem, Procedure
+from app.schemas.pagination import Page
+from app.schemas.procedure import ChecklistItemOut, ProcedureOut
+
+router = APIRouter(route_class=FastJSONRoute)
+
+PROCEDURE_ORDER = Keyset((Procedure.id,))
+CHECKLIST_ORDER = Keyset((ChecklistItem.sort_order, ChecklistItem.id))
+
+
+@router.get("/procedures", response_model=Page[ProcedureOut])
+async def list_procedures(
+    request: Request,
+    policy_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select_projection(ProcedureOut, Procedure)
+    if policy_id is not None:
+        stmt = stmt.where(Procedure.policy_id == policy_id)
+    validators = await collection_validators(session, stmt, Procedure.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    return validators.apply(
+        page_response(await paginate(session, stmt, PROCEDURE_ORDER, page, schema=ProcedureOut))
+    )
+
+
+@router.get("/procedures/{procedure_id}", response_model=ProcedureOut)
+async def read_procedure(
+    procedure_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    validators = await resource_validators(
+        session, Procedure.updated_at, Procedure.id == procedure_id
+    )
+    if validators is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Procedure not found")
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    stmt = select_projection(ProcedureOut, Procedure).where(Procedure.id == procedure_id)
+    return (await session.execute(stmt)).one()
+
+
+@router.get("/procedures/{procedure_id}/checklist-items", response_model=Page[ChecklistItemOut])
+async def list_checklist_items(
+    procedure_id: int,
+    request: Request,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select_projection(ChecklistItemOut, ChecklistItem).where(
+        ChecklistItem.procedure_id == procedure_id
+    )
+    validators = await collection_validators(session, stmt, ChecklistItem.updated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    return validators.apply(
+        page_response(await paginate(session, stmt, CHECKLIST_ORDER, page, schema=ChecklistItemOut))
+    )
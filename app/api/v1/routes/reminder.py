@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.principal import Principal, require_principal
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import Reminder
+from app.models.enums import UserRoleEnum
+from app.schemas.pagination import Page
+from app.schemas.reminder import ReminderOut
+
+router = APIRouter(route_class=FastJSONRoute)
+
+REMINDER_ORDER = Keyset((Reminder.due_date, Reminder.id))  # soonest first
+
+
+@router.get("/reminders", response_model=Page[ReminderOut])
+async def list_reminders(
+    user_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+    principal: Principal = Depends(require_principal),
+):
+    """Reminders of the principal; owners see everyone's and may filter by `user_id`."""
+    stmt = select_projection(ReminderOut, Reminder)
+    if principal.role != UserRoleEnum.OWNER:
+        user_id = principal.id  # ?user_id= cannot reach other users' reminders
+    if user_id is not None:
+        stmt = stmt.where(Reminder.user_id == user_id)
+    return page_response(await paginate(session, stmt, REMINDER_ORDER, page, schema=ReminderOut))
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_read_db_session
+from app.core.pagination import Keyset, PageParams, page_response, paginate
+from app.core.projection import select_projection
+from app.core.responses import FastJSONRoute
+from app.models.core_models import Risk
+from app.schemas.pagination import Page
+from app.schemas.risk import RiskOut
+
+router = APIRouter(route_class=FastJSONRoute)
+
+RISK_ORDER = Keyset((Risk.id,), descending=True)  # newest first
+
+
+@router.get("/risks", response_model=Page[RiskOut])
+async def list_risks(
+    status: Optional[str] = None,
+    related_policy_id: Optional[int] = None,
+    related_procedure_id: Optional[int] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_read_db_session),
+):
+    stmt = select_projection(RiskOut, Risk)
+    if status is not None:
+        stmt = stmt.where(Risk.status == status)
+    if related_policy_id is not None:
+        stmt = stmt.where(Risk.related_policy_id == related_policy_id)
+    if related_procedure_id is not None:
+        stmt = stmt.where(Risk.related_procedure_id == related_procedure_id)
+    return page_response(await paginate(session, stmt, RISK_ORDER, page, schema=RiskOut))
@@ -1,3 +1,69 @@
-from fastapi import APIRouter
+import datetime
 
-router = APIRouter()
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_db_session
+from app.core.passwords import authenticate_user
+from app.core.principal import (
+    Principal,
+    principal_cache,
+    require_principal,
+    require_role,
+    start_session,
+)
+from app.core.responses import FastJSONRoute
+from app.models.core_models import User
+from app.models.enums import UserRoleEnum
+from app.schemas.user import PrincipalOut, UserLogin, UserOut, UserUpdate
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.post("/user/login", response_model=UserOut)
+async def login(
+    credentials: UserLogin, request: Request, session: AsyncSession = Depends(get_db_session)
+):
+    """Check credentials (hashing runs off the event loop) and start a cookie session."""
+    user = await authenticate_user(session, credentials.username, credentials.password)
+    if user is None:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    user.last_login = datetime.datetime.now(datetime.timezone.utc)
+    start_session(request, user)
+    return user
+
+
+@router.post("/user/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(request: Request):
+    request.session.clear()
+
+
+@router.get("/user/me", response_model=PrincipalOut)
+async def read_me(principal: Principal = Depends(require_principal)):
+    """The current principal, served from the principal cache (no query on a hit)."""
+    return principal
+
+
+@router.patch("/users/{user_id}", response_model=UserOut)
+async def update_user(
+    user_id: int,
+    changes: UserUpdate,
+    session: AsyncSession = Depends(get_db_session),
+    _: Principal = Depends(require_role(UserRoleEnum.OWNER)),
+):
+    user = await session.get(User, user_id)
+    if user is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="User not found")
+    values = changes.model_dump(exclude_unset=True)
+    access_changed = any(
+        key in values and values[key] != getattr(user, key) for key in ("role", "is_active")
+    )
+    for key, value in values.items():
+        setattr(user, key, value)
+    if access_changed:
+        user.session_version += 1  # revoke existing sessions and refresh tokens in every worker
+    # commit before invalidating, so a concurrent request cannot re-cache the old row
+    await session.commit()
+    if access_changed:
+        principal_cache.invalidate(user_id)
+    return user
@@ -0,0 +1,271 @@
+# app/core/assets.py
+# Static asset pipeline: collectstatic build (minified, content-hashed, precompressed) and serving.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import stat
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import anyio
+from jinja2 import pass_context
+from markupsafe import Markup, escape
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import COMPRESSORS, available_encodings, is_compressible, negotiate
+from app.core.config import settings
+from app.core.images import build_image_variants, is_raster, picture_html
+
+'''
+`python forizec.py collectstatic` turns STATIC_DIR into a deployable build in STATIC_ROOT:
+- CSS is minified; STATIC_BUNDLES concatenates several sources into one file (one request).
+- Every asset is written under a content-hashed name (modern.css -> modern.3f2a9c1b7d4e.css)
+  next to an unhashed copy, and manifest.json maps logical names to hashed ones. Old hashed
+  files are kept unless --clear, so pages rendered before a deploy still find their assets.
+- Compressible hashed assets get .gz siblings (and .br/.zst when brotli/zstandard are installed),
+  compressed once at maximum level instead of per request.
+- Raster images also get resized AVIF/WebP/PNG variants (app/core/images.py); their srcset
+  metadata is stored in the manifest under "images".
+Once STATIC_ROOT has a manifest, /static serves it with PrecompressedStaticFiles: it picks the
+best sibling the client accepts, and hashed names are sent `Cache-Control: immutable` (their
+content can never change). Templates call static_url('modern.css') and
+responsive_image('logo.png', alt=..., sizes=...); without a build (dev) they fall back to the
+file in STATIC_DIR. url() references inside CSS are not rewritten; they keep
+working through the unhashed copies.
+'''
+
+MANIFEST_NAME = "manifest.json"
+PRECOMPRESS_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+SUFFIXES = {"gzip": ".gz", "br": ".br", "zstd": ".zst"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_CSS_WHITESPACE = re.compile(
+    r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')'''  # 1: strings, kept verbatim
+    r"|(/\*.*?\*/)"  # 2: comments
+    r"|\s+",
+    re.S,
+)
+_CSS_PUNCTUATION = re.compile(
+    r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')'''  # 1: strings, kept verbatim
+    r"|\s*;\s*(?=\})"  # last semicolon of a block
+    r"|\s*([{};,>])\s*"  # 2: no space needed around these
+    r"|(:)\s+",  # 3: after a colon only (".a :hover" differs from ".a:hover")
+)
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace; strings, calc() operands and selectors keep meaning."""
+
+    def whitespace(match: re.Match) -> str:
+        if match.group(1):
+            return match.group(1)
+        if match.group(2) and match.group(2).startswith("/*!"):  # license comments stay
+            return match.group(2)
+        return " "
+
+    def punctuation(match: re.Match) -> str:
+        return match.group(1) or match.group(2) or match.group(3) or ""
+
+    css = _CSS_WHITESPACE.sub(whitespace, css)
+    return _CSS_PUNCTUATION.sub(punctuation, css).strip()
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem, dot, suffix = name.rpartition(".")
+    return f"{stem}.{digest}.{suffix}" if dot and "/" not in suffix else f"{name}.{digest}"
+
+
+def precompress(content: bytes) -> dict[str, bytes]:
+    """Compressed variants of `content` that are actually smaller, by encoding."""
+    variants = {}
+    for encoding in available_encodings(list(SUFFIXES)):
+        compressor = COMPRESSORS[encoding](PRECOMPRESS_LEVELS[encoding])
+        data = compressor.compress(content) + compressor.finish()
+        if len(data) < len(content):
+            variants[encoding] = data
+    return variants
+
+
+@dataclass
+class CollectedAsset:
+    name: str
+    hashed: str
+    size: int
+    variants: dict[str, int] = field(default_factory=dict)  # encoding -> compressed size
+    image: dict[str, Any] | None = None  # responsive variants (app/core/images.py)
+
+
+def _write(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def collect_static(
+    source: Path,
+    target: Path,
+    bundles: dict[str, list[str]] | None = None,
+    *,
+    minify: bool = True,
+    clear: bool = False,
+    images: bool = True,
+    workers: int | None = None,
+) -> list[CollectedAsset]:
+    """Build `target` from `source` and write its manifest; returns what was collected."""
+    source, target = Path(source), Path(target)
+    if clear and target.exists():
+        shutil.rmtree(target)
+
+    contents: dict[str, bytes] = {}
+    for path in sorted(source.rglob("*")):
+        name = path.relative_to(source).as_posix()
+        if path.is_file() and not any(part.startswith(".") for part in name.split("/")):
+            contents[name] = path.read_bytes()
+    if minify:
+        for name in contents:
+            if name.endswith(".css"):
+                contents[name] = minify_css(contents[name].decode("utf-8")).encode("utf-8")
+    for bundle, members in (bundles or {}).items():
+        missing = [member for member in members if member not in contents]
+        if missing:
+            raise FileNotFoundError(f"Bundle {bundle} lists missing files: {', '.join(missing)}")
+        contents[bundle] = b"\n".join(contents[member] for member in members)
+
+    raster = {name: source / name for name in contents if is_raster(name)} if images else {}
+    image_variants = build_image_variants(raster, target, workers)
+
+    manifest: dict[str, str] = {}
+    collected = []
+    for name, content in contents.items():
+        hashed = hashed_name(name, content)
+        _write(target / name, content)
+        _write(target / hashed, content)
+        asset = CollectedAsset(name, hashed, len(content), image=image_variants.get(name))
+        content_type = mimetypes.guess_type(name)[0] or ""
+        if is_compressible(content_type):
+            for encoding, data in precompress(content).items():
+                _write(target / (hashed + SUFFIXES[encoding]), data)
+                asset.variants[encoding] = len(data)
+        manifest[name] = hashed
+        collected.append(asset)
+
+    # written last and atomically: a running server never sees names that aren't on disk yet
+    tmp = target / (MANIFEST_NAME + ".tmp")
+    document = {"version": 1, "paths": manifest, "images": image_variants}
+    tmp.write_text(json.dumps(document, indent=2, sort_keys=True))
+    os.replace(tmp, target / MANIFEST_NAME)
+    return collected
+
+
+class StaticManifest:
+    """Logical asset name -> hashed name (and image variants), as written by collect_static()."""
+
+    def __init__(self, paths: dict[str, str] | None = None, images: dict[str, dict] | None = None):
+        self.paths = paths or {}
+        self.images = images or {}
+        self.hashed = frozenset(self.paths.values()) | frozenset(
+            variant["path"]
+            for image in self.images.values()
+            for variants in image["variants"].values()
+            for variant in variants
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> StaticManifest:
+        try:
+            document = json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            return cls()
+        return cls(document["paths"], document.get("images"))
+
+    def __bool__(self) -> bool:
+        return bool(self.paths)
+
+    def resolve(self, name: str) -> str:
+        return self.paths.get(name, name)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves .br/.gz/.zst siblings and marks hashed names immutable."""
+
+    def __init__(self, *args, manifest: StaticManifest | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest or StaticManifest()
+        self.encodings = available_encodings(settings.COMPRESSION_ENCODINGS)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        if scope["method"] in ("GET", "HEAD"):
+            response = await self.variant_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        if path in self.manifest.hashed and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+    async def variant_response(self, path: str, scope: Scope) -> Response | None:
+        media_type = mimetypes.guess_type(path)[0]
+        if not self.encodings or not media_type or not is_compressible(media_type):
+            return None
+        headers = Headers(scope=scope)
+        accept_encoding = headers.get("accept-encoding", "")
+        accepted = [e for e in self.encodings if negotiate(accept_encoding, [e])]
+        for encoding in accepted:
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + SUFFIXES[encoding]
+                )
+            except OSError:  # e.g. name too long: let StaticFiles answer
+                return None
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(response.headers, headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
+
+
+def static_url_global(manifest: StaticManifest):
+    """Jinja global `static_url(name)`: URL of the current build of a static asset."""
+
+    @pass_context
+    def static_url(context, name: str) -> str:
+        return str(context["request"].url_for("static", path=manifest.resolve(name)))
+
+    return static_url
+
+
+def responsive_image_global(manifest: StaticManifest):
+    """Jinja global `responsive_image(name, alt, sizes, **attrs)`: <picture> with srcset."""
+
+    @pass_context
+    def responsive_image(context, name: str, alt: str = "", sizes: str = "100vw", **attrs):
+        request = context["request"]
+
+        def url_for(path: str) -> str:
+            return str(request.url_for("static", path=path))
+
+        meta = manifest.images.get(name)
+        if meta is None:  # no build yet, or Pillow missing: the original file
+            rendered = " ".join(f'{key}="{escape(value)}"' for key, value in attrs.items())
+            src = escape(url_for(manifest.resolve(name)))
+            return Markup(f'<img src="{src}" alt="{escape(alt)}" {rendered}>'.replace(" >", ">"))
+        return picture_html(meta, url_for, alt, sizes, **attrs)
+
+    return responsive_image
@@ -0,0 +1,262 @@
+# app/core/compression.py
+# Response compression: negotiates zstd/br/gzip, per-content-type levels, skips compressed media.
+
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Protocol
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+'''
+Replaces Starlette's GZipMiddleware (gzip only, level 9 for everything, always on the event loop).
+- The encoding is negotiated from Accept-Encoding (q-values honoured); ties go to the server's
+  order in COMPRESSION_ENCODINGS. br and zstd are used only when their packages are installed.
+- Levels come from COMPRESSION_LEVELS by content type ("*" is the fallback). Dynamic JSON/HTML
+  use fast levels: level 9 gzip costs several times level 5 for a few percent smaller bodies.
+- Media that is already compressed (images, audio/video, archives, fonts, PDFs) passes through
+  untouched, as do responses that already carry Content-Encoding, range responses and bodies
+  under COMPRESSION_MIN_SIZE.
+- Chunks of COMPRESSION_THREAD_THRESHOLD bytes or more are compressed in the thread pool
+  (zlib, brotli and zstd release the GIL), so one large export doesn't stall the loop.
+- Streaming responses are compressed chunk by chunk with a flush after each chunk, so clients
+  receive data as it is produced (server-sent events are never compressed).
+'''
+
+SKIP_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/x-bzip2",
+    "application/zstd",
+    "application/pdf",
+    "application/octet-stream",
+    "text/event-stream",
+)
+COMPRESSIBLE_IMAGES = ("image/svg+xml",)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...  # emit everything buffered so far, stream stays open
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._brotli = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._zstd.flush()
+
+
+COMPRESSORS: dict[str, Callable[[int], Compressor]] = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def available_encodings(preferred: list[str]) -> list[str]:
+    return [encoding for encoding in preferred if encoding in COMPRESSORS]
+
+
+def negotiate(accept_encoding: str, encodings: list[str]) -> str | None:
+    """Best of `encodings` (server preference order) for an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(COMPRESSIBLE_IMAGES):
+        return True
+    return bool(content_type) and not content_type.startswith(SKIP_CONTENT_TYPES)
+
+
+def level_for(levels: dict[str, dict[str, int]], content_type: str, encoding: str) -> int:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    for key in (media_type, media_type.split("/", 1)[0] + "/*", "*"):
+        if encoding in levels.get(key, {}):
+            return levels[key][encoding]
+    return {"gzip": 6, "br": 4, "zstd": 3}[encoding]
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: list[str] | None = None,
+        levels: dict[str, dict[str, int]] | None = None,
+        minimum_size: int | None = None,
+        thread_threshold: int | None = None,
+    ) -> None:
+        self.app = app
+        self.encodings = available_encodings(encodings or settings.COMPRESSION_ENCODINGS)
+        self.levels = levels if levels is not None else settings.COMPRESSION_LEVELS
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.thread_threshold = (
+            settings.COMPRESSION_THREAD_THRESHOLD if thread_threshold is None else thread_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Per-request state: holds http.response.start until the first body chunk decides."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+        self.content_type = ""
+        self.passthrough = False
+
+    async def _run(self, fn: Callable[[bytes], bytes], data: bytes) -> bytes:
+        if len(data) >= self.middleware.thread_threshold:
+            return await run_in_threadpool(fn, data)
+        return fn(data)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message.setdefault("headers", []))
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or "content-range" in headers  # a byte range of the identity body
+                or not is_compressible(content_type)
+            ):
+                self.passthrough = True
+            else:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                self.content_type = content_type
+            return
+        if message_type != "http.response.body":  # e.g. http.response.pathsend
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:  # first body chunk
+            if (
+                self.passthrough
+                or self.encoding is None
+                or (not more_body and len(body) < self.middleware.minimum_size)
+            ):
+                self.passthrough = True
+                await self._flush_start()
+                await self._send(message)
+                return
+            level = level_for(self.middleware.levels, self.content_type, self.encoding)
+            self.compressor = COMPRESSORS[self.encoding](level)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+        elif self.passthrough:
+            await self._send(message)
+            return
+
+        data = await self._run(self._compress_chunk if more_body else self._compress_last, body)
+        if self.start is not None:
+            if not more_body:
+                MutableHeaders(raw=self.start["headers"])["Content-Length"] = str(len(data))
+            await self._flush_start()
+        message["body"] = data
+        await self._send(message)
+
+    def _compress_chunk(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush()
+
+    def _compress_last(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.finish()
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self._send(start)
@@ -0,0 +1,115 @@
+# app/core/conditional.py
+# Conditional GET for API reads: ETag/Last-Modified from cheap aggregates, 304 before the main query.
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+
+'''
+Polling clients re-download lists that rarely change. Each conditional route first runs one
+aggregate over the same filters as the real query, e.g.
+    SELECT count(*), max(policies.updated_at) FROM policies WHERE service_id = :id
+and derives its validators from that row, without loading or serializing anything:
+- ETag: weak (the body may be re-encoded by compression), a hash of the aggregates and
+  PROJECT_VERSION, so a deploy that changes the payload shape invalidates old tags. Clients
+  keep ETags per URL, so filters and ids need not be hashed. count(*) catches deletes; max(updated_at) catches inserts and updates (models stamp
+  updated_at through the utcnow default/onupdate). Tables without updated_at can pass
+  version columns instead, e.g. max(id) for append-only logs.
+- Last-Modified: only for single resources. A delete never moves max(updated_at), so a
+  collection can only be revalidated by its ETag.
+- If-None-Match wins over If-Modified-Since (RFC 9110); a match answers 304 and the main
+  query never runs. Responses carry `Cache-Control: private, no-cache`: clients store them
+  but revalidate every time, shared caches don't store per-user API data.
+'''
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2s(repr((settings.PROJECT_VERSION, parts)).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    # SQLite hands back naive datetimes; the models store UTC
+    return value.replace(tzinfo=datetime.timezone.utc) if value.tzinfo is None else value
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime.datetime | None = None
+
+    def is_fresh(self, request: Request) -> bool:
+        """True when the client's cached copy is current (answer 304)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have whole seconds
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers())
+        return response
+
+
+async def collection_validators(
+    session: AsyncSession,
+    stmt: Select,
+    modified: InstrumentedAttribute | None,
+    *versions: InstrumentedAttribute,
+) -> Validators:
+    """Validators for the rows `stmt` (a list query with its filters) would return."""
+    aggregates = [func.count()]
+    if modified is not None:
+        aggregates.append(func.max(modified))
+    aggregates += [func.max(column) for column in versions]
+    stmt = stmt.with_only_columns(*aggregates, maintain_column_froms=True).order_by(None)
+    row = (await session.execute(stmt)).one()
+    return Validators(make_etag(*row))
+
+
+async def resource_validators(
+    session: AsyncSession, modified: InstrumentedAttribute, *criteria: Any
+) -> Validators | None:
+    """Validators for the single row matching `criteria`, or None when there is no such row."""
+    row = (await session.execute(select(modified).where(*criteria))).first()
+    if row is None:
+        return None
+    last_modified = _utc(row[0]) if row[0] is not None else None
+    return Validators(make_etag(row[0]), last_modified)
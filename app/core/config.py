@@ -24,9 +24,22 @@ class Settings(BaseSettings):
 
     DB_PATH: str = "./data/forizec.db"  # sqlite path
 
+    # SQLite profile (applied whenever the effective URL is sqlite)
+    SQLITE_READ_POOL_SIZE: int = 5
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64_000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_WRITE_BATCH_SIZE: int = 64
+    SQLITE_WRITE_QUEUE_SIZE: int = 1_000  # queued writes; submit() waits when it is full
+
     # Optional one-shot override
     DATABASE_URL: str | None = None
 
+    # Read replicas (full async URLs). Empty -> every query goes to the primary.
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"  # round_robin | least_busy
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0  # reads stay on the primary this long after a write
+
     SECRET_KEY: str
 
     PROJECT_NAME: str = "Forizec"
@@ -39,6 +52,94 @@ class Settings(BaseSettings):
     MEDIA_DIR: Path = BASE_DIR / "media"
     TEMPLATES_DIR: Path = BASE_DIR / "templates"
 
+    # Per-request SQL stats (X-DB-Query-Count / X-DB-Time headers, N+1 warnings)
+    QUERY_STATS_ENABLED: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 5  # same statement shape this many times in one request -> warn
+
+    # Logging (app/core/logging_config.py): handlers run in a listener thread behind a queue
+    LOG_DIR: Path = BASE_DIR / "logs"  # forizec.log and slow_queries.log
+    LOG_FORMAT: str = "text"  # text | json (one object per line)
+    LOG_QUEUE_SIZE: int = 10_000  # records; when full, INFO/DEBUG are dropped
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0  # 0..1, fraction of 2xx access lines logged
+
+    # Slow-query log (LOG_DIR/slow_queries.log)
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0  # 0..1, fraction of slow statements logged
+    SLOW_QUERY_MAX_PER_MINUTE: int = 60
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # Index advisor (python forizec.py advise-indexes)
+    INDEX_ADVISOR_RECORD: bool = False  # count live statement shapes, saved on shutdown
+    QUERY_PATTERNS_FILE: Path = BASE_DIR / "data" / "query_patterns.json"
+
+    # Password hashing (app/core/passwords.py)
+    PASSWORD_SCHEMES: list[str] = ["bcrypt"]  # first hashes new passwords, rest verify + rehash
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "process"  # process | thread (thread only for GIL-free backends)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 8
+
+    # Principal cache (app/core/principal.py)
+    PRINCIPAL_CACHE_TTL: float = 30.0  # seconds; bounds role/is_active staleness in other workers
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # API access/refresh tokens (app/core/tokens.py)
+    TOKEN_SIGNING_KEYS: dict[str, str] = (
+        {}
+    )  # kid -> secret; empty -> one key derived from SECRET_KEY
+    TOKEN_ACTIVE_KID: str | None = None  # signs new tokens; default: the last key listed
+    ACCESS_TOKEN_TTL: int = 15 * 60  # seconds
+    REFRESH_TOKEN_TTL: int = 14 * 24 * 3600
+    TOKEN_DENYLIST_MAX_ENTRIES: int = 100_000
+
+    # Response compression (app/core/compression.py); br/zstd need the brotli/zstandard packages
+    COMPRESSION_ENCODINGS: list[str] = ["zstd", "br", "gzip"]  # server preference on equal q
+    COMPRESSION_LEVELS: dict[str, dict[str, int]] = {
+        "*": {"gzip": 6, "br": 4, "zstd": 3},
+        "application/json": {"gzip": 5, "br": 4, "zstd": 3},  # dynamic: favour speed
+        "text/html": {"gzip": 6, "br": 5, "zstd": 6},
+        "text/css": {"gzip": 9, "br": 9, "zstd": 12},  # rarely dynamic: favour size
+        "text/javascript": {"gzip": 9, "br": 9, "zstd": 12},
+        "application/javascript": {"gzip": 9, "br": 9, "zstd": 12},
+    }
+    COMPRESSION_MIN_SIZE: int = 500  # bytes; smaller bodies are sent as is
+    COMPRESSION_THREAD_THRESHOLD: int = 64 * 1024  # chunks this large compress in the thread pool
+
+    # Static asset build (app/core/assets.py, `python forizec.py collectstatic`)
+    STATIC_ROOT: Path = BASE_DIR / "staticfiles"  # served instead of STATIC_DIR once built
+    STATIC_BUNDLES: dict[str, list[str]] = {}  # bundle name -> STATIC_DIR files, concatenated
+    STATIC_MINIFY: bool = True
+
+    # Responsive images (app/core/images.py, needs Pillow); never upscaled
+    IMAGE_WIDTHS: list[int] = [80, 160, 320, 640, 1280]
+    IMAGE_FORMATS: list[str] = ["avif", "webp"]  # plus a PNG (transparent) or JPEG fallback
+    IMAGE_QUALITY: dict[str, int] = {"avif": 55, "webp": 80, "jpeg": 82}
+    IMAGE_WORKERS: int = 0  # process pool for batch jobs (collectstatic); 0 -> CPU count
+    IMAGE_UPLOAD_WORKERS: int = 1  # process pool for optimize_upload(), per app worker
+
+    # Jinja2 templates (app/core/templating.py, `python forizec.py compiletemplates`)
+    TEMPLATE_CACHE_DIR: Path | None = (
+        BASE_DIR / "data" / "template_cache"
+    )  # None: no bytecode cache
+    TEMPLATE_PRECOMPILE: bool = True  # compile every template during startup
+    TEMPLATE_AUTO_RELOAD: bool | None = None  # re-check template files per render; None -> DEBUG
+
+    # Rendered page/fragment cache (app/core/page_cache.py), per worker
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # LRU bound on the stored HTML
+    PAGE_CACHE_TTL: float = 300.0  # seconds, unless a page or {% cache %} block sets ttl=
+
+    # Metrics (app/core/metrics.py, GET /api/v1/admin/metrics in the Prometheus text format)
+    METRICS_ENABLED: bool = True
+    # client networks allowed to scrape metrics and read /admin/pool-stats
+    METRICS_ALLOWLIST: list[str] = ["127.0.0.1/32", "::1/128"]
+    METRICS_MULTIPROC_DIR: Path | None = None  # set with several workers: snapshots are merged
+    METRICS_FLUSH_INTERVAL: float = 10.0  # seconds between a worker's snapshots
+
+    # one ASGI layer for TrustedHost/HTTPS redirect/CSRF/sessions/CORS (app/core/middleware.py)
+    FUSED_MIDDLEWARE: bool = False
+
     ALLOWED_HOSTS: list[str] = []
     ALLOWED_ORIGIN: list[str] = []
 
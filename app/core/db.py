@@ -2,13 +2,27 @@
 # This file contains the database setup and session management for the Forizec application.
 
 from __future__ import annotations
-from typing import AsyncIterator
 
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import MetaData, Select, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core.db_routing import ReadYourWrites, ReplicaPool
+from app.core.pool_metrics import InstrumentedQueuePool, install_pool_metrics
+from app.core.sqlite import (
+    install_sqlite_pragmas,
+    is_memory_sqlite_url,
+    is_sqlite_url,
+    sqlite_engine_options,
+)
 
 # Naming convention
 convention = {
@@ -22,8 +36,7 @@ convention = {
 metadata = MetaData(naming_convention=convention)
 Base = declarative_base(metadata=metadata)
 
-engine = create_async_engine(
-    settings.EFFECTIVE_DATABASE_URL,
+ENGINE_OPTIONS: dict[str, Any] = dict(
     echo=settings.DEBUG,
     pool_pre_ping=True,
     # important for Postgres/MySQL
@@ -32,23 +45,197 @@ engine = create_async_engine(
     pool_timeout=30,
 )
 
+IS_SQLITE = is_sqlite_url(settings.EFFECTIVE_DATABASE_URL)
+
+
+def _create_engine(url: str, options: dict[str, Any], name: str) -> AsyncEngine:
+    """create_async_engine() plus pool instrumentation; sized pools get checkout-wait timing."""
+    if "pool_size" in options:
+        options = {**options, "poolclass": InstrumentedQueuePool}
+    new_engine = create_async_engine(url, **options)
+    install_pool_metrics(new_engine, name)
+    return new_engine
+
+
+if IS_SQLITE:
+    # reads share a small pool; writes go through one dedicated connection (RoutingSession)
+    engine = _create_engine(
+        settings.EFFECTIVE_DATABASE_URL,
+        sqlite_engine_options(settings.EFFECTIVE_DATABASE_URL, settings.SQLITE_READ_POOL_SIZE),
+        "primary",
+    )
+    install_sqlite_pragmas(engine)
+    if is_memory_sqlite_url(settings.EFFECTIVE_DATABASE_URL):
+        writer_engine = engine  # each engine has its own in-memory database
+    else:
+        writer_engine = _create_engine(
+            settings.EFFECTIVE_DATABASE_URL,
+            sqlite_engine_options(settings.EFFECTIVE_DATABASE_URL, pool_size=1),
+            "writer",
+        )
+        install_sqlite_pragmas(writer_engine)
+else:
+    engine = _create_engine(settings.EFFECTIVE_DATABASE_URL, ENGINE_OPTIONS, "primary")
+    writer_engine = engine
+
+# Replicas serve SELECT-only work; writes and anything after a write stay on the primary.
+replica_engines = [
+    _create_engine(url, ENGINE_OPTIONS, f"replica-{i}")
+    for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+replica_pool: ReplicaPool | None = (
+    ReplicaPool(replica_engines, settings.DB_REPLICA_STRATEGY) if replica_engines else None
+)
+read_your_writes = ReadYourWrites(settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+class TrackedSession(Session):
+    """
+    Sync session behind AsyncSession that records what it did:
+    info["db_touched"] once a connection was checked out, info["db_written"] once it flushed
+    or executed anything but a SELECT (Core insert/update/delete and text() never flush).
+    """
+
+
+@event.listens_for(TrackedSession, "after_begin")
+def _mark_touched(session, transaction, connection):
+    session.info["db_touched"] = True
+
+
+@event.listens_for(TrackedSession, "before_flush")
+def _guard_readonly(session, flush_context, instances):
+    if session.info.get("readonly") and (session.new or session.dirty or session.deleted):
+        raise InvalidRequestError("Attempted to write through a read-only database session")
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_written(session, flush_context):
+    session.info["db_written"] = True
+    session.info["use_primary"] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_executed_write(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    # Core DML and text() never flush, so the before_flush guard doesn't see them
+    if orm_execute_state.session.info.get("readonly"):
+        raise InvalidRequestError("Attempted to write through a read-only database session")
+    _mark_written(orm_execute_state.session, None)  # text() counts as a write: commit it
+
+
+class RoutingSession(TrackedSession):
+    """
+    Sends plain SELECTs to a read replica and everything else to the primary.
+    A session sticks to one replica, and switches to the primary for good once it flushes
+    or when info["use_primary"] is set (read-your-writes window, explicit pinning).
+    On SQLite, a read/write session bound to the primary's read pool sends its flushes and
+    other statements, and every query after its first write, to the single writer connection.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            replica_pool is not None
+            and not self._flushing
+            and not self.info.get("use_primary")
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = replica_pool.choose()
+            return replica.sync_engine
+        if (
+            writer_engine is not engine
+            and self.bind is engine.sync_engine
+            and not self.info.get("readonly")
+            and (self._flushing or self.info.get("db_written") or not isinstance(clause, Select))
+        ):
+            return writer_engine.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
 async_session_maker = sessionmaker(
     bind=engine,  # type: ignore
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )  # type: ignore
 
 
-# async def get_async_session() -> AsyncSession:
-#     async with async_session_maker() as session:
-#         yield session
+def _has_writes(session: AsyncSession) -> bool:
+    return bool(session.new or session.dirty or session.deleted or session.info.get("db_written"))
+
+
+def _writer_key(request: Request) -> str | None:
+    """Who the read-your-writes window belongs to: the logged-in user, else the client address."""
+    if "session" in request.scope and request.session.get("user_id") is not None:
+        return f"user:{request.session['user_id']}"
+    return f"client:{request.client.host}" if request.client else None
+
+
+def _wrote_recently(request: Request, writer_key: str | None) -> bool:
+    # The cookie session carries the last write time so other workers honour the window too.
+    if "session" in request.scope:
+        last_write = request.session.get("db_write_at", 0)
+        if time.time() - last_write < settings.DB_READ_YOUR_WRITES_SECONDS:
+            return True
+    return read_your_writes.is_recent(writer_key)
+
 
+def _remember_write(request: Request, writer_key: str | None) -> None:
+    if replica_pool is None:
+        return
+    if "session" in request.scope:
+        request.session["db_write_at"] = time.time()
+    read_your_writes.mark(writer_key)
 
-async def get_db_session() -> AsyncIterator[AsyncSession]:
+
+@asynccontextmanager
+async def _session_scope(request: Request, readonly: bool) -> AsyncIterator[AsyncSession]:
+    """
+    AsyncSession only checks out a pool connection on its first query, so a request that
+    never queries costs nothing. COMMIT is only sent when something was written (a flush or a
+    non-SELECT statement); otherwise closing the session hands the connection back and the
+    pool's reset-on-return rolls it back.
+    """
+    writer_key = _writer_key(request)
     async with async_session_maker() as session:  # type: ignore
+        session.info["readonly"] = readonly
+        session.info["use_primary"] = _wrote_recently(request, writer_key)
         try:
             yield session
-            await session.commit()
-        except:
+            if not readonly and _has_writes(session):
+                await session.commit()
+                _remember_write(request, writer_key)
+        except BaseException:
             await session.rollback()
             raise
+        finally:
+            request.state.db_touched = bool(session.info.get("db_touched"))
+
+
+async def get_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Read/write session; commits only if the request wrote or left pending changes."""
+    async with _session_scope(request, readonly=False) as session:
+        yield session
+
+
+async def get_read_db_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Read-only session for GET routes; never commits and refuses to flush or run DML."""
+    async with _session_scope(request, readonly=True) as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    """Close the primary, writer and replica pools (app shutdown)."""
+    await engine.dispose()
+    if writer_engine is not engine:
+        await writer_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+
+
+def db_was_touched(request: Request) -> bool:
+    """True if a database session dependency checked out a connection for this request."""
+    return getattr(request.state, "db_touched", False)
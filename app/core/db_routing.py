@@ -0,0 +1,78 @@
+# app/core/db_routing.py
+# Replica selection and read-your-writes bookkeeping used by the routing session in app/core/db.py.
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class ReplicaPool:
+    """
+    Picks a read replica engine.
+    round_robin cycles through replicas; least_busy picks the one with the fewest checked-out connections.
+    """
+
+    STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(self, engines: Sequence[AsyncEngine], strategy: str = "round_robin"):
+        if not engines:
+            raise ValueError("ReplicaPool needs at least one replica engine")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unsupported replica strategy: {strategy}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._cycle = itertools.cycle(self.engines)
+        self._lock = threading.Lock()
+
+    def choose(self) -> AsyncEngine:
+        if self.strategy == "least_busy":
+            return min(self.engines, key=_checked_out)
+        with self._lock:
+            return next(self._cycle)
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    checkedout = getattr(engine.sync_engine.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+class ReadYourWrites:
+    """
+    Remembers who wrote recently so their reads go to the primary until replicas catch up.
+    Keys are opaque strings (user id, client address); entries expire after `window` seconds.
+    """
+
+    def __init__(self, window: float, max_entries: int = 10_000):
+        self.window = window
+        self.max_entries = max_entries
+        self._deadlines: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str | None) -> None:
+        if not key or self.window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._deadlines) >= self.max_entries:
+                self._prune(now)
+            self._deadlines[key] = now + self.window
+
+    def is_recent(self, key: str | None) -> bool:
+        if not key:
+            return False
+        deadline = self._deadlines.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def _prune(self, now: float) -> None:
+        self._deadlines = {k: d for k, d in self._deadlines.items() if d > now}
+        # still full: drop the oldest half rather than grow without bound
+        if len(self._deadlines) >= self.max_entries:
+            keep = sorted(self._deadlines.items(), key=lambda kv: kv[1])[
+                len(self._deadlines) // 2 :
+            ]
+            self._deadlines = dict(keep)
@@ -1,9 +1,12 @@
 from fastapi import Request, status, FastAPI
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse
 from sqlalchemy.exc import IntegrityError, OperationalError
 from app.core.logging_config import get_logger
 from app.core.config import settings
+from app.core.metrics import EXCEPTIONS
+from app.core.responses import FastJSONResponse
+import functools
 import traceback
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -21,7 +24,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             content=f"<h1>422 Validation Error</h1><pre>{exc.errors()}</pre>",
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors(), "body": exc.body},
     )
@@ -35,7 +38,11 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             content=f"<h1>{exc.status_code} Error</h1><p>{exc.detail}</p>",
             status_code=exc.status_code,
         )
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return FastJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),  # e.g. WWW-Authenticate on 401
+    )
 
 
 async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -54,7 +61,7 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
 
     if want_html(request):
         return HTMLResponse(content=content, status_code=exc.status_code)
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail or content})
+    return FastJSONResponse(status_code=exc.status_code, content={"detail": exc.detail or content})
 
 
 async def integrity_error_handler(request: Request, exc: IntegrityError):
@@ -64,7 +71,9 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
             content=f"<h1>Integrity error occurred</h1><pre>{exc.orig}</pre>",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc.orig)})
+    return FastJSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc.orig)}
+    )
 
 
 async def db_operational_error_handler(request: Request, exc: OperationalError):
@@ -74,7 +83,7 @@ async def db_operational_error_handler(request: Request, exc: OperationalError):
             content="<h1>Database Error</h1><p>Cannot connect to database.</p>",
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": "Database unavailable"}
     )
 
@@ -86,7 +95,9 @@ async def file_not_found_handler(request: Request, exc: FileNotFoundError):
             content="<h1>File Not Found</h1><p>The requested file could not be located.</p>",
             status_code=status.HTTP_404_NOT_FOUND,
         )
-    return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "File not found"})
+    return FastJSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND, content={"detail": "File not found"}
+    )
 
 
 async def server_error_handler(request: Request, exc: Exception):
@@ -96,7 +107,7 @@ async def server_error_handler(request: Request, exc: Exception):
             content="<h1>500 - Internal Server Error</h1><p>Something went wrong.</p>",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": str(exc) if settings.DEBUG else "Internal Server Error",
@@ -112,7 +123,7 @@ async def permission_exception_handler(request: Request, exc: PermissionError):
             content="<h1>Permission Denied</h1><p>You do not have access to this resource.</p>",
             status_code=status.HTTP_403_FORBIDDEN,
         )
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_403_FORBIDDEN,
         content={"detail": "Permission denied. You do not have access to this resource."},
     )
@@ -125,18 +136,33 @@ async def timeout_exception_handler(request: Request, exc: TimeoutError):
             content="<h1>Request Timeout</h1><p>The server took too long to respond.</p>",
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
         )
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_504_GATEWAY_TIMEOUT,
         content={"detail": "The server took too long to respond. Please try again later."},
     )
 
 
+def counted(handler):
+    """`handler`, counting what it answers in http_exceptions_total{handler, exception}."""
+
+    @functools.wraps(handler)
+    async def wrapper(request: Request, exc: Exception):
+        EXCEPTIONS.inc(handler.__name__, type(exc).__name__)
+        return await handler(request, exc)
+
+    return wrapper
+
+
 def register_exception_handlers(app: FastAPI):
-    app.add_exception_handler(RequestValidationError, validation_exception_handler)  # type: ignore
-    app.add_exception_handler(StarletteHTTPException, starlette_http_exception_handler)  # type: ignore
-    app.add_exception_handler(IntegrityError, integrity_error_handler)  # type: ignore
-    app.add_exception_handler(OperationalError, db_operational_error_handler)  # type: ignore
-    app.add_exception_handler(FileNotFoundError, file_not_found_handler)  # type: ignore
-    app.add_exception_handler(PermissionError, permission_exception_handler)  # type: ignore
-    app.add_exception_handler(TimeoutError, timeout_exception_handler)  # type: ignore
-    app.add_exception_handler(Exception, server_error_handler)  # final catch-all
+    handlers = [
+        (RequestValidationError, validation_exception_handler),
+        (StarletteHTTPException, starlette_http_exception_handler),
+        (IntegrityError, integrity_error_handler),
+        (OperationalError, db_operational_error_handler),
+        (FileNotFoundError, file_not_found_handler),
+        (PermissionError, permission_exception_handler),
+        (TimeoutError, timeout_exception_handler),
+        (Exception, server_error_handler),  # final catch-all
+    ]
+    for exc_class, handler in handlers:
+        app.add_exception_handler(exc_class, counted(handler))  # type: ignore
@@ -0,0 +1,227 @@
+# app/core/images.py
+# Responsive image variants (AVIF/WebP plus PNG or JPEG, several widths) for static and media images.
+
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from markupsafe import Markup, escape
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # optional: pip install Pillow
+    Image = None
+
+logger = get_logger(__name__)
+
+'''
+A 1024px, 1.3 MB PNG shown 40px high costs the landing page more than everything else combined.
+- render_variants() writes each image at every IMAGE_WIDTHS width below its own (never
+  upscaled; the original width is added when it is smaller than the largest configured one)
+  in every IMAGE_FORMATS format Pillow can encode, plus a fallback: PNG when the image has
+  transparency, JPEG otherwise. File names are content-hashed like the rest of the build.
+- The result is plain metadata (width, height, fallback, variants by format) that goes into
+  the static manifest under "images"; responsive_image() turns it into a <picture> element
+  whose srcset lets the browser fetch the smallest file that fills the rendered size.
+- Encoding is CPU-bound (AVIF and WebP take tens to hundreds of ms per variant), so batch jobs
+  (collectstatic, optimize-images) fan out over a process pool. Uploaded images go through
+  optimize_upload(), which runs render_variants in a small process pool (IMAGE_UPLOAD_WORKERS,
+  created on first use) via run_in_executor, never on the event loop.
+Without Pillow, nothing is generated and templates fall back to a plain <img> of the original.
+'''
+
+RASTER_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "png": "png", "jpeg": "jpg"}
+
+
+def available_formats(preferred: list[str]) -> list[str]:
+    """Modern formats from `preferred` that this Pillow build can encode."""
+    if Image is None:
+        return []
+    return [fmt for fmt in preferred if fmt in ("avif", "webp") and features.check(fmt)]
+
+
+def is_raster(name: str) -> bool:
+    return name.lower().endswith(RASTER_SUFFIXES)
+
+
+def variant_widths(width: int, widths: list[int]) -> list[int]:
+    chosen = sorted(w for w in set(widths) if w < width)
+    if not chosen or max(widths) >= width:
+        chosen.append(width)
+    return chosen
+
+
+def _encode(image, fmt: str, quality: dict[str, int]) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "png":
+        image.save(buffer, "PNG", compress_level=6)  # 9 is ~6x slower for ~5% smaller files
+    else:
+        image.save(buffer, fmt.upper(), quality=quality.get(fmt, 80))
+    return buffer.getvalue()
+
+
+def render_variants(
+    source: str,
+    target: str,
+    name: str,
+    widths: list[int],
+    formats: list[str],
+    quality: dict[str, int],
+) -> dict[str, Any]:
+    """Write the variants of image `source` into `target` (as `name`-<width>w.<hash>.<ext>).
+
+    Top-level and argument-only, so it can run in a worker process.
+    """
+    from app.core.assets import hashed_name
+
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)  # phone uploads are often stored rotated
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    fallback = "png" if has_alpha else "jpeg"
+    width, height = image.size
+    stem = name.rsplit(".", 1)[0]
+    meta: dict[str, Any] = {
+        "width": width,
+        "height": height,
+        "fallback": fallback,
+        "variants": {fmt: [] for fmt in [*formats, fallback]},
+    }
+    for variant_width in variant_widths(width, widths):
+        variant_height = max(1, round(height * variant_width / width))
+        resized = (
+            image
+            if variant_width == width
+            else image.resize((variant_width, variant_height), Image.Resampling.LANCZOS)
+        )
+        for fmt in meta["variants"]:
+            data = _encode(resized, fmt, quality)
+            path = hashed_name(f"{stem}-{variant_width}w.{EXTENSIONS[fmt]}", data)
+            (Path(target) / path).parent.mkdir(parents=True, exist_ok=True)
+            (Path(target) / path).write_bytes(data)
+            meta["variants"][fmt].append({"path": path, "width": variant_width, "size": len(data)})
+    return meta
+
+
+def _render_options() -> dict[str, Any]:
+    return dict(
+        widths=list(settings.IMAGE_WIDTHS),
+        formats=available_formats(settings.IMAGE_FORMATS),
+        quality=dict(settings.IMAGE_QUALITY),
+    )
+
+
+def build_image_variants(
+    images: dict[str, Path], target: Path, workers: int | None = None
+) -> dict[str, dict[str, Any]]:
+    """Variants for many images (logical name -> source file), spread over a process pool."""
+    if Image is None or not images:
+        return {}
+    options = _render_options()
+    workers = min(workers or settings.IMAGE_WORKERS or os.cpu_count() or 1, len(images))
+    jobs = {
+        name: partial(render_variants, str(source), str(target), name, **options)
+        for name, source in images.items()
+    }
+    results = {}
+    with ProcessPoolExecutor(workers) if workers > 1 else _InlineExecutor() as pool:
+        futures = {name: pool.submit(job) for name, job in jobs.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except OSError as exc:  # includes PIL.UnidentifiedImageError
+                logger.warning(f"Skipping image {name}: {exc}")
+    return results
+
+
+class _InlineExecutor(Executor):
+    """Runs jobs on submit; single-image builds and tests don't need worker processes."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+
+_upload_executor: ProcessPoolExecutor | None = None
+
+
+async def optimize_upload(
+    source: Path, name: str, target: Path | None = None
+) -> dict[str, Any] | None:
+    """Variant metadata for an uploaded image (store it with the upload), or None.
+
+    None means there is nothing to do: not a raster image, not an image, or no Pillow.
+    Variants are written under `target` (default MEDIA_DIR/images).
+    """
+    global _upload_executor
+    if Image is None or not is_raster(name):
+        return None
+    if _upload_executor is None:
+        _upload_executor = ProcessPoolExecutor(settings.IMAGE_UPLOAD_WORKERS)
+    target = target if target is not None else settings.MEDIA_DIR / "images"
+    job = partial(render_variants, str(source), str(target), name, **_render_options())
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_upload_executor, job)
+    except OSError as exc:  # includes PIL.UnidentifiedImageError: not really an image
+        logger.warning(f"Could not optimize uploaded image {name}: {exc}")
+        return None
+
+
+def shutdown_upload_executor() -> None:
+    global _upload_executor
+    if _upload_executor is not None:
+        _upload_executor.shutdown(wait=False, cancel_futures=True)
+        _upload_executor = None
+
+
+def picture_html(
+    meta: dict[str, Any],
+    url_for: Callable[[str], str],
+    alt: str,
+    sizes: str = "100vw",
+    **attrs: Any,
+) -> Markup:
+    """<picture> with one <source> per modern format and the fallback <img> (srcset/sizes set)."""
+
+    def srcset(fmt: str) -> str:
+        return ", ".join(f"{url_for(v['path'])} {v['width']}w" for v in meta["variants"][fmt])
+
+    fallback = meta["variants"][meta["fallback"]]
+    # src only matters to browsers without srcset: a mid-size file rather than the full original
+    src = next((v for v in fallback if v["width"] >= 320), fallback[-1])
+    img_attrs = {
+        "src": url_for(src["path"]),
+        "srcset": srcset(meta["fallback"]),
+        "sizes": sizes,
+        "width": meta["width"],
+        "height": meta["height"],  # reserves the box before the image arrives (no layout shift)
+        "alt": alt,
+        "decoding": "async",
+        **attrs,
+    }
+    parts = ["<picture>"]
+    for fmt in meta["variants"]:
+        if fmt != meta["fallback"]:
+            parts.append(
+                f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(srcset(fmt))}" '
+                f'sizes="{escape(sizes)}">'
+            )
+    rendered = " ".join(f'{key}="{escape(value)}"' for key, value in img_attrs.items())
+    parts.append(f"<img {rendered}>")
+    parts.append("</picture>")
+    return Markup("".join(parts))
@@ -0,0 +1,468 @@
+# app/core/index_advisor.py
+# Index advisor: aggregates WHERE / ORDER BY column sets from observed SQL and proposes composite indexes.
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import MetaData, UniqueConstraint
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.query_stats import add_query_observer, normalize_statement, untracked
+from app.core.slow_query import format_plan
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None
+
+logger = get_logger(__name__)
+
+'''
+Patterns come from two places:
+- live traffic: with INDEX_ADVISOR_RECORD on, every SELECT/UPDATE/DELETE shape is counted in memory
+  and merged into QUERY_PATTERNS_FILE on shutdown;
+- replayed logs: logs/slow_queries.log (JSON lines) or a previously saved patterns file.
+Each shape is reduced to one candidate per table: equality columns first (=, IN, IS), then either the
+first range column (<, >, BETWEEN, LIKE) or the ORDER BY columns. Candidates already served by an index,
+primary key or unique constraint in Base.metadata (same equality set as a prefix, then the same
+trailing columns in order) are dropped, as are single-column candidates and PK lookups.
+The benefit is estimated (opt-in, `--explain --database-url`) by running EXPLAIN, creating the index,
+running EXPLAIN again and removing it. On Postgres the whole probe is one transaction that is rolled back,
+so the index is never committed; it needs PostgreSQL 16+ for EXPLAIN (GENERIC_PLAN) and is skipped on
+older servers. SQLite and MySQL commit DDL, so there the index is created and dropped again.
+Point it at a staging copy: CREATE INDEX on a large production table is neither cheap nor lock-free.
+'''
+
+MAX_INDEX_COLUMNS = 4
+MAX_RECORDED_SHAPES = 5000
+
+_IDENT = r'"?(\w+)"?'
+_TABLE_REF = re.compile(rf"\b(?:FROM|JOIN|UPDATE)\s+{_IDENT}(?:\s+AS\s+{_IDENT})?", re.IGNORECASE)
+_WHERE = re.compile(
+    r"\bWHERE\b(.*?)(?=\bORDER\s+BY\b|\bGROUP\s+BY\b|\bHAVING\b|\bLIMIT\b|\bOFFSET\b"
+    r"|\bRETURNING\b|\bFOR\s+UPDATE\b|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_ORDER_BY = re.compile(
+    r"\bORDER\s+BY\b(.*?)(?=\bLIMIT\b|\bOFFSET\b|\bFOR\s+UPDATE\b|\)|$)", re.I | re.S
+)
+_PREDICATE = re.compile(
+    rf"{_IDENT}\.{_IDENT}\s*(?P<op>NOT\s+IN\b|NOT\s+LIKE\b|IN\b|IS\b|LIKE\b|BETWEEN\b|<=|>=|!=|<>|=|<|>)"
+    rf"(?P<rhs>\s*{_IDENT}\.)?",
+    re.IGNORECASE,
+)
+_COLUMN = re.compile(rf"{_IDENT}\.{_IDENT}")
+_EQUALITY_OPS = {"=", "IN", "IS"}
+_RANGE_OPS = {"<", ">", "<=", ">=", "BETWEEN", "LIKE"}
+_PLACEHOLDER = re.compile(r"\$\?|\$\d+|\?|%s")
+
+
+@dataclass(frozen=True)
+class IndexCandidate:
+    table: str
+    equality: tuple[str, ...]  # order-insensitive part, kept sorted
+    trailing: tuple[str, ...] = ()  # range column or ORDER BY columns, order matters
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (*self.equality, *self.trailing)
+
+    @property
+    def name(self) -> str:
+        return f"ix_{self.table}_{'_'.join(self.columns)}"
+
+
+@dataclass
+class IndexAdvice:
+    candidate: IndexCandidate
+    count: int = 0
+    example: str = ""
+    plan_before: list[str] | None = None
+    plan_after: list[str] | None = None
+    cost_before: float | None = None
+    cost_after: float | None = None
+    error: str | None = None
+    _example_count: int = field(default=0, repr=False)
+
+    @property
+    def benefit(self) -> float | None:
+        """Fraction of the estimated plan cost removed by the index (0.75 = 75% cheaper)."""
+        if not self.cost_before or self.cost_after is None:
+            return None
+        return max(0.0, 1 - self.cost_after / self.cost_before)
+
+
+def _table_aliases(statement: str) -> dict[str, str]:
+    aliases: dict[str, str] = {}
+    for match in _TABLE_REF.finditer(statement):
+        table, alias = match.group(1), match.group(2)
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def _dedupe(columns: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(columns))
+
+
+def extract_candidates(statement: str) -> list[IndexCandidate]:
+    """One composite index candidate per table referenced in the WHERE / ORDER BY of `statement`."""
+    aliases = _table_aliases(statement)
+    equality: dict[str, list[str]] = {}
+    ranges: dict[str, list[str]] = {}
+    order_by: dict[str, list[str]] = {}
+
+    for where in _WHERE.finditer(statement):
+        for match in _PREDICATE.finditer(where.group(1)):
+            table = aliases.get(match.group(1))
+            op = " ".join(match.group("op").upper().split())
+            if table is None or match.group("rhs"):  # unknown table, or a join condition
+                continue
+            if op in _EQUALITY_OPS:
+                equality.setdefault(table, []).append(match.group(2))
+            elif op in _RANGE_OPS:
+                ranges.setdefault(table, []).append(match.group(2))
+
+    for clause in _ORDER_BY.finditer(statement):
+        for match in _COLUMN.finditer(clause.group(1)):
+            table = aliases.get(match.group(1))
+            if table is not None:
+                order_by.setdefault(table, []).append(match.group(2))
+
+    candidates = []
+    for table in dict.fromkeys([*equality, *ranges, *order_by]):
+        eq = sorted(set(equality.get(table, [])))
+        if table in ranges:
+            trailing = [c for c in ranges[table] if c not in eq][:1]
+        else:
+            trailing = [c for c in _dedupe(order_by.get(table, [])) if c not in eq]
+        columns = (eq + trailing)[:MAX_INDEX_COLUMNS]
+        if len(columns) < 2:
+            continue
+        eq_part = tuple(c for c in columns if c in eq)
+        candidates.append(IndexCandidate(table, eq_part, tuple(columns[len(eq_part) :])))
+    return candidates
+
+
+def _existing_indexes(metadata: MetaData) -> dict[str, list[tuple[str, ...]]]:
+    existing: dict[str, list[tuple[str, ...]]] = {}
+    for table in metadata.tables.values():
+        column_lists = [tuple(c.name for c in index.columns) for index in table.indexes]
+        column_lists.append(tuple(c.name for c in table.primary_key.columns))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                column_lists.append(tuple(c.name for c in constraint.columns))
+        for column in table.columns:
+            if column.unique:
+                column_lists.append((column.name,))
+        existing[table.name] = [cols for cols in column_lists if cols]
+    return existing
+
+
+def _unique_columns(metadata: MetaData) -> dict[str, set[str]]:
+    unique: dict[str, set[str]] = {}
+    for table in metadata.tables.values():
+        names = {c.name for c in table.columns if c.unique}
+        if len(table.primary_key.columns) == 1:
+            names.update(c.name for c in table.primary_key.columns)
+        unique[table.name] = names
+    return unique
+
+
+def is_covered(candidate: IndexCandidate, indexes: Iterable[tuple[str, ...]]) -> bool:
+    """True if an existing index has the candidate's equality columns (any order) then its trailing ones."""
+    n_eq = len(candidate.equality)
+    for columns in indexes:
+        if len(columns) < len(candidate.columns):
+            continue
+        if set(columns[:n_eq]) == set(candidate.equality) and (
+            columns[n_eq : len(candidate.columns)] == candidate.trailing
+        ):
+            return True
+    return False
+
+
+def advise(shapes: Counter, metadata: MetaData, min_count: int = 1) -> list[IndexAdvice]:
+    """Missing composite indexes for the observed statement shapes, most used first."""
+    existing = _existing_indexes(metadata)
+    unique = _unique_columns(metadata)
+    advice: dict[IndexCandidate, IndexAdvice] = {}
+    for shape, count in shapes.items():
+        for candidate in extract_candidates(shape):
+            if candidate.table not in existing:
+                continue
+            known = {c.name for c in metadata.tables[candidate.table].columns}
+            if not set(candidate.columns) <= known:
+                continue
+            if unique[candidate.table] & set(
+                candidate.equality
+            ):  # a unique lookup needs nothing more
+                continue
+            if is_covered(candidate, existing[candidate.table]):
+                continue
+            item = advice.setdefault(candidate, IndexAdvice(candidate))
+            item.count += count
+            if count > item._example_count:
+                item.example, item._example_count = shape, count
+    ranked = sorted(advice.values(), key=lambda a: (-a.count, a.candidate.name))
+    return [item for item in ranked if item.count >= min_count]
+
+
+# ---- pattern sources ----
+
+
+class PatternRecorder:
+    """Counts statement shapes seen by this process (bounded), for save_query_patterns()."""
+
+    def __init__(self, max_shapes: int = MAX_RECORDED_SHAPES):
+        self.max_shapes = max_shapes
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str) -> None:
+        if statement.lstrip()[:6].upper() not in ("SELECT", "UPDATE", "DELETE"):
+            return
+        shape = normalize_statement(statement)
+        with self._lock:
+            if shape in self.shapes or len(self.shapes) < self.max_shapes:
+                self.shapes[shape] += 1
+
+
+recorder = PatternRecorder()
+
+
+def _on_query(conn, statement, parameters, context, executemany, elapsed) -> None:
+    recorder.record(statement)
+
+
+def install_pattern_recorder() -> None:
+    if settings.INDEX_ADVISOR_RECORD:
+        add_query_observer(_on_query)
+
+
+def load_patterns(path: Path) -> Counter:
+    """Read a saved patterns file ({"shapes": {shape: count}}) or a slow-query JSON-lines log."""
+    shapes: Counter = Counter()
+    text = path.read_text(encoding="utf-8")
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict) and "shapes" in data:
+        shapes.update(data["shapes"])
+        return shapes
+    for line in text.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(entry, dict) and entry.get("statement"):
+            shapes[normalize_statement(entry["statement"])] += 1
+    return shapes
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive advisory lock on `path`.lock, held across a read-merge-replace of `path`."""
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def save_query_patterns(path: Path | None = None) -> None:
+    """Merge the shapes recorded by this process into the patterns file (app shutdown)."""
+    path = Path(path or settings.QUERY_PATTERNS_FILE)
+    with recorder._lock:
+        recorded, recorder.shapes = recorder.shapes, Counter()
+    if not recorded:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # every worker saves on shutdown: the lock keeps one worker's merge from overwriting
+    # another's, and the per-process temp file keeps their writes apart
+    with _file_lock(path):
+        shapes = load_patterns(path) if path.exists() else Counter()
+        shapes.update(recorded)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            suffix=".tmp",
+            delete=False,
+            encoding="utf-8",
+        ) as tmp:
+            json.dump({"shapes": dict(shapes.most_common())}, tmp, indent=1)
+        os.replace(tmp.name, path)
+    logger.info(f"Saved {len(recorded)} query shapes to {path}")
+
+
+# ---- EXPLAIN before / after ----
+
+_SQLITE_STEP_COST = (
+    ("USING COVERING INDEX", 1.0),
+    ("USING INTEGER PRIMARY KEY", 2.0),
+    ("USING PRIMARY KEY", 2.0),
+    ("USING INDEX", 3.0),
+    ("USE TEMP B-TREE", 50.0),
+    ("SCAN", 100.0),
+)
+_PG_COST = re.compile(r"cost=[\d.]+\.\.([\d.]+)")
+
+
+def plan_cost(dialect_name: str, plan: list[str]) -> float | None:
+    """
+    Comparable cost of a plan. Postgres: the planner's total cost.
+    SQLite gives no costs, so each step is scored (full scan 100, temp sort 50, index search 1-3).
+    """
+    if dialect_name == "postgresql":
+        match = _PG_COST.search(plan[0]) if plan else None
+        return float(match.group(1)) if match else None
+    if dialect_name == "sqlite":
+        total = 0.0
+        for step in plan:
+            step = step.upper()
+            total += next((cost for marker, cost in _SQLITE_STEP_COST if marker in step), 0.0)
+        return total
+    return None
+
+
+def explainable_statement(dialect_name: str, shape: str) -> tuple[str, str] | None:
+    """(EXPLAIN prefix, statement) with the shape's placeholders made plannable without values."""
+    if dialect_name == "postgresql":
+        counter = iter(range(1, 10_000))
+        statement = _PLACEHOLDER.sub(lambda m: f"${next(counter)}", shape)
+        return "EXPLAIN (GENERIC_PLAN) ", statement  # PostgreSQL 16+
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN ", _PLACEHOLDER.sub("NULL", shape)
+    if dialect_name in ("mysql", "mariadb"):
+        return "EXPLAIN ", _PLACEHOLDER.sub("NULL", shape)
+    return None
+
+
+async def estimate_benefit(engine: AsyncEngine, item: IndexAdvice) -> None:
+    """Fill in plans and costs for `item`: EXPLAIN, CREATE INDEX, EXPLAIN, then undo the index."""
+    dialect = engine.dialect.name
+    prepared = explainable_statement(dialect, item.example)
+    if prepared is None:
+        item.error = f"EXPLAIN is not supported for {dialect}"
+        return
+    prefix, statement = prepared
+    candidate = item.candidate
+    columns = ", ".join(candidate.columns)
+    transactional_ddl = dialect == "postgresql"  # roll the index back instead of dropping it
+    drop = (
+        f"DROP INDEX {candidate.name} ON {candidate.table}"
+        if dialect in ("mysql", "mariadb")
+        else f"DROP INDEX IF EXISTS {candidate.name}"
+    )
+    with untracked():
+        async with engine.connect() as conn:
+            if transactional_ddl and (conn.dialect.server_version_info or (0,)) < (16,):
+                item.error = "needs PostgreSQL 16+ (EXPLAIN GENERIC_PLAN)"
+                return
+            try:
+                result = await conn.exec_driver_sql(prefix + statement)
+                item.plan_before = format_plan(dialect, result.fetchall())
+                await conn.exec_driver_sql(
+                    f"CREATE INDEX {candidate.name} ON {candidate.table} ({columns})"
+                )
+                try:
+                    result = await conn.exec_driver_sql(prefix + statement)
+                    item.plan_after = format_plan(dialect, result.fetchall())
+                finally:
+                    if not transactional_ddl:
+                        await conn.exec_driver_sql(drop)
+                if transactional_ddl:
+                    await conn.rollback()
+                else:
+                    await conn.commit()
+            except Exception as exc:  # one bad candidate must not stop the report
+                await conn.rollback()
+                item.error = str(exc).splitlines()[0]
+                return
+    item.cost_before = plan_cost(dialect, item.plan_before or [])
+    item.cost_after = plan_cost(dialect, item.plan_after or [])
+
+
+# ---- Alembic revision ----
+
+
+def model_snippet(advice: list[IndexAdvice]) -> str:
+    """__table_args__ entries to add to the models so autogenerate does not drop the new indexes."""
+    lines = []
+    for item in advice:
+        cols = ", ".join(repr(c) for c in item.candidate.columns)
+        lines.append(f"# {item.candidate.table}: Index({item.candidate.name!r}, {cols})")
+    return "\n".join(lines)
+
+
+def render_revision(
+    advice: list[IndexAdvice], revision: str, down_revision: str | None, message: str
+) -> str:
+    created = datetime.datetime.now()
+    upgrades, downgrades = [], []
+    for item in advice:
+        c = item.candidate
+        benefit = f"{item.benefit:.0%} cheaper plan" if item.benefit is not None else "not measured"
+        upgrades.append(
+            f"    # seen {item.count}x, {benefit}\n"
+            f"    with op.batch_alter_table({c.table!r}, schema=None) as batch_op:\n"
+            f"        batch_op.create_index(batch_op.f({c.name!r}), {list(c.columns)!r}, unique=False)\n"
+        )
+        downgrades.append(
+            f"    with op.batch_alter_table({c.table!r}, schema=None) as batch_op:\n"
+            f"        batch_op.drop_index(batch_op.f({c.name!r}))\n"
+        )
+    return (
+        f'"""{message}\n\n'
+        f"Revision ID: {revision}\n"
+        f"Revises: {down_revision or ''}\n"
+        f"Create Date: {created}\n\n"
+        "Proposed by `python forizec.py advise-indexes`. Review before applying, and add the\n"
+        "matching Index() to the models:\n"
+        f"{model_snippet(advice)}\n"
+        '"""\n\n'
+        "from typing import Sequence, Union\n\n"
+        "from alembic import op\n"
+        "import sqlalchemy as sa\n\n\n"
+        "# revision identifiers, used by Alembic.\n"
+        f"revision: str = {revision!r}\n"
+        f"down_revision: Union[str, Sequence[str], None] = {down_revision!r}\n"
+        "branch_labels: Union[str, Sequence[str], None] = None\n"
+        "depends_on: Union[str, Sequence[str], None] = None\n\n\n"
+        "def upgrade() -> None:\n"
+        '    """Upgrade schema."""\n'
+        f"{''.join(upgrades)}\n\n"
+        "def downgrade() -> None:\n"
+        '    """Downgrade schema."""\n'
+        f"{''.join(reversed(downgrades))}"
+    )
+
+
+def write_revision(advice: list[IndexAdvice], message: str = "advised composite indexes") -> Path:
+    """Write a new revision on top of the current head into migrations/versions/."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    from alembic.util import rev_id
+
+    config = Config(str(settings.BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(settings.BASE_DIR / "migrations"))
+    script = ScriptDirectory.from_config(config)
+    revision = rev_id()
+    path = Path(script.versions) / f"{revision}_{message.replace(' ', '_')}.py"
+    path.write_text(render_revision(advice, revision, script.get_current_head(), message))
+    return path
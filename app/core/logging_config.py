@@ -1,28 +1,190 @@
+import atexit
+import copy
+import datetime
+import json
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from app.core.config import settings
 
-
-LOG_DIR = Path(settings.BASE_DIR) / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+LOG_DIR = Path(settings.LOG_DIR)
 
 LOG_FILE = LOG_DIR / "forizec.log"
+SLOW_QUERY_LOG_FILE = LOG_DIR / "slow_queries.log"
+
+'''
+Handlers do blocking I/O: a write() per record to stdout and forizec.log, and a file rename
+chain when the log rotates. Attached to the `forizec` logger directly, that ran on the event
+loop for every access-log line.
+- Loggers now only hold a BoundedQueueHandler, which puts the record on a bounded queue
+  (LOG_QUEUE_SIZE); a QueueListener thread formats it and does the I/O.
+- Drop policy when the queue is full (the writer can't keep up, e.g. a blocked stdout):
+  DEBUG/INFO records are dropped, a WARNING or worse evicts the oldest queued record instead.
+  Logging never blocks a request. Once the queue has room again, a warning reports how many
+  records were dropped.
+- LOG_FORMAT=json writes one JSON object per line (JSONFormatter) with the timestamp, level,
+  logger, location, message, request_id, exception text and any `extra=` fields, e.g. the
+  access log's method/path/status/duration_ms. The text format gains the request id.
+- RequestLoggingMiddleware assigns every request an id (the client's X-Request-ID if it is
+  sane, else a new one), returns it as X-Request-ID and exposes it through request_id_var;
+  RequestIdFilter stamps it on every record logged while the request runs.
+- LOG_ACCESS_SAMPLE_RATE < 1 logs only that fraction of 2xx access lines; every other status
+  is always logged. Access lines carry `sample_rate` so counts can be scaled back up.
+- The listeners are stopped (queues flushed) at interpreter exit.
+'''
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+_REQUEST_ID_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_.")
+_listeners: list[QueueListener] = []
+
+# LogRecord attributes; anything else on a record came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+def new_request_id(candidate: str | None = None) -> str:
+    """`candidate` (a client's X-Request-ID) when it is short and plain, else a fresh id."""
+    if candidate and len(candidate) <= 64 and _REQUEST_ID_CHARS.issuperset(candidate):
+        return candidate
+    return uuid.uuid4().hex
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps record.request_id (or "-") from request_id_var, in the thread that logs."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: on a full queue it drops (see the notes above)."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now (frames may change later), but leave
+        # formatting to the listener's handlers.
+        record = copy.copy(record)  # other handlers of the logger still get the original
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported:
+            try:  # only once there is room again; never evict to report
+                self.queue.put_nowait(self._dropped_record(record))
+                self._unreported = 0
+            except queue.Full:
+                pass
+        if not self._put(record):
+            self.dropped += 1
+            self._unreported += 1
+
+    def _put(self, record: logging.LogRecord) -> bool:
+        try:
+            self.queue.put_nowait(record)
+            return True
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                return False
+        try:
+            self.queue.get_nowait()  # make room for the warning: evict the oldest record
+            self.dropped += 1
+            self._unreported += 1
+            self.queue.put_nowait(record)
+            return True
+        except (queue.Empty, queue.Full):
+            return False
+
+    def _dropped_record(self, record: logging.LogRecord) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": record.name,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Log queue full: dropped {self._unreported} records",
+                "request_id": "-",
+            }
+        )
+
+
+def make_formatter(log_format: str | None = None) -> logging.Formatter:
+    if (log_format or settings.LOG_FORMAT) == "json":
+        return JSONFormatter()
+    return logging.Formatter(
+        fmt="%(levelname)s | %(asctime)s | %(name)s | %(filename)s:%(lineno)d | "
+        "%(request_id)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+
+def queue_handlers(
+    handlers: list[logging.Handler], maxsize: int | None = None
+) -> tuple[BoundedQueueHandler, QueueListener]:
+    """A queue handler for a logger, and the started listener that feeds `handlers` from it."""
+    queue_handler = BoundedQueueHandler(maxsize or settings.LOG_QUEUE_SIZE)
+    queue_handler.addFilter(RequestIdFilter())
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return queue_handler, listener
+
+
+def _stop_listeners() -> None:
+    while _listeners:
+        try:
+            _listeners.pop().stop()  # flushes the queue
+        except queue.Full:  # no room for the stop sentinel; the daemon thread dies with us
+            pass
 
 
 def configure_logging():
     """
     Configure root logging for the poject.
     All Logger under `forizec` will inherit this configuration.
+    Safe to call more than once: only the first call installs handlers.
     """
+    root_logger = logging.getLogger("forizec")
+    if _listeners:
+        return root_logger
 
-    # Formatter
-    formatter = logging.Formatter(
-        fmt="%(levelname)s | %(asctime)s | %(name)s | %(filename)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    formatter = make_formatter()
 
     # console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -37,19 +199,40 @@ def configure_logging():
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
 
+    # uvicorn's handlers (if already set up) write forizec records too, from the listener thread
+    uvicorn_handlers = logging.getLogger("uvicorn").handlers
+    queue_handler, listener = queue_handlers([console_handler, file_handler, *uvicorn_handlers])
+    _listeners.append(listener)
+
     # Root project logger
-    root_logger = logging.getLogger("forizec")
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(queue_handler)
 
-    # Attach to uvicorn loggers (so uvicorn + forizec use same handler)
-    uvicorn_logger = logging.getLogger("uvicorn")
-    root_logger.handlers.extend(uvicorn_logger.handlers)
+    configure_slow_query_logging()
+    atexit.register(_stop_listeners)
 
     return root_logger
 
 
+def configure_slow_query_logging():
+    """
+    Slow queries go to their own rotating file as JSON lines (one entry per line),
+    not to the console or forizec.log.
+    """
+    slow_handler = RotatingFileHandler(
+        SLOW_QUERY_LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+    )
+    slow_handler.setFormatter(logging.Formatter("%(message)s"))
+    queue_handler, listener = queue_handlers([slow_handler])
+    _listeners.append(listener)
+
+    slow_logger = logging.getLogger("forizec.slow_query")
+    slow_logger.setLevel(logging.WARNING)
+    slow_logger.propagate = False
+    slow_logger.addHandler(queue_handler)
+    return slow_logger
+
+
 def get_logger(name: str | None = None) -> logging.Logger:
     """
     Get a child logger for a specific module.
@@ -0,0 +1,398 @@
+# app/core/metrics.py
+# In-process metrics registry (counters, gauges, histograms) exported in the Prometheus text format.
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import math
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.pool_metrics import POOL_METRICS, WAIT_BUCKETS, Histogram, pool_stats
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None
+
+logger = get_logger(__name__)
+
+'''
+Per-route latency and error numbers without an external collector; Prometheus (or curl) reads
+GET /api/v1/admin/metrics.
+- RequestLoggingMiddleware records per request: http_request_duration_seconds{method, route,
+  status} (route is the path template, e.g. /api/v1/policies/{policy_id}, so ids don't explode
+  the label set), http_requests_in_progress{method} and http_request_db_seconds{route}.
+  Templates record template_render_seconds{template}; every handler in app/core/exceptions.py
+  counts into http_exceptions_total{handler, exception}. Pool numbers (app/core/pool_metrics.py)
+  are copied in at export time by a collector.
+- Multiple workers: with METRICS_MULTIPROC_DIR set, every worker writes a JSON snapshot of its
+  registry to <dir>/<pid>-<id>.json every METRICS_FLUSH_INTERVAL seconds, at export and on
+  shutdown (atomically: temp file + rename). The worker that answers the scrape merges all
+  snapshots: counters and histograms are summed, including those of workers that have exited
+  (so totals never go backwards); gauges are summed over live workers only. Other workers'
+  numbers can be up to one flush interval old. Empty the directory when deploying, as with
+  prometheus_client's multiprocess mode.
+- Exited workers' snapshots are folded into <dir>/archive.json (counters and histograms only)
+  and deleted by the next export, so restarts don't leave one file per dead worker behind.
+  Exports hold an flock on <dir>/.lock while they read and fold, so a snapshot is never
+  counted twice; without fcntl (Windows) the files are merged but not folded.
+- The endpoint answers only clients in METRICS_ALLOWLIST (networks; loopback by default) and
+  404s everyone else. Behind a reverse proxy, run uvicorn with --proxy-headers and
+  --forwarded-allow-ips so request.client is the real client, or allow the scraper's address.
+'''
+
+ARCHIVE_NAME = "archive.json"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricFamily:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = lock
+        self.values: dict[tuple[str, ...], Any] = {}
+
+    def samples(self) -> list[list]:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Counter(MetricFamily):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def set(self, *labels: str, value: float) -> None:
+        """For counts kept elsewhere (pool metrics), copied in by a collector."""
+        with self._lock:
+            self.values[labels] = value
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class HistogramFamily(MetricFamily):
+    type = "histogram"
+
+    def __init__(self, name, help, labels, lock, buckets: tuple[float, ...]):
+        super().__init__(name, help, labels, lock)
+        self.buckets = buckets
+
+    def observe(self, *labels: str, value: float) -> None:
+        with self._lock:
+            histogram = self.values.get(labels)
+            if histogram is None:
+                histogram = self.values[labels] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def bind(self, *labels: str, histogram: Histogram) -> None:
+        """Export a Histogram kept elsewhere (same buckets) under `labels`."""
+        with self._lock:
+            self.values[labels] = histogram
+
+    def samples(self) -> list[list]:
+        with self._lock:
+            return [
+                [list(labels), {"counts": list(h.counts), "sum": h.sum}]
+                for labels, h in self.values.items()
+            ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.families: dict[str, MetricFamily] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self.key = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def _register(self, family: MetricFamily) -> Any:
+        self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels, self._lock))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels, self._lock))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> HistogramFamily:
+        return self._register(HistogramFamily(name, help, labels, self._lock, buckets))
+
+    def snapshot(self) -> dict[str, Any]:
+        for collect in self.collectors:
+            collect()
+        families = {}
+        for family in self.families.values():
+            entry = {"type": family.type, "help": family.help, "labels": list(family.labels)}
+            if isinstance(family, HistogramFamily):
+                entry["buckets"] = list(family.buckets)
+            entry["samples"] = family.samples()
+            families[family.name] = entry
+        return {"pid": os.getpid(), "families": families}
+
+    def flush(self, directory: Path, final: bool = False) -> None:
+        """Write this worker's snapshot into `directory`; `final` zeroes its gauges."""
+        snapshot = self.snapshot()
+        if final:
+            for family in snapshot["families"].values():
+                if family["type"] == "gauge":
+                    family["samples"] = []
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.key}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(snapshot))
+        os.replace(temporary, path)
+
+    def export(self, directory: Path | None = None) -> str:
+        """Prometheus text for this worker, or for every worker that writes to `directory`."""
+        if directory is None:
+            return render(self.snapshot()["families"])
+        self.flush(directory)
+        if fcntl is None:
+            return render(merge(_read_snapshots(directory)))
+        with open(directory / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            return render(merge(_archive_exited(directory, _read_snapshots(directory))))
+
+
+def _read_snapshots(directory: Path) -> list[dict[str, Any]]:
+    snapshots = []
+    for path in sorted(directory.glob("*.json")):
+        try:
+            snapshot = json.loads(path.read_text())
+        except (OSError, ValueError):  # removed or replaced while we read it
+            continue
+        snapshot["path"] = path
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def _archive_exited(directory: Path, snapshots: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Fold exited workers' snapshots into the archive file and delete them (lock held)."""
+    exited = [s for s in snapshots if s["path"].name != ARCHIVE_NAME and not _alive(s["pid"])]
+    if not exited:
+        return snapshots
+    archive_path = directory / ARCHIVE_NAME
+    archive = next((s for s in snapshots if s["path"] == archive_path), None)
+    folded = {"pid": None, "families": merge([s for s in (archive, *exited) if s is not None])}
+    temporary = archive_path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(folded))
+    os.replace(temporary, archive_path)
+    for snapshot in exited:
+        snapshot["path"].unlink(missing_ok=True)
+    folded_ids = {id(s) for s in (archive, *exited)}
+    return [folded, *(s for s in snapshots if id(s) not in folded_ids)]
+
+
+def _alive(pid: int | None) -> bool:
+    if pid is None:  # the archive of exited workers
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge(snapshots: list[dict[str, Any]]) -> dict[str, Any]:
+    """Families of several workers' snapshots, summed per label set (see the notes above)."""
+    merged: dict[str, Any] = {}
+    for snapshot in snapshots:
+        alive = _alive(snapshot["pid"])
+        for name, family in snapshot["families"].items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            if family["type"] == "gauge" and not alive:
+                continue
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                if family["type"] != "histogram":
+                    target["samples"][key] = target["samples"].get(key, 0.0) + value
+                    continue
+                total = target["samples"].setdefault(
+                    key, {"counts": [0] * len(value["counts"]), "sum": 0.0}
+                )
+                total["counts"] = [a + b for a, b in zip(total["counts"], value["counts"])]
+                total["sum"] += value["sum"]
+    for family in merged.values():
+        family["samples"] = [[list(key), value] for key, value in family["samples"].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: list[str], values: list[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(families: dict[str, Any]) -> str:
+    lines = []
+    for name, family in sorted(families.items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        names = family["labels"]
+        for labels, value in sorted(family["samples"]):
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*family["buckets"], "+Inf"], value["counts"]):
+                cumulative += count
+                le = f'le="{bound if bound == "+Inf" else _number(bound)}"'
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by route template and status.",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "Requests being handled right now.", ("method",)
+)
+REQUEST_DB_TIME = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.", ("route",)
+)
+TEMPLATE_RENDER = registry.histogram(
+    "template_render_seconds", "Time to render a page template.", ("template",)
+)
+EXCEPTIONS = registry.counter(
+    "http_exceptions_total",
+    "Exceptions answered by the handlers in app/core/exceptions.py.",
+    ("handler", "exception"),
+)
+POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections",
+    "Pool connections by state (size is the configured size).",
+    ("pool", "state"),
+)
+POOL_EVENTS = registry.counter(
+    "db_pool_events_total",
+    "Pool checkouts, connects, invalidations and timeouts.",
+    ("pool", "event"),
+)
+POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time a checkout waited for a connection.",
+    ("pool",),
+    buckets=WAIT_BUCKETS,
+)
+
+
+def route_label(scope: dict) -> str:
+    """The matched route's path template, the mount path (static files), or <unmatched>."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return scope.get("root_path") or "<unmatched>"
+
+
+def _collect_pools() -> None:
+    for name, snapshot in pool_stats().items():
+        for state in ("size", "checked_out", "checked_in", "overflow"):
+            if state in snapshot:
+                POOL_CONNECTIONS.set(name, state, value=snapshot[state])
+        for event in ("checkouts", "connects", "invalidations", "timeouts"):
+            POOL_EVENTS.set(name, event, value=snapshot[event])
+        POOL_CHECKOUT_WAIT.bind(name, histogram=POOL_METRICS[name].checkout_wait)
+
+
+registry.collectors.append(_collect_pools)
+
+
+def metrics_directory() -> Path | None:
+    directory = settings.METRICS_MULTIPROC_DIR
+    return Path(directory) if directory else None
+
+
+async def flush_periodically(interval: float | None = None) -> None:
+    """Lifespan task: keep this worker's snapshot fresh for the others (multi-worker only)."""
+    directory = metrics_directory()
+    if directory is None:
+        return
+    while True:
+        await asyncio.sleep(interval or settings.METRICS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(registry.flush, directory)
+        except OSError as exc:
+            logger.warning(f"Could not write metrics snapshot: {exc}")
+
+
+def final_flush() -> None:
+    """Lifespan shutdown: last snapshot, without this worker's gauges."""
+    directory = metrics_directory()
+    if directory is None:
+        return
+    try:
+        registry.flush(directory, final=True)
+    except OSError as exc:
+        logger.warning(f"Could not write metrics snapshot: {exc}")
+
+
+def require_allowlisted_client(request: Request) -> None:
+    """Dependency: only clients in METRICS_ALLOWLIST (admin/ops endpoints); others get a 404."""
+    host = request.client.host if request.client else None
+    try:
+        address = ipaddress.ip_address(host) if host else None
+    except ValueError:  # e.g. "testclient"
+        address = None
+    allowed = address is not None and any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in settings.METRICS_ALLOWLIST
+    )
+    if not allowed:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+def require_metrics_client(request: Request) -> None:
+    """Dependency: metrics are enabled and the client is in METRICS_ALLOWLIST."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Not Found")
+    require_allowlisted_client(request)
@@ -1,82 +1,351 @@
 # app/core/middleware.py
 
+import http.cookies
+import json
+import random
 import re
-from typing import Awaitable, Callable
+import time
+from base64 import b64decode, b64encode
+
 from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import PlainTextResponse, RedirectResponse
+from itsdangerous.exc import BadSignature
+from starlette.datastructures import URL, Headers, MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette_csrf import CSRFMiddleware  # type: ignore
-import time
+
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.logging_config import get_logger
+from app.core.db import db_was_touched
+from app.core.logging_config import get_logger, new_request_id, request_id_var
+from app.core.metrics import REQUEST_DB_TIME, REQUEST_DURATION, REQUESTS_IN_PROGRESS, route_label
+from app.core.query_stats import QueryStats, track_queries
+from app.core.responses import FastJSONResponse
 
 logger = get_logger()
 
 
 class CustomResponseCSRFMiddleware(CSRFMiddleware):
     def _get_error_response(self, request: Request) -> Response:
-        return JSONResponse(content={"details": "CSRF Validation Failed"}, status_code=403)
+        return FastJSONResponse(content={"details": "CSRF Validation Failed"}, status_code=403)
+
 
+class RequestLoggingMiddleware:
+    """
+    Request timing, X-Process-Time / X-DB-* headers and the access log line, as raw ASGI.
+    BaseHTTPMiddleware ran the app in a separate task and piped the body through a memory
+    stream; here the app's messages pass straight through, so streamed responses (document
+    downloads, exports) reach the client chunk by chunk. Headers are added to
+    http.response.start (time to first byte); the log line is written once the body is done.
+    Each request gets an id (X-Request-ID, see app/core/logging_config.py) that every record
+    logged while it runs carries; 2xx access lines are sampled at LOG_ACCESS_SAMPLE_RATE.
+    Latency, in-flight and DB-time metrics (app/core/metrics.py) are recorded here as well.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
         start_time = time.perf_counter()
+        status_code = 500
+        client_id = next((v for k, v in scope["headers"] if k == b"x-request-id"), None)
+        request_id = new_request_id(client_id.decode("latin-1") if client_id else None)
+        token = request_id_var.set(request_id)
+        method = scope["method"]
+        metrics_enabled = settings.METRICS_ENABLED  # read once: inc and dec must pair up
+        if metrics_enabled:
+            REQUESTS_IN_PROGRESS.inc(method)
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start_time:.4f} seconds")
+                if settings.QUERY_STATS_ENABLED:
+                    headers.append("X-DB-Query-Count", str(query_stats.count))
+                    headers.append("X-DB-Time", f"{query_stats.total_time:.4f} seconds")
+            await send(message)
+
         try:
-            response = await call_next(request)
-        except Exception as exc:
-            logger.exception(f"Unhandled error while processing {request.url}. reasons: {exc}")
-            raise  # Let your exception handlers catch it
-        process_time = time.perf_counter() - start_time
-        response.headers["X-Process-Time"] = f"{process_time:.4f} seconds"
+            with track_queries(route=scope["path"]) as query_stats:
+                try:
+                    await self.app(scope, receive, send_with_timing)
+                except Exception as exc:
+                    request = Request(scope)
+                    logger.exception(
+                        f"Unhandled error while processing {request.url}. reasons: {exc}"
+                    )
+                    raise  # Let your exception handlers catch it
+
+            request = Request(scope)
+            process_time = time.perf_counter() - start_time
+            if settings.QUERY_STATS_ENABLED:
+                self._warn_repeated_queries(request, query_stats)
+            self._log_access(request, status_code, process_time)
+        finally:
+            request_id_var.reset(token)
+            if metrics_enabled:
+                REQUESTS_IN_PROGRESS.dec(method)
+                route = route_label(scope)  # the router filled in the matched route
+                duration = time.perf_counter() - start_time
+                REQUEST_DURATION.observe(method, route, str(status_code), value=duration)
+                REQUEST_DB_TIME.observe(route, value=query_stats.total_time)
+
+    @staticmethod
+    def _log_access(request: Request, status_code: int, process_time: float) -> None:
+        sample_rate = settings.LOG_ACCESS_SAMPLE_RATE
+        if 200 <= status_code < 300 and sample_rate < 1:
+            # a coin flip that only thins the access log, not a security decision
+            if random.random() >= sample_rate:  # noqa: S311
+                return
+        else:
+            sample_rate = 1.0
+        db = db_was_touched(request)
         logger.info(
-            f"{request.method} {request.url} - {response.status_code} [{process_time:.4f}s]"
+            f"{request.method} {request.url} - {status_code} [{process_time:.4f}s]"
+            f"{' db' if db else ''}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status": status_code,
+                "duration_ms": round(process_time * 1000, 2),
+                "db": db,
+                "sample_rate": sample_rate,
+            },
         )
-        return response
 
+    @staticmethod
+    def _warn_repeated_queries(request: Request, query_stats: QueryStats) -> None:
+        for shape, count in query_stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                f"Possible N+1 on {request.method} {request.url.path}: " f"{count}x {shape[:300]}"
+            )
 
-def register_middleware(app: FastAPI) -> None:
-    app.add_middleware(RequestLoggingMiddleware)
 
+class FusedMiddleware:
+    """
+    TrustedHost, HTTPS redirect, CSRF, sessions and CORS in one ASGI layer (FUSED_MIDDLEWARE).
+    The stacked layers each rebuild Headers/Request from the scope and re-parse the Cookie header;
+    here headers and cookies are parsed once per request and every check runs in one pass, in the
+    same order as the stack (outermost first), with one send wrapper applying the response
+    headers in the stack's order (CORS, then session cookie, then CSRF cookie).
+    The stock middlewares are instantiated only as configuration holders and for their helpers
+    (origin matching, preflight responses, token signing), so the rules cannot drift apart.
+    Non-HTTP scopes go through the classic stack unchanged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        cors: dict,
+        session: dict,
+        csrf: dict,
+        allowed_hosts: list[str] | None = None,
+        https_redirect: bool = False,
+    ) -> None:
+        self.app = app
+        self.cors = CORSMiddleware(app, **cors)
+        self.sessions = SessionMiddleware(self.cors, **session)
+        self.csrf = CustomResponseCSRFMiddleware(self.sessions, **csrf)
+        classic: ASGIApp = self.csrf
+        self.https_redirect = https_redirect
+        if https_redirect:
+            classic = HTTPSRedirectMiddleware(classic)
+        self.trusted_hosts = None
+        if allowed_hosts is not None:
+            classic = self.trusted_hosts = TrustedHostMiddleware(classic, allowed_hosts)
+        self.classic = classic
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.classic(scope, receive, send)
+            return
+
+        headers: dict[bytes, bytes] = {}
+        for key, value in scope["headers"]:
+            headers.setdefault(key, value)  # first value wins, as in Headers.get()
+
+        if self.trusted_hosts is not None and not self.trusted_hosts.allow_any:
+            response = self._check_host(scope, headers)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        if self.https_redirect and scope["scheme"] == "http":
+            await self.classic(scope, receive, send)  # the stock middleware builds the redirect
+            return
+
+        cookie_header = headers.get(b"cookie")
+        cookies = cookie_parser(cookie_header.decode("latin-1")) if cookie_header else {}
+
+        csrf = self.csrf
+        csrf_cookie = cookies.get(csrf.cookie_name)
+        if scope["method"] not in csrf.safe_methods or csrf.required_urls:
+            response = self._check_csrf(scope, headers, cookies, csrf_cookie)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+
+        sessions = self.sessions
+        initial_session_was_empty = True
+        scope["session"] = {}
+        if sessions.session_cookie in cookies:
+            try:
+                data = sessions.signer.unsign(
+                    cookies[sessions.session_cookie].encode("utf-8"), max_age=sessions.max_age
+                )
+                scope["session"] = json.loads(b64decode(data))
+                initial_session_was_empty = False
+            except BadSignature:
+                pass
+
+        origin = headers.get(b"origin")
+        preflight = (
+            origin is not None
+            and scope["method"] == "OPTIONS"
+            and b"access-control-request-method" in headers
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                response_headers = MutableHeaders(scope=message)
+                if origin is not None and not preflight:
+                    self._cors_headers(response_headers, origin.decode("latin-1"), headers)
+                self._session_cookie(response_headers, scope["session"], initial_session_was_empty)
+                if csrf_cookie is None:
+                    self._csrf_cookie(response_headers)
+            await send(message)
+
+        if preflight:
+            response = self.cors.preflight_response(request_headers=Headers(scope=scope))
+            await response(scope, receive, send_wrapper)
+            return
+        await self.app(scope, receive, send_wrapper)
+
+    def _check_host(self, scope: Scope, headers: dict[bytes, bytes]) -> Response | None:
+        host = headers.get(b"host", b"").decode("latin-1").split(":")[0]
+        found_www_redirect = False
+        for pattern in self.trusted_hosts.allowed_hosts:
+            if host == pattern or (pattern.startswith("*") and host.endswith(pattern[1:])):
+                return None
+            elif "www." + host == pattern:
+                found_www_redirect = True
+        if found_www_redirect and self.trusted_hosts.www_redirect:
+            url = URL(scope=scope)
+            return RedirectResponse(url=str(url.replace(netloc="www." + url.netloc)))
+        return PlainTextResponse("Invalid host header", status_code=400)
+
+    def _check_csrf(
+        self,
+        scope: Scope,
+        headers: dict[bytes, bytes],
+        cookies: dict[str, str],
+        csrf_cookie: str | None,
+    ) -> Response | None:
+        csrf = self.csrf
+        url = URL(scope=scope)
+        if csrf._url_is_required(url) or (
+            scope["method"] not in csrf.safe_methods
+            and not csrf._url_is_exempt(url)
+            and csrf._has_sensitive_cookies(cookies)
+        ):
+            submitted = headers.get(csrf.header_name.lower().encode("latin-1"))
+            if (
+                not csrf_cookie
+                or not submitted
+                or not csrf._csrf_tokens_match(csrf_cookie, submitted.decode("latin-1"))
+            ):
+                return csrf._get_error_response(Request(scope))
+        return None
+
+    def _cors_headers(
+        self, response_headers: MutableHeaders, origin: str, headers: dict[bytes, bytes]
+    ) -> None:
+        cors = self.cors
+        response_headers.update(cors.simple_headers)
+        # credentialed requests need the origin echoed back: "*" is not allowed with cookies
+        if (cors.allow_all_origins and b"cookie" in headers) or (
+            not cors.allow_all_origins and cors.is_allowed_origin(origin=origin)
+        ):
+            cors.allow_explicit_origin(response_headers, origin)
+
+    def _session_cookie(
+        self, response_headers: MutableHeaders, session: dict, initial_session_was_empty: bool
+    ) -> None:
+        sessions = self.sessions
+        if session:
+            data = sessions.signer.sign(b64encode(json.dumps(session).encode("utf-8")))
+            max_age = f"Max-Age={sessions.max_age}; " if sessions.max_age else ""
+            response_headers.append(
+                "Set-Cookie",
+                f"{sessions.session_cookie}={data.decode('utf-8')}; path={sessions.path}; "
+                f"{max_age}{sessions.security_flags}",
+            )
+        elif not initial_session_was_empty:
+            response_headers.append(
+                "Set-Cookie",
+                f"{sessions.session_cookie}=null; path={sessions.path}; "
+                f"expires=Thu, 01 Jan 1970 00:00:00 GMT; {sessions.security_flags}",
+            )
+
+    def _csrf_cookie(self, response_headers: MutableHeaders) -> None:
+        csrf = self.csrf
+        cookie: http.cookies.BaseCookie = http.cookies.SimpleCookie()
+        cookie[csrf.cookie_name] = csrf._generate_csrf_token()
+        cookie[csrf.cookie_name]["path"] = csrf.cookie_path
+        cookie[csrf.cookie_name]["secure"] = csrf.cookie_secure
+        cookie[csrf.cookie_name]["httponly"] = csrf.cookie_httponly
+        cookie[csrf.cookie_name]["samesite"] = csrf.cookie_samesite
+        if csrf.cookie_domain is not None:
+            cookie[csrf.cookie_name]["domain"] = csrf.cookie_domain
+        response_headers.append("set-cookie", cookie.output(header="").strip())
+
+
+def cors_options() -> dict:
     if settings.ENV == 'dev':
-        app.add_middleware(
-            CORSMiddleware,
+        return dict(
             allow_origins=['*'],
             allow_credentials=True,  # if true allow_origins, allow_methods,allow_headers should not ['*']
             allow_methods=['*'],
             allow_headers=["*"],
             expose_headers=[],
         )
-    else:
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=settings.ALLOWED_ORIGIN,
-            allow_credentials=True,  # if true allow_origins, allow_methods,allow_headers should not ['*']
-            allow_methods=["GET", "POST", "PUT", "DELETE"],
-            allow_headers=["Authorization", "Content-Type", settings.CSRF_HEADER_NAME],
-            expose_headers=[],
-        )
+    return dict(
+        allow_origins=settings.ALLOWED_ORIGIN,
+        allow_credentials=True,  # if true allow_origins, allow_methods,allow_headers should not ['*']
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Authorization", "Content-Type", settings.CSRF_HEADER_NAME],
+        expose_headers=[],
+    )
 
-    app.add_middleware(
-        SessionMiddleware,
+
+def session_options() -> dict:
+    return dict(
         secret_key=settings.SECRET_KEY,
         session_cookie="fourize_sessionid",
         same_site="lax",
         https_only=settings.ENV == "prod",
     )
 
+
+def csrf_options() -> dict:
     """
     GET request set a cookie: Set-Cookie: csrftoken=<key>
     POST, PUT, DELETE must need header: x-csrftoken in header by taking from cookie.
     """
-    app.add_middleware(
-        CustomResponseCSRFMiddleware,
+    return dict(
         secret=settings.CSRF_SECRET,
         cookie_name=settings.CSRF_COOKIE_NAME,
         cookie_secure=settings.CSRF_COOKIE_SECURE,
@@ -85,11 +354,28 @@ def register_middleware(app: FastAPI) -> None:
         exempt_urls=[
             re.compile(rf"^{settings.API_V1_STR}(/.*)?$"),
             re.compile(rf"^{settings.API_V2_STR}(/.*)?$"),
-        ],  # APIs use tokens, not cookies
+        ],  # APIs use tokens; cookie-session API writes are checked in get_principal
     )
 
-    if settings.ENV == 'prod':
-        app.add_middleware(HTTPSRedirectMiddleware)
-        app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 
-    app.add_middleware(GZipMiddleware)
+def register_middleware(app: FastAPI) -> None:
+    app.add_middleware(RequestLoggingMiddleware)
+
+    if settings.FUSED_MIDDLEWARE:
+        app.add_middleware(
+            FusedMiddleware,
+            cors=cors_options(),
+            session=session_options(),
+            csrf=csrf_options(),
+            allowed_hosts=settings.ALLOWED_HOSTS if settings.ENV == 'prod' else None,
+            https_redirect=settings.ENV == 'prod',
+        )
+    else:
+        app.add_middleware(CORSMiddleware, **cors_options())
+        app.add_middleware(SessionMiddleware, **session_options())
+        app.add_middleware(CustomResponseCSRFMiddleware, **csrf_options())
+        if settings.ENV == 'prod':
+            app.add_middleware(HTTPSRedirectMiddleware)
+            app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
+
+    app.add_middleware(CompressionMiddleware)
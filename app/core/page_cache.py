@@ -0,0 +1,211 @@
+# app/core/page_cache.py
+# Rendered HTML cache for views: whole pages (render_cached) and template fragments ({% cache %}).
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+from jinja2 import Template, TemplateSyntaxError, nodes
+from jinja2.ext import Extension
+
+'''
+Most HTML views render the same bytes for every visitor: public/index.html is 8.8 KB of markup
+whose only dynamic parts are static_url()/url_for(). One in-process cache serves two uses:
+- render_cached(request, template, context) for whole pages, keyed on the route path and query,
+  the base URL (url_for() renders absolute URLs), the template file's mtime (read once per
+  loaded Template; with auto_reload an edited template misses without a restart) and an
+  optional `vary` key, e.g. f"user:{principal.id}" or f"role:{principal.role}". Pages that embed per-session values (CSRF tokens, flash messages)
+  must vary by user or not be cached at all. `context` may be an async callable so the
+  queries behind a page only run on a miss.
+- {% cache "panel", key, ..., ttl=60, tags=["risks"] %}...{% endcache %} for expensive parts of
+  otherwise dynamic pages (dashboard panels). The key is the template, the block's position,
+  the template's mtime when it was compiled, and the given parts; anything the block depends
+  on (role, team, filters) has to be among them.
+- Entries expire after their ttl (PAGE_CACHE_TTL by default, 0 = don't cache); the cache is
+  LRU-bounded by the byte size of the stored HTML (PAGE_CACHE_MAX_BYTES), so one large page
+  cannot push out thousands of small fragments unnoticed.
+  request.app.state.render_cache.invalidate_tags("risks") drops every page and fragment tagged
+  "risks"; call it after writes the pages display.
+- create_templates() gives each app one RenderCache (app.state.render_cache), shared by pages
+  and fragments; PAGE_CACHE_ENABLED=False leaves it out and everything renders every time.
+- The cache is per worker. Other workers pick changes up when their entries expire, so keep
+  ttl short for data that changes, or tag the entries and invalidate in every worker.
+'''
+
+
+@dataclass
+class _Entry:
+    expires: float
+    value: str | bytes
+    size: int
+    tags: tuple[str, ...]
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered HTML, bounded by total size in bytes, with TTL and tags."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._tags: dict[str, set[tuple]] = {}
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> str | bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self, key: tuple, value: str | bytes, ttl: float | None = None, tags: Iterable[str] = ()
+    ) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = len(value) if isinstance(value, bytes) else len(value.encode())
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(time.monotonic() + ttl, value, size, tuple(tags))
+            self._entries[key] = entry
+            self.size += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying one of `tags`; returns how many were dropped."""
+        with self._lock:
+            keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_template_mtimes: weakref.WeakKeyDictionary[Template, int] = weakref.WeakKeyDictionary()
+
+
+def _template_mtime(template: Template) -> int:
+    """mtime of the file `template` was loaded from, read once per loaded Template."""
+    # with auto_reload Jinja returns a new Template once the file changed, so this stays fresh
+    mtime = _template_mtimes.get(template)
+    if mtime is None:
+        mtime = os.stat(template.filename).st_mtime_ns if template.filename else 0
+        _template_mtimes[template] = mtime
+    return mtime
+
+
+async def render_cached(
+    request: Request,
+    name: str,
+    context: dict[str, Any] | Callable[[], Awaitable[dict[str, Any]]] | None = None,
+    *,
+    vary: str | None = None,
+    ttl: float | None = None,
+    tags: Iterable[str] = (),
+    cache: RenderCache | None = None,
+) -> HTMLResponse:
+    """TemplateResponse for `name`, served from `cache` (default: the app's) when possible."""
+    templates = request.app.state.templates
+    cache = cache if cache is not None else templates.env.render_cache
+    if cache is not None:
+        template = templates.get_template(name)
+        mtime = _template_mtime(template)
+        path, query, base = request.url.path, request.url.query, str(request.base_url)
+        key = ("page", path, query, base, name, mtime, vary)
+        body = cache.get(key)
+        if body is not None:
+            return HTMLResponse(body)
+    if callable(context):
+        context = await context()
+    response = templates.TemplateResponse(request, name, context or {})
+    if cache is not None:
+        cache.put(key, response.body, ttl, tags)
+    return response
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache "name", *key_parts, ttl=seconds, tags=[...] %} ... {% endcache %}"""
+
+    tags: ClassVar[set[str]] = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(render_cache=None)  # a RenderCache; None renders uncached
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts: list[nodes.Expr] = []
+        options: list[nodes.Keyword] = []
+        while parser.stream.current.type != "block_end":
+            if parts or options:
+                parser.stream.expect("comma")
+            if parser.stream.current.type == "name" and parser.stream.look().type == "assign":
+                option = next(parser.stream).value
+                if option not in ("ttl", "tags"):
+                    raise TemplateSyntaxError(
+                        f"Unknown cache option {option!r}", lineno, parser.name, parser.filename
+                    )
+                next(parser.stream)
+                options.append(nodes.Keyword(option, parser.parse_expression()))
+            else:
+                parts.append(parser.parse_expression())
+        if not parts:
+            raise TemplateSyntaxError(
+                "{% cache %} needs a name", lineno, parser.name, parser.filename
+            )
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        # compiled in: a changed template compiles again and so gets new keys
+        mtime = os.stat(parser.filename).st_mtime_ns if parser.filename else 0
+        location = nodes.Const((parser.name, lineno, mtime))
+        call = self.call_method("_render", [location, nodes.List(parts)], options)
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, location, parts, caller, ttl=None, tags=()):
+        cache = self.environment.render_cache
+        if cache is None:
+            return caller()
+        key = ("fragment", *location, *parts)
+        value = cache.get(key)
+        if value is None:
+            value = caller()
+            cache.put(key, value, ttl, tags)
+        return value
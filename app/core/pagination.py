@@ -0,0 +1,159 @@
+# app/core/pagination.py
+# Keyset (cursor) pagination for list endpoints: opaque cursors over indexed sort keys.
+
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.projection import validate_rows
+from app.schemas.pagination import Page
+
+'''
+OFFSET n makes the database walk and discard n rows, so page 1000 of activity_logs costs
+1000 pages of work. Keyset pagination remembers where the last page ended and asks for rows
+strictly after it:  WHERE (timestamp, id) < (:last_ts, :last_id) ORDER BY timestamp DESC, id DESC.
+With a matching composite index every page costs the same.
+- Sort keys end in a unique NOT NULL column (usually id) as a tie-breaker.
+- Nullable sort keys sort their NULLs last in both directions (NULLS LAST, as every dialect
+  orders NULLs differently) and the cursor comparison treats NULL as past every value, so the
+  page chain runs through rows without a timestamp instead of stopping at the first one.
+  On Postgres a DESC NULLS LAST order needs an index declared that way to avoid a sort.
+- Cursors are opaque base64 JSON of the last row's key values plus a fingerprint of the keys,
+  so a cursor from another endpoint or sort order is rejected with 400 instead of misbehaving.
+- Every list route takes PageParams and returns Page[SchemaOut] via paginate().
+  Routes pass a projection (app/core/projection.py) plus its schema, and return page_response():
+  the page is serialized once by pydantic-core instead of FastAPI dumping and re-validating it.
+'''
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class PageParams:
+    cursor: str | None = Query(None, description="next_cursor from the previous page")
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Sort keys of a list endpoint, e.g. Keyset((ActivityLog.timestamp, ActivityLog.id), descending=True)."""
+
+    columns: tuple[InstrumentedAttribute, ...]
+    descending: bool = False
+
+    @property
+    def fingerprint(self) -> str:
+        spec = ",".join(str(col) for col in self.columns) + (":desc" if self.descending else ":asc")
+        return hashlib.blake2s(spec.encode(), digest_size=4).hexdigest()
+
+    def order_by(self) -> list[Any]:
+        order = [col.desc() if self.descending else col.asc() for col in self.columns]
+        return [
+            term.nulls_last() if _nullable(col) else term for col, term in zip(self.columns, order)
+        ]
+
+    def after(self, values: Sequence[Any]) -> Any:
+        """Rows strictly after `values` in this order (expanded row-value comparison)."""
+        clauses = []
+        for i, col in enumerate(self.columns):
+            if values[i] is None:
+                continue  # NULLs sort last: nothing comes after them in this column
+            tail = col < values[i] if self.descending else col > values[i]
+            if _nullable(col):
+                tail = or_(tail, col.is_(None))
+            equal = (c.is_(None) if v is None else c == v for c, v in zip(self.columns, values[:i]))
+            clauses.append(and_(*equal, tail))
+        return or_(*clauses)
+
+    def values_of(self, row: Any) -> list[Any]:
+        return [getattr(row, col.key) for col in self.columns]
+
+
+def _nullable(column: InstrumentedAttribute) -> bool:
+    return bool(getattr(column.expression, "nullable", False))
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(column: InstrumentedAttribute, value: Any) -> Any:
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(keyset: Keyset, values: Sequence[Any]) -> str:
+    payload = {"k": keyset.fingerprint, "v": [_to_json(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(keyset: Keyset, cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != keyset.fingerprint or len(payload["v"]) != len(keyset.columns):
+            raise ValueError("cursor belongs to another list")
+        return [_from_json(col, v) for col, v in zip(keyset.columns, payload["v"])]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {exc}") from exc
+
+
+def keyset_page(stmt: Select, keyset: Keyset, params: PageParams) -> Select:
+    """`stmt` restricted to the requested page (one extra row is fetched to detect has_more)."""
+    if params.cursor:
+        stmt = stmt.where(keyset.after(decode_cursor(keyset, params.cursor)))
+    return stmt.order_by(*keyset.order_by()).limit(params.limit + 1)
+
+
+def make_page(rows: Sequence[Any], keyset: Keyset, params: PageParams) -> Page:
+    has_more = len(rows) > params.limit
+    rows = rows[: params.limit]
+    next_cursor = encode_cursor(keyset, keyset.values_of(rows[-1])) if has_more else None
+    return Page(items=list(rows), limit=params.limit, has_more=has_more, next_cursor=next_cursor)
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    keyset: Keyset,
+    params: PageParams,
+    schema: type[BaseModel] | None = None,
+) -> Page:
+    """
+    Run `stmt` (filters only, no ORDER BY / LIMIT) for one keyset page.
+    With `schema`, `stmt` is a select_projection() and the rows are validated into it in bulk;
+    without, `stmt` selects an entity and the page holds ORM objects.
+    """
+    stmt = keyset_page(stmt, keyset, params)
+    if schema is None:
+        return make_page((await session.scalars(stmt)).all(), keyset, params)
+    page = make_page((await session.execute(stmt)).all(), keyset, params)
+    page.items = validate_rows(schema, page.items)
+    return page
+
+
+def page_response(page: Page) -> Response:
+    return Response(content=page.model_dump_json(), media_type="application/json")
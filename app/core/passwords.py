@@ -0,0 +1,155 @@
+# app/core/passwords.py
+# Password hashing service: hash/verify in a bounded worker pool, off the event loop, with rehash on login.
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+'''
+bcrypt is deliberately slow (100-500 ms of CPU per call). Run on the event loop, a burst of logins
+stalls every other request in the worker.
+- Hash and verify run in a worker pool. "process" is the safe default: passlib's os_crypt backend
+  (used when the bcrypt package is missing) holds the GIL, so threads would still block the loop.
+  "thread" is fine with GIL-releasing backends (bcrypt, argon2-cffi) and avoids pickling overhead.
+- At most PASSWORD_HASH_MAX_IN_FLIGHT hashes run or queue at once per worker; further callers
+  wait on a semaphore instead of piling work into the executor.
+- PASSWORD_SCHEMES[0] hashes new passwords; the others still verify and are marked deprecated.
+  When a login verifies against a deprecated scheme or outdated cost (e.g. rounds raised),
+  verify_and_update() returns a fresh hash and authenticate_user() stores it.
+'''
+
+
+def context_config() -> dict[str, Any]:
+    """CryptContext keyword arguments from settings (plain data, so it can be sent to workers)."""
+    config: dict[str, Any] = dict(schemes=list(settings.PASSWORD_SCHEMES), deprecated="auto")
+    if "bcrypt" in settings.PASSWORD_SCHEMES:
+        config["bcrypt__rounds"] = settings.PASSWORD_BCRYPT_ROUNDS
+    return config
+
+
+# the context of the settings, per process: built here, and by _init_worker in pool processes.
+# Thread-mode hashers use their own PasswordHasher.context instead, so they never rebind it.
+pwd_context = CryptContext(**context_config())
+
+
+def _init_worker(config: dict[str, Any]) -> None:
+    global pwd_context
+    pwd_context = CryptContext(**config)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        config: dict[str, Any],
+        executor: str = "process",
+        workers: int = 2,
+        max_in_flight: int = 8,
+    ):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.config = config
+        self.context = CryptContext(**config)
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        # pool processes hash with their pwd_context (_init_worker); threads share self.context
+        if executor == "thread":
+            self._hash_fn, self._verify_and_update_fn = (
+                self.context.hash,
+                self.context.verify_and_update,
+            )
+        else:
+            self._hash_fn, self._verify_and_update_fn = _hash, _verify_and_update
+        self._executor: Executor | None = None
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_settings(cls) -> PasswordHasher:
+        return cls(
+            context_config(),
+            executor=settings.PASSWORD_HASH_EXECUTOR,
+            workers=settings.PASSWORD_HASH_WORKERS,
+            max_in_flight=settings.PASSWORD_HASH_MAX_IN_FLIGHT,
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    self.workers, initializer=_init_worker, initargs=(self.config,)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="pwhash")
+        return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+    async def _run(self, fn, *args):
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash_fn, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """(valid, new_hash); new_hash is set when `hashed` uses a deprecated scheme or cost."""
+        return await self._run(self._verify_and_update_fn, password, hashed)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        valid, _ = await self.verify_and_update(password, hashed)
+        return valid
+
+    def needs_update(self, hashed: str) -> bool:
+        """Cheap check (no hashing) whether `hashed` would be replaced on the next login."""
+        return self.context.needs_update(hashed)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher.from_settings()
+
+
+async def authenticate_user(session: AsyncSession, email: str, password: str):
+    """The active user with these credentials, or None. Upgrades the stored hash when outdated."""
+    from app.models.core_models import User
+
+    user = await session.scalar(select(User).where(User.email == email))
+    if user is None:
+        await password_hasher.hash(password)  # same cost as a real check: no user enumeration
+        return None
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid or not user.is_active:
+        return None
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        logger.info(f"Rehashed password of user {user.id} with current parameters")
+    return user
@@ -0,0 +1,181 @@
+# app/core/pool_metrics.py
+# Connection pool instrumentation: checkout wait, saturation, overflow, connection age, invalidations.
+
+from __future__ import annotations
+
+import bisect
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+'''
+Numbers to size pool_size / max_overflow from:
+- checkout_wait: how long a request waited for a connection. Growing p99 = pool too small.
+- peak_checked_out / peak_overflow: how close we got to pool_size + max_overflow.
+- timeouts: checkouts that gave up after pool_timeout (the 30s stalls).
+- connection_age: how long connections live before being returned/recycled.
+- invalidations: connections thrown away (server restarts, failed pre-ping).
+'''
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+AGE_BUCKETS = (1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 14400.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts per upper bound, like Prometheus)."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip((*self.buckets, self.max), self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Any = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.checkout_wait = Histogram(WAIT_BUCKETS)
+        self.connection_age = Histogram(AGE_BUCKETS)
+
+    def snapshot(self) -> dict[str, Any]:
+        pool = self.pool
+        live = {}
+        if pool is not None and hasattr(pool, "checkedout"):
+            live = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        return {
+            "pool_class": type(pool).__name__ if pool is not None else None,
+            **live,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "soft_invalidations": self.soft_invalidations,
+            "timeouts": self.timeouts,
+            "peak_checked_out": self.peak_checked_out,
+            "peak_overflow": self.peak_overflow,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connection_age_seconds": self.connection_age.snapshot(),
+        }
+
+
+POOL_METRICS: dict[str, PoolMetrics] = {}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waited for a connection."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        if self.metrics is not None:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep feeding the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+def install_pool_metrics(engine: AsyncEngine, name: str) -> PoolMetrics:
+    """Attach pool event hooks to `engine` and register its metrics under `name`."""
+    metrics = POOL_METRICS.get(name) or PoolMetrics(name)
+    POOL_METRICS[name] = metrics
+    sync_engine = engine.sync_engine
+    metrics.pool = sync_engine.pool
+    if isinstance(sync_engine.pool, InstrumentedQueuePool):
+        sync_engine.pool.metrics = metrics
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        pool = metrics.pool
+        if hasattr(pool, "checkedout"):
+            metrics.peak_checked_out = max(metrics.peak_checked_out, pool.checkedout())
+            metrics.peak_overflow = max(metrics.peak_overflow, pool.overflow())
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            metrics.connection_age.observe(time.monotonic() - connected_at)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.soft_invalidations += 1
+
+    return metrics
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """Snapshot of every instrumented pool, keyed by name (primary, writer, replica-0, ...)."""
+    return {name: metrics.snapshot() for name, metrics in POOL_METRICS.items()}
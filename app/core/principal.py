@@ -0,0 +1,206 @@
+# app/core/principal.py
+# Authenticated principal for cookie-session requests, cached in-process (LRU + TTL).
+
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, Request, status
+from itsdangerous import BadSignature
+from itsdangerous.url_safe import URLSafeSerializer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db import get_read_db_session
+from app.core.logging_config import get_logger
+from app.core.tokens import TokenError, verify_token
+from app.models.core_models import User
+from app.models.enums import UserRoleEnum
+
+logger = get_logger(__name__)
+
+'''
+The login route stores user_id and the user's session_version in the signed session cookie.
+Resolving them to a User on every request would cost a query per request, so authorization
+runs on a Principal instead: a frozen snapshot of (id, role, team, is_active).
+- Principals are cached per worker under (user_id, session_version), bounded by
+  PRINCIPAL_CACHE_MAX_ENTRIES (least recently used evicted first) and PRINCIPAL_CACHE_TTL.
+  A cache hit needs no database connection: the read session is never used.
+- Requests with `Authorization: Bearer <token>` (API clients) skip the cookie and the cache:
+  the principal is read from the verified access token (app/core/tokens.py).
+- The CSRF middleware exempts the APIs, so an unsafe request (POST, PATCH, ...) authenticated
+  by the session cookie must carry the CSRF header here instead, or it gets a 403. Otherwise a
+  cross-site form could write with the user's cookie.
+- A miss loads the four columns plus session_version (not the User entity). A cookie whose
+  version no longer matches the row was revoked and resolves to no principal.
+- Changing a user's role or is_active bumps session_version, so existing cookies and refresh
+  tokens are revoked and the user logs in again under the new access, and calls
+  principal_cache.invalidate(user_id), which drops every cached version of that user in this
+  worker. Other workers drop theirs once the entry's TTL runs out.
+'''
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    role: UserRoleEnum
+    team: str | None
+    is_active: bool
+
+
+class PrincipalCache:
+    def __init__(self, ttl: float, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, int], tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, version: int) -> Principal | None:
+        key = (user_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, version: int, principal: Principal) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(principal.id, version)] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end((principal.id, version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL, max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES
+)
+
+
+def start_session(request: Request, user: User) -> None:
+    """Log `user` in on this cookie session (called after the credentials were checked)."""
+    request.session["user_id"] = user.id
+    request.session["session_version"] = user.session_version
+
+
+async def load_principal(session: AsyncSession, user_id: int, version: int) -> Principal | None:
+    row = (
+        await session.execute(
+            select(User.id, User.role, User.team, User.is_active, User.session_version).where(
+                User.id == user_id
+            )
+        )
+    ).first()
+    if row is None or row.session_version != version:
+        return None
+    return Principal(id=row.id, role=row.role, team=row.team, is_active=bool(row.is_active))
+
+
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
+_csrf_serializer = URLSafeSerializer(settings.CSRF_SECRET, "csrftoken")  # as CSRFMiddleware
+
+
+def check_csrf(request: Request) -> None:
+    """403 unless an unsafe request's CSRF header matches its CSRF cookie (double submit)."""
+    if request.method in _SAFE_METHODS:
+        return
+    cookie = request.cookies.get(settings.CSRF_COOKIE_NAME)
+    submitted = request.headers.get(settings.CSRF_HEADER_NAME)
+    try:
+        valid = bool(cookie and submitted) and secrets.compare_digest(
+            _csrf_serializer.loads(cookie), _csrf_serializer.loads(submitted)
+        )
+    except BadSignature:
+        valid = False
+    if not valid:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, detail="CSRF Validation Failed")
+
+
+def principal_from_token(authorization: str) -> Principal:
+    scheme, _, token = authorization.partition(" ")
+    try:
+        if scheme.lower() != "bearer" or not token:
+            raise TokenError("Expected a Bearer token")
+        claims = verify_token(token.strip())
+        return Principal(
+            id=int(claims["sub"]),
+            role=UserRoleEnum(claims["role"]),
+            team=claims.get("team"),
+            is_active=True,  # inactive users cannot obtain or refresh tokens
+        )
+    except (TokenError, KeyError, ValueError) as exc:
+        logger.info(f"Rejected bearer token: {exc!r}")  # the reason stays in the log
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from exc
+
+
+async def get_principal(
+    request: Request, session: AsyncSession = Depends(get_read_db_session)
+) -> Principal | None:
+    """The logged-in, active principal of this request, or None for anonymous requests."""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return principal_from_token(authorization)
+    user_id = request.session.get("user_id")
+    if user_id is None:
+        return None
+    check_csrf(request)
+    version = request.session.get("session_version", 0)
+    principal = principal_cache.get(user_id, version)
+    if principal is None:
+        principal = await load_principal(session, user_id, version)
+        if principal is None:
+            logger.info(f"Dropping revoked session of user {user_id}")
+            request.session.clear()  # deleted user or bumped session_version
+            return None
+        principal_cache.put(version, principal)
+    return principal if principal.is_active else None
+
+
+async def require_principal(principal: Principal | None = Depends(get_principal)) -> Principal:
+    if principal is None:
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+def require_role(*roles: UserRoleEnum):
+    """Dependency factory: the principal must have one of `roles`, e.g. require_role(OWNER)."""
+
+    async def dependency(principal: Principal = Depends(require_principal)) -> Principal:
+        if principal.role not in roles:
+            raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+        return principal
+
+    return dependency
@@ -0,0 +1,50 @@
+# app/core/projection.py
+# Column-projection read path: select only the columns an *Out schema needs, validate rows in bulk.
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Select, inspect, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import InstrumentedAttribute
+
+'''
+select(Model) builds a full ORM object per row: identity-map lookup, instance state, every column
+loaded, and relationship loaders wired up. The *Out schemas then read it back attribute by attribute.
+For read-only lists none of that is needed:
+- projection(RiskOut, Risk) maps the schema's fields onto the model's columns (computed once, cached);
+- select_projection() is a Core select of exactly those columns, returning plain Rows;
+- validate_rows() validates the whole list in one TypeAdapter call instead of one model_validate per row.
+'''
+
+
+@cache
+def projection(schema: type[BaseModel], model: type) -> tuple[InstrumentedAttribute, ...]:
+    """Model columns for the fields of `schema`; schema fields with defaults may have no column."""
+    columns = inspect(model).columns
+    attributes = []
+    for name, field in schema.model_fields.items():
+        if name in columns:
+            attributes.append(getattr(model, name))
+        elif field.is_required():
+            raise ValueError(f"{schema.__name__}.{name} has no column on {model.__name__}")
+    return tuple(attributes)
+
+
+def select_projection(schema: type[BaseModel], model: type) -> Select:
+    return select(*projection(schema, model))
+
+
+@cache
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])  # type: ignore[valid-type]
+
+
+def validate_rows(schema: type[BaseModel], rows: Sequence[Row]) -> list[Any]:
+    """Validate projected rows into `schema` instances in a single pydantic-core call."""
+    # plain dicts validate faster than attribute access on Row objects
+    return _list_adapter(schema).validate_python([row._asdict() for row in rows])
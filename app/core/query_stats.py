@@ -0,0 +1,128 @@
+# app/core/query_stats.py
+# Per-request SQL statement counting, DB time and repeated-statement (N+1) detection.
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+'''
+Listeners sit on the Engine class, so every engine (primary, writer, replicas, test engines) reports.
+Stats are collected into whatever QueryStats is active in the current context;
+RequestLoggingMiddleware opens one per request, tests open one via the assert_max_queries fixture.
+Nested trackers also report to their parent, so a test tracker sees the queries of the requests it makes.
+Other subsystems (slow-query log, index advisor) hook in with add_query_observer() instead of
+registering their own timing listeners.
+'''
+
+# fn(conn, statement, parameters, context, executemany, elapsed_seconds)
+QueryObserver = Callable[[Any, str, Any, Any, bool, float], None]
+_observers: list[QueryObserver] = []
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Call `observer` after every cursor execution with its elapsed time."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|\$\d+|:\w+)\s*,)+\s*(?:\?|%s|\$\d+|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: literals and IN-lists collapsed, whitespace squashed."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    route: str | None = None
+    parent: QueryStats | None = None
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    statements: list[str] = field(default_factory=list)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        stats: QueryStats | None = self
+        shape = normalize_statement(statement)
+        while stats is not None:
+            stats.count += 1
+            stats.total_time += elapsed
+            stats.shapes[shape] += 1
+            stats.statements.append(statement)
+            stats = stats.parent
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times: likely N+1 loops."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("forizec_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(route: str | None = None) -> Iterator[QueryStats]:
+    """Collect statements executed in this context (and tasks started from it) into a QueryStats."""
+    stats = QueryStats(route=route, parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def untracked() -> Iterator[None]:
+    """Run housekeeping queries (EXPLAIN etc.) without charging them to the current request."""
+    token = _current_stats.set(None)
+    try:
+        yield
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("forizec_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["forizec_query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for observer in _observers:
+        observer(conn, statement, parameters, context, executemany, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("forizec_query_start"):
+        conn.info["forizec_query_start"].pop()
@@ -0,0 +1,158 @@
+# app/core/slow_query.py
+# Slow-query log: statements over a threshold are logged (sampled, rate-limited) with an EXPLAIN plan.
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import random
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.query_stats import add_query_observer, current_query_stats, untracked
+
+'''
+Each entry is one JSON line in logs/slow_queries.log:
+    {"ts", "duration_ms", "route", "statement", "parameters", "plan"}
+The plan is captured after the fact on a separate pooled connection, in a background task,
+so the request that ran the slow statement never waits for it. Only SELECTs are explained.
+Sampling (SLOW_QUERY_SAMPLE_RATE) and a per-minute cap (SLOW_QUERY_MAX_PER_MINUTE) keep the
+log and the extra EXPLAIN load bounded in production.
+'''
+
+slow_logger = get_logger("slow_query")
+
+MAX_PARAMETERS_CHARS = 500
+
+_explaining: ContextVar[bool] = ContextVar("forizec_explaining", default=False)
+_async_engines: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_pending: set[asyncio.Task] = set()
+
+
+class RateLimiter:
+    """Token bucket: at most `per_minute` events per minute, with bursts up to the same size."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+_limiter = RateLimiter(settings.SLOW_QUERY_MAX_PER_MINUTE)
+
+
+def explain_prefix(dialect_name: str) -> str | None:
+    return {
+        "sqlite": "EXPLAIN QUERY PLAN ",
+        "postgresql": "EXPLAIN ",
+        "mysql": "EXPLAIN ",
+        "mariadb": "EXPLAIN ",
+    }.get(dialect_name)
+
+
+def format_plan(dialect_name: str, rows: list[Any]) -> list[str]:
+    """EXPLAIN result rows as one line per plan step (shared with the index advisor)."""
+    if dialect_name == "sqlite":
+        return [str(row[-1]) for row in rows]  # (id, parent, notused, detail)
+    return [" | ".join(str(col) for col in row) for row in rows]
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters: Any) -> list[str] | None:
+    """EXPLAIN `statement` on a fresh connection from `engine`; None if the dialect has no support."""
+    prefix = explain_prefix(engine.dialect.name)
+    if prefix is None:
+        return None
+    token = _explaining.set(True)
+    try:
+        with untracked():
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(prefix + statement, parameters or ())
+                return format_plan(engine.dialect.name, result.fetchall())
+    finally:
+        _explaining.reset(token)
+
+
+def _async_engine_for(sync_engine) -> AsyncEngine:
+    async_engine = _async_engines.get(sync_engine)
+    if async_engine is None:
+        async_engine = _async_engines[sync_engine] = AsyncEngine(sync_engine)
+    return async_engine
+
+
+def _write(entry: dict[str, Any]) -> None:
+    slow_logger.warning(json.dumps(entry, default=str))
+
+
+async def _explain_and_write(engine: AsyncEngine, entry: dict[str, Any], parameters: Any) -> None:
+    try:
+        entry["plan"] = await explain(engine, entry["statement"], parameters)
+    except Exception as exc:  # a failed EXPLAIN must not lose the slow-query entry
+        entry["plan_error"] = str(exc)
+    _write(entry)
+
+
+def _on_query(conn, statement, parameters, context, executemany, elapsed) -> None:
+    if elapsed * 1000 < settings.SLOW_QUERY_THRESHOLD_MS or _explaining.get():
+        return
+    # sampling decides what gets logged; it needs no unpredictability
+    if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE or not _limiter.allow():  # noqa: S311
+        return
+
+    stats = current_query_stats()
+    entry: dict[str, Any] = {
+        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "duration_ms": round(elapsed * 1000, 2),
+        "route": stats.route if stats else None,
+        "statement": statement,
+        "parameters": repr(parameters)[:MAX_PARAMETERS_CHARS],
+        "dialect": conn.dialect.name,
+    }
+
+    explainable = (
+        settings.SLOW_QUERY_EXPLAIN
+        and not executemany
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and explain_prefix(conn.dialect.name) is not None
+    )
+    if not explainable:
+        _write(entry)
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:  # sync usage (scripts, alembic): log without a plan
+        _write(entry)
+        return
+    task = loop.create_task(_explain_and_write(_async_engine_for(conn.engine), entry, parameters))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def drain_pending_explains() -> None:
+    """Wait for in-flight EXPLAIN captures (app shutdown, tests)."""
+    if _pending:
+        await asyncio.gather(*list(_pending), return_exceptions=True)
+
+
+def install_slow_query_log() -> None:
+    if settings.SLOW_QUERY_ENABLED:
+        add_query_observer(_on_query)
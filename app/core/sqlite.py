@@ -0,0 +1,183 @@
+# app/core/sqlite.py
+# SQLite engine profile (pragmas, pool sizing) and the single-writer queue used when DB_BACKEND=sqlite.
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.pool import Pool
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+'''
+SQLite allows one writer at a time. With the default rollback journal, readers block the writer
+and concurrent writers fail fast with "database is locked".
+- WAL lets readers run alongside the single writer.
+- busy_timeout makes a blocked connection wait instead of failing immediately.
+- synchronous=NORMAL is durable across application crashes in WAL mode and skips most fsyncs.
+- Writes go through one dedicated writer connection (a pool of one) so this process never has
+  two writers racing: request sessions switch to it for their writes (RoutingSession in db.py).
+- SQLiteWriteQueue is for bulk writers (imports, background jobs) that submit many small
+  writes: built on a session maker bound to the writer engine, it batches them into one COMMIT.
+- foreign_keys=ON is set on every SQLite connection (app, tests, scripts): the models rely on
+  ON DELETE CASCADE, which SQLite ignores unless enforcement is switched on per connection.
+'''
+
+
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def is_memory_sqlite_url(url: str) -> bool:
+    return ":memory:" in url or "mode=memory" in url
+
+
+def sqlite_pragmas() -> dict[str, Any]:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # negative = KiB rather than pages
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": "MEMORY",
+    }
+
+
+def sqlite_engine_options(url: str, pool_size: int) -> dict[str, Any]:
+    """create_async_engine() options for SQLite; in-memory databases keep their static pool."""
+    if is_memory_sqlite_url(url):
+        return dict(echo=settings.DEBUG)
+    return dict(
+        echo=settings.DEBUG,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=30,
+    )
+
+
+def install_sqlite_pragmas(engine: AsyncEngine) -> None:
+    """Apply sqlite_pragmas() to every new DBAPI connection of `engine`."""
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+@event.listens_for(Pool, "connect")
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    if "sqlite" in type(dbapi_connection).__module__:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+@dataclass
+class _WriteJob:
+    fn: Callable[[AsyncSession], Awaitable[Any]]
+    future: asyncio.Future = field(repr=False)
+
+
+class SQLiteWriteQueue:
+    """
+    Serialises writes through one background task and one connection.
+    Queued jobs are drained in batches; each job runs in its own SAVEPOINT so a failing job
+    only rolls back itself, and the whole batch is committed with a single COMMIT (one fsync).
+    At most `max_pending` jobs wait in the queue; further submit() calls wait for room, so a
+    writer that can't keep up slows its callers down instead of growing memory without bound.
+    """
+
+    def __init__(
+        self,
+        session_maker: Callable[[], AsyncSession],
+        max_batch: int | None = None,
+        max_pending: int | None = None,
+    ):
+        self.session_maker = session_maker
+        self.max_batch = settings.SQLITE_WRITE_BATCH_SIZE if max_batch is None else max_batch
+        self.max_pending = settings.SQLITE_WRITE_QUEUE_SIZE if max_pending is None else max_pending
+        self._queue: asyncio.Queue[_WriteJob] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run(), name="sqlite-writer")
+
+    async def stop(self) -> None:
+        """Finish queued writes, then stop the writer task."""
+        if not self.running:
+            return
+        assert self._queue is not None and self._task is not None
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, fn: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Queue `fn(session)` (waiting while the queue is full) and wait for its batch to commit."""
+        if not self.running:
+            await self.start()
+        assert self._queue is not None
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_WriteJob(fn, future))
+        return await future
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write_batch(batch)
+            except Exception:  # the writer must survive a bad batch
+                logger.exception(f"SQLite writer failed to commit a batch of {len(batch)} writes")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_batch(self, batch: list[_WriteJob]) -> None:
+        done: list[tuple[_WriteJob, Any]] = []
+        async with self.session_maker() as session:
+            session.info["use_primary"] = True
+            for job in batch:
+                if job.future.cancelled():
+                    continue
+                try:
+                    async with session.begin_nested():
+                        result = await job.fn(session)
+                    done.append((job, result))
+                except Exception as exc:
+                    job.future.set_exception(exc)
+            try:
+                await session.commit()
+            except Exception as exc:
+                for job, _ in done:
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+                raise
+        for job, result in done:
+            if not job.future.done():
+                job.future.set_result(result)
@@ -0,0 +1,106 @@
+# app/core/templating.py
+# Jinja2 environment with an on-disk bytecode cache, and eager compilation of every template.
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import TEMPLATE_RENDER
+from app.core.page_cache import FragmentCacheExtension, RenderCache
+
+logger = get_logger(__name__)
+
+'''
+Jinja compiles each template (lex, parse, generate Python source, compile()) the first time it is
+requested, per process. Every worker restart therefore put that cost on the first visitor of each
+page, and the compiled code was thrown away again on the next restart.
+- create_templates() gives the environment a FileSystemBytecodeCache in TEMPLATE_CACHE_DIR.
+  A process that finds a template there unmarshals the code object instead of compiling it.
+  Entries are keyed by template name and absolute path and checked against a checksum of the
+  source, so edited templates recompile; Jinja also drops entries written by another Python
+  version. Build the cache where the app will run (or at the same path in the image).
+- precompile_templates() loads every template into the environment's in-memory cache. The
+  lifespan calls it, so no request compiles or reads a cache file.
+- `python forizec.py compiletemplates` fills the cache ahead of time, e.g. while building a
+  deploy image, so new workers start with nothing to compile.
+- auto_reload (TEMPLATE_AUTO_RELOAD, default DEBUG) makes Jinja stat the source on every
+  render to pick up edits; production templates only change with a deploy.
+'''
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml", ".j2", ".jinja")
+
+
+class TimedTemplate(jinja2.Template):
+    """Records each page render (includes and extends count toward the page) in metrics."""
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            TEMPLATE_RENDER.observe(self.name or "<string>", value=time.perf_counter() - start)
+
+
+def create_environment(
+    directory: Path,
+    cache_dir: Path | None = None,
+    auto_reload: bool | None = None,
+) -> jinja2.Environment:
+    bytecode_cache = None
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_dir))
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(directory),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
+        auto_reload=settings.DEBUG if auto_reload is None else auto_reload,
+        extensions=[FragmentCacheExtension],  # {% cache %} blocks
+    )
+    env.template_class = TimedTemplate
+    return env
+
+
+def create_templates(
+    directory: Path | None = None,
+    cache_dir: Path | None = None,
+    auto_reload: bool | None = None,
+) -> Jinja2Templates:
+    """Jinja2Templates for `directory` (default TEMPLATES_DIR), cached in TEMPLATE_CACHE_DIR."""
+    env = create_environment(
+        directory or settings.TEMPLATES_DIR,
+        cache_dir if cache_dir is not None else settings.TEMPLATE_CACHE_DIR,
+        settings.TEMPLATE_AUTO_RELOAD if auto_reload is None else auto_reload,
+    )
+    if settings.PAGE_CACHE_ENABLED:
+        env.render_cache = RenderCache(settings.PAGE_CACHE_MAX_BYTES, settings.PAGE_CACHE_TTL)
+    return Jinja2Templates(env=env)
+
+
+def template_names(env: jinja2.Environment) -> list[str]:
+    return env.list_templates(filter_func=lambda name: name.endswith(TEMPLATE_SUFFIXES))
+
+
+def precompile_templates(env: jinja2.Environment) -> dict[str, float]:
+    """Load every template of `env` (compiling and caching as needed); name -> seconds taken.
+
+    Templates that fail to compile are logged and skipped: the page that uses one fails as
+    it would have without precompiling, the rest of the site still starts.
+    """
+    timings = {}
+    for name in template_names(env):
+        start = time.perf_counter()
+        try:
+            env.get_template(name)
+        except jinja2.TemplateError as exc:
+            logger.error(f"Template {name} does not compile: {exc}")
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
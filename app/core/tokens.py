@@ -0,0 +1,190 @@
+# app/core/tokens.py
+# Signed, short-lived access tokens and refresh tokens for the /api routers (HS256 JWT).
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import settings
+
+'''
+API clients authenticate with `Authorization: Bearer <access token>`. Verifying one is an HMAC and
+a JSON decode: the token carries sub/role/team, so no session or user lookup happens per call.
+- Tokens are compact JWTs (HS256) built with the standard library; no JWT package is required.
+- Keys live in TOKEN_SIGNING_KEYS (kid -> secret). New tokens are signed with TOKEN_ACTIVE_KID and
+  name it in the header; any key still in the ring verifies. To rotate: add a key, make it
+  active, and drop the old one after REFRESH_TOKEN_TTL. Each key's HMAC state is built once
+  and copied per token, and decoded headers are cached, so verification does no key setup.
+- Access tokens live ACCESS_TOKEN_TTL (15 minutes by default); role changes reach API clients on refresh.
+  Refresh tokens carry the user's session_version and are checked against the database by
+  /auth/token/refresh, which also rotates them (the old refresh token is denied).
+- Revocation is optional and per worker: TokenDenyList holds revoked jti values only until the
+  token would have expired anyway, so it stays small.
+'''
+
+ALGORITHM = "HS256"
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class TokenError(Exception):
+    """The token is malformed, badly signed, expired, revoked or of the wrong type."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _json(data: dict[str, Any]) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+class KeyRing:
+    """HMAC keys by kid; `active_kid` signs, every key verifies."""
+
+    def __init__(self, keys: dict[str, str], active_kid: str | None = None):
+        if not keys:
+            raise ValueError("KeyRing needs at least one signing key")
+        self.active_kid = active_kid or list(keys)[-1]
+        if self.active_kid not in keys:
+            raise ValueError(f"Active token key {self.active_kid!r} is not in the key ring")
+        self._macs = {
+            kid: hmac.new(secret.encode(), digestmod=hashlib.sha256) for kid, secret in keys.items()
+        }
+        self._headers = {
+            kid: _b64encode(_json({"alg": ALGORITHM, "typ": "JWT", "kid": kid})) for kid in keys
+        }
+
+    @classmethod
+    def from_settings(cls) -> KeyRing:
+        keys = settings.TOKEN_SIGNING_KEYS
+        if not keys:  # derived, so tokens and session cookies never share a key
+            derived = hmac.new(settings.SECRET_KEY.encode(), b"forizec-api-tokens", hashlib.sha256)
+            keys = {"default": derived.hexdigest()}
+        return cls(keys, settings.TOKEN_ACTIVE_KID)
+
+    def _signature(self, kid: str, signing_input: bytes) -> bytes:
+        mac = self._macs[kid].copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        signing_input = f"{self._headers[self.active_kid]}.{_b64encode(_json(claims))}"
+        signature = self._signature(self.active_kid, signing_input.encode())
+        return f"{signing_input}.{_b64encode(signature)}"
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Claims of a validly signed token (expiry and type are checked by verify_token)."""
+        try:
+            header, payload, signature = token.split(".")
+            kid = _header_kid(header)
+            if kid not in self._macs:
+                raise TokenError("Unknown signing key")
+            expected = self._signature(kid, f"{header}.{payload}".encode())
+            if not hmac.compare_digest(expected, _b64decode(signature)):
+                raise TokenError("Bad signature")
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, binascii.Error, UnicodeDecodeError) as exc:
+            raise TokenError(f"Malformed token: {exc}") from None
+        if not isinstance(claims, dict):
+            raise TokenError("Malformed token")
+        return claims
+
+
+@lru_cache(maxsize=64)
+def _header_kid(segment: str) -> str:
+    header = json.loads(_b64decode(segment))
+    if (
+        not isinstance(header, dict)
+        or header.get("alg") != ALGORITHM
+        or not isinstance(header.get("kid"), str)
+    ):
+        raise ValueError("unsupported token header")
+    return header["kid"]
+
+
+class TokenDenyList:
+    """Revoked token ids (jti), each kept only until that token's expiry."""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._expiries: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def deny(self, jti: str, expires_at: int) -> None:
+        now = int(time.time())
+        if expires_at <= now:
+            return
+        with self._lock:
+            if len(self._expiries) >= self.max_entries:
+                self._prune(now)
+            self._expiries[jti] = expires_at
+
+    def __contains__(self, jti: str) -> bool:
+        expires_at = self._expiries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def _prune(self, now: int) -> None:
+        self._expiries = {jti: exp for jti, exp in self._expiries.items() if exp > now}
+        # still full: forget the tokens closest to expiring on their own
+        if len(self._expiries) >= self.max_entries:
+            keep = sorted(self._expiries.items(), key=lambda kv: kv[1])[len(self._expiries) // 2 :]
+            self._expiries = dict(keep)
+
+
+key_ring = KeyRing.from_settings()
+deny_list = TokenDenyList(settings.TOKEN_DENYLIST_MAX_ENTRIES)
+
+
+def _issue(token_type: str, ttl: int, claims: dict[str, Any]) -> str:
+    now = int(time.time())
+    jti = _b64encode(secrets.token_bytes(12))
+    return key_ring.encode({**claims, "typ": token_type, "iat": now, "exp": now + ttl, "jti": jti})
+
+
+def issue_access_token(user_id: int, role: str, team: str | None) -> str:
+    return _issue(
+        ACCESS, settings.ACCESS_TOKEN_TTL, {"sub": str(user_id), "role": role, "team": team}
+    )
+
+
+def issue_refresh_token(user_id: int, session_version: int) -> str:
+    return _issue(
+        REFRESH, settings.REFRESH_TOKEN_TTL, {"sub": str(user_id), "ver": session_version}
+    )
+
+
+def verify_token(token: str, token_type: str = ACCESS) -> dict[str, Any]:
+    """Claims of a valid, unexpired, unrevoked token of `token_type`; raises TokenError otherwise."""
+    claims = key_ring.decode(token)
+    if claims.get("typ") != token_type:
+        raise TokenError(f"Expected a {token_type} token")
+    exp = claims.get("exp")
+    if not isinstance(exp, int) or exp <= time.time():
+        raise TokenError("Token expired")
+    if claims.get("jti") in deny_list:
+        raise TokenError("Token revoked")
+    return claims
+
+
+def revoke_token(token: str) -> None:
+    """Deny a signed access or refresh token until it expires; raises TokenError if unsigned."""
+    claims = key_ring.decode(token)
+    if isinstance(claims.get("jti"), str) and isinstance(claims.get("exp"), int):
+        deny_list.deny(claims["jti"], claims["exp"])
@@ -1,33 +1,59 @@
 # app/main.py
 # This file initializes the FastAPI application and sets up the necessary configurations.
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 
 # from pydantic_settings import BaseSettings, SettingsConfigDict
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import HTTPException, RequestValidationError
-from starlette.exceptions import HTTPException as StarletHTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.exc import IntegrityError
+from starlette.exceptions import HTTPException as StarletHTTPException
 
 # from sqlalchemy.ext.asyncio import async_engine_from_config
-from app.api.v1.routes import admin, auth, user
+from app.api.v1.routes import (
+    activity,
+    admin,
+    auth,
+    compliance,
+    document,
+    policy,
+    procedure,
+    reminder,
+    risk,
+    user,
+)
+from app.core.assets import (
+    MANIFEST_NAME,
+    PrecompressedStaticFiles,
+    StaticManifest,
+    responsive_image_global,
+    static_url_global,
+)
+from app.core.config import settings
+from app.core.db import Base, dispose_engines, engine
 from app.core.exceptions import register_exception_handlers
+from app.core.images import shutdown_upload_executor
+from app.core.index_advisor import install_pattern_recorder, save_query_patterns
+from app.core.logging_config import configure_logging, get_logger
+from app.core.metrics import final_flush, flush_periodically
 from app.core.middleware import register_middleware
+from app.core.passwords import password_hasher
+from app.core.principal import require_principal
+from app.core.responses import FastJSONResponse
+from app.core.slow_query import drain_pending_explains, install_slow_query_log
+from app.core.templating import create_templates, precompile_templates
 from app.views.auth import router as web_auth_router
 from app.views.dashboard import router as web_dashboard_router
 from app.views.public import router as web_public_router
-from app.core.config import settings
-from app.core.db import Base, engine
-
-from app.core.logging_config import configure_logging, get_logger
-
 
 # configure logging ar startup
 configure_logging()
+install_slow_query_log()
+install_pattern_recorder()
 
 logger = get_logger()
 
@@ -42,11 +68,23 @@ async def lifespan(app: FastAPI):
         async with engine.begin() as conn:
             # Create all tables if they don't exist
             await conn.run_sync(Base.metadata.create_all)
+
+    if settings.TEMPLATE_PRECOMPILE:
+        compiled = precompile_templates(app.state.templates.env)
+        logger.debug(f"Compiled {len(compiled)} templates in {sum(compiled.values()):.3f}s")
+    metrics_flusher = asyncio.create_task(flush_periodically())
     yield
 
+    metrics_flusher.cancel()
+    final_flush()
+
     # print("Forizec App shutting down...")
     logger.debug("Forizec App shutting down...")
-    await engine.dispose()
+    await drain_pending_explains()
+    save_query_patterns()
+    await dispose_engines()
+    password_hasher.shutdown()
+    shutdown_upload_executor()
 
 
 def create_app() -> FastAPI:
@@ -57,23 +95,62 @@ def create_app() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         lifespan=lifespan,
         debug=settings.DEBUG,
+        default_response_class=FastJSONResponse,
     )
 
     register_exception_handlers(app)
     register_middleware(app)
 
-    # Mount static files
-    app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
+    # Mount static files: the collectstatic build (hashed, precompressed) once it exists
+    static_manifest = StaticManifest.load(settings.STATIC_ROOT / MANIFEST_NAME)
+    static_dir = settings.STATIC_ROOT if static_manifest else settings.STATIC_DIR
+    app.mount(
+        "/static",
+        PrecompressedStaticFiles(directory=static_dir, manifest=static_manifest),
+        name="static",
+    )
     app.mount("/media", StaticFiles(directory=settings.MEDIA_DIR), name="media")
 
-    # Set up Jinja2 templates
-    templates = Jinja2Templates(directory=settings.TEMPLATES_DIR)
+    # Set up Jinja2 templates (bytecode cached in TEMPLATE_CACHE_DIR)
+    templates = create_templates()
+    templates.env.globals["static_url"] = static_url_global(static_manifest)
+    templates.env.globals["responsive_image"] = responsive_image_global(static_manifest)
     app.state.templates = templates
+    app.state.render_cache = templates.env.render_cache  # rendered pages and {% cache %} blocks
 
     # Include routers
     app.include_router(admin.router, prefix=settings.API_V1_STR, tags=["admin"])
     app.include_router(user.router, prefix=settings.API_V1_STR, tags=["user"])
     app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["auth"])
+    # data routers need a principal: Bearer access token (API clients) or session cookie
+    authenticated = [Depends(require_principal)]
+    app.include_router(
+        policy.router, prefix=settings.API_V1_STR, tags=["policies"], dependencies=authenticated
+    )
+    app.include_router(
+        procedure.router,
+        prefix=settings.API_V1_STR,
+        tags=["procedures"],
+        dependencies=authenticated,
+    )
+    app.include_router(
+        risk.router, prefix=settings.API_V1_STR, tags=["risks"], dependencies=authenticated
+    )
+    app.include_router(
+        activity.router, prefix=settings.API_V1_STR, tags=["activity"], dependencies=authenticated
+    )
+    app.include_router(
+        document.router, prefix=settings.API_V1_STR, tags=["documents"], dependencies=authenticated
+    )
+    app.include_router(
+        reminder.router, prefix=settings.API_V1_STR, tags=["reminders"], dependencies=authenticated
+    )
+    app.include_router(
+        compliance.router,
+        prefix=settings.API_V1_STR,
+        tags=["compliance"],
+        dependencies=authenticated,
+    )
 
     app.include_router(web_auth_router, tags=["web"])
     app.include_router(web_dashboard_router, tags=["web"])
@@ -12,32 +12,45 @@ from .enums import (
 )
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.db import Base
-from passlib.hash import bcrypt
+from app.core.passwords import pwd_context
 
 '''
 set index=True on ForeignKey columns for performance optimization on lookups and joins. improve query performance. policy_id, procedure_id, service_id, uploaded_by, assigned_to, user_id, invited_by.
 added risks relationships on Pilicy and Procedure models for bi-directional access to risks.
 added missing back_populates/relationships sides(esp. on User, Risk, Document, acceptances, schedule, reminders) for ORM integrity and easier navigation.
 added cascade="all, delete-orphan" to relationships to ensure related records are cleaned up when a parent is deleted.
-Consider composite indexes if query by multiple columns concucurrently (e.g., (policy_id, status)), but only add after profiling actual query patterns.
+child foreign keys are ON DELETE CASCADE and the parent sides use passive_deletes=True: deleting a parent is one DELETE, the database removes the tree instead of the ORM loading every child first. (SQLite needs PRAGMA foreign_keys=ON, see app/core/sqlite.py.)
+Consider composite indexes if query by multiple columns concucurrently (e.g., (policy_id, status)), but only add after profiling actual query patterns (python forizec.py advise-indexes).
 when serializing nested objects, avoid lazy loading loops; use selectinload or joinedload in queries to avoid n+1 query issues.
+relationships default to lazy="raise" (collections) and lazy="raise_on_sql" (many-to-one), nothing is loaded implicitly. pick a named profile from app/models/loader_profiles.py to eager load what a route needs.
+timestamp defaults are the utcnow callable, not datetime.now(...): a value computed at import would stamp every row with the process start time and updated_at would never move (conditional GET in app/core/conditional.py relies on it).
 '''
 
 
+def utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
 class Service(Base):
     __tablename__ = "services"
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     description = Column(Text)
     policies = relationship(
-        "Policy", back_populates="service", cascade="all, delete-orphan", lazy="selectin"
+        "Policy",
+        back_populates="service",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
 
 class Policy(Base):
     __tablename__ = "policies"
     id = Column(Integer, primary_key=True)
-    service_id = Column(Integer, ForeignKey("services.id"), nullable=False, index=True)
+    service_id = Column(
+        Integer, ForeignKey("services.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     title = Column(String, nullable=False)
     number = Column(String)
     description = Column(Text)
@@ -45,34 +58,52 @@ class Policy(Base):
     status = Column(
         SAEnum(ComplienceStatusEnum, native_enum=False), default=ComplienceStatusEnum.PENDING
     )
-    created_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
     updated_at = Column(
         DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        onupdate=datetime.datetime.now(datetime.timezone.utc),
+        default=utcnow,
+        onupdate=utcnow,
     )
 
-    service = relationship("Service", back_populates="policies", lazy="joined")
+    service = relationship("Service", back_populates="policies", lazy="raise_on_sql")
     procedures = relationship(
-        "Procedure", back_populates="policy", cascade="all, delete-orphan", lazy="selectin"
+        "Procedure",
+        back_populates="policy",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     documents = relationship(
-        "Document", back_populates="policy", cascade="all, delete-orphan", lazy="selectin"
+        "Document",
+        back_populates="policy",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     acceptances = relationship(
-        "PolicyAcceptance", back_populates="policy", cascade="all, delete-orphan", lazy="selectin"
+        "PolicyAcceptance",
+        back_populates="policy",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     # Link to Risks:
     risks = relationship(
-        "Risk", back_populates="related_policy", cascade="all, delete-orphan", lazy="selectin"
+        "Risk",
+        back_populates="related_policy",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
 
 class Procedure(Base):
     __tablename__ = "procedures"
     id = Column(Integer, primary_key=True)
-    policy_id = Column(Integer, ForeignKey("policies.id"), nullable=False, index=True)
+    policy_id = Column(
+        Integer, ForeignKey("policies.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     title = Column(String, nullable=False)
     path = Column(String)
     version = Column(String)
@@ -80,52 +111,71 @@ class Procedure(Base):
     status = Column(
         SAEnum(ComplienceStatusEnum, native_enum=False), default=ComplienceStatusEnum.PENDING
     )
-    created_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
     updated_at = Column(
         DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        onupdate=datetime.datetime.now(datetime.timezone.utc),
+        default=utcnow,
+        onupdate=utcnow,
     )
 
-    policy = relationship("Policy", back_populates="procedures", lazy="joined")
+    policy = relationship("Policy", back_populates="procedures", lazy="raise_on_sql")
     checklist_items = relationship(
-        "ChecklistItem", back_populates="procedure", cascade="all, delete-orphan", lazy="selectin"
+        "ChecklistItem",
+        back_populates="procedure",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     activities = relationship(
-        "ActivityLog", back_populates="procedure", cascade="all, delete-orphan", lazy="selectin"
+        "ActivityLog",
+        back_populates="procedure",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     documents = relationship(
-        "Document", back_populates="procedure", cascade="all, delete-orphan", lazy="selectin"
+        "Document",
+        back_populates="procedure",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     acceptances = relationship(
         "ProcedureAcceptance",
         back_populates="procedure",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     # Link to Risks:
     risks = relationship(
-        "Risk", back_populates="related_procedure", cascade="all, delete-orphan", lazy="selectin"
+        "Risk",
+        back_populates="related_procedure",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
 
 class ChecklistItem(Base):
     __tablename__ = "checklist_items"
     id = Column(Integer, primary_key=True)
-    procedure_id = Column(Integer, ForeignKey("procedures.id"), nullable=False, index=True)
+    procedure_id = Column(
+        Integer, ForeignKey("procedures.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     description = Column(Text, nullable=False)
     sort_order = Column(Integer, default=0)
     # ca be implemented later if needed
     # is_completed = Column(Boolean, default=False)
     # completed_at = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
     updated_at = Column(
         DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        onupdate=datetime.datetime.now(datetime.timezone.utc),
+        default=utcnow,
+        onupdate=utcnow,
     )
 
-    procedure = relationship("Procedure", back_populates="checklist_items", lazy="joined")
+    procedure = relationship("Procedure", back_populates="checklist_items", lazy="raise_on_sql")
 
 
 class Risk(Base):
@@ -150,25 +200,34 @@ class Risk(Base):
     email_subject = Column(String)
     email_body = Column(Text)
 
-    related_policy_id = Column(Integer, ForeignKey("policies.id"), index=True)
-    related_procedure_id = Column(Integer, ForeignKey("procedures.id"), index=True)
+    related_policy_id = Column(Integer, ForeignKey("policies.id", ondelete="CASCADE"), index=True)
+    related_procedure_id = Column(
+        Integer, ForeignKey("procedures.id", ondelete="CASCADE"), index=True
+    )
 
-    related_policy = relationship("Policy", back_populates="risks", lazy="joined")
-    related_procedure = relationship("Procedure", back_populates="risks", lazy="joined")
+    related_policy = relationship("Policy", back_populates="risks", lazy="raise_on_sql")
+    related_procedure = relationship("Procedure", back_populates="risks", lazy="raise_on_sql")
 
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # keyset pagination (app/api/v1/routes/activity.py): newest first, optionally per procedure
+        Index("ix_activity_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_activity_logs_procedure_id_timestamp_id", "procedure_id", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    procedure_id = Column(Integer, ForeignKey("procedures.id"), nullable=False, index=True)
+    procedure_id = Column(
+        Integer, ForeignKey("procedures.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     description = Column(Text)
     performed_by = Column(String(100))
-    timestamp = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    timestamp = Column(DateTime, default=utcnow)
     outcome = Column(String(100))
 
     # Relationship to procedure
-    procedure = relationship("Procedure", back_populates="activities", lazy="joined")
+    procedure = relationship("Procedure", back_populates="activities", lazy="raise_on_sql")
 
 
 class User(Base):
@@ -182,38 +241,63 @@ class User(Base):
     role = Column(SAEnum(UserRoleEnum, native_enum=False), default=UserRoleEnum.USER)
     team = Column(String(100))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
     last_login = Column(DateTime)
+    # stored in the session cookie at login; bumping it revokes every existing session
+    session_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     # backref relationships
     documents = relationship(
-        "Document", back_populates="user", cascade="all, delete-orphan", lazy="selectin"
+        "Document",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     policy_acceptances = relationship(
-        "PolicyAcceptance", back_populates="user", cascade="all, delete-orphan", lazy="selectin"
+        "PolicyAcceptance",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     procedure_acceptances = relationship(
-        "ProcedureAcceptance", back_populates="user", cascade="all, delete-orphan", lazy="selectin"
+        "ProcedureAcceptance",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     invitations_sent = relationship(
-        "UserInvitation", back_populates="inviter", cascade="all, delete-orphan", lazy="selectin"
+        "UserInvitation",
+        back_populates="inviter",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
     assigned_schedules = relationship(
         "ComplianceSchedule",
         back_populates="assigned_user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
     reminders = relationship(
-        "Reminder", back_populates="user", cascade="all, delete-orphan", lazy="selectin"
+        "Reminder",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def verify_password(self, password: str) -> bool:
-        return bcrypt.verify(password, self.hashed_password)
+        """Blocking check for scripts and tests; request handlers use app.core.passwords.password_hasher."""
+        return pwd_context.verify(password, self.hashed_password)
 
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (Index("ix_documents_uploaded_at_id", "uploaded_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
@@ -221,64 +305,75 @@ class Document(Base):
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer)
     mime_type = Column(String(100))
-    uploaded_by = Column(Integer, ForeignKey("users.id"), index=True)
-    uploaded_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    uploaded_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    uploaded_at = Column(DateTime, default=utcnow)
 
     # Relationships to policies/procedures
-    policy_id = Column(Integer, ForeignKey("policies.id"), index=True)
-    procedure_id = Column(Integer, ForeignKey("procedures.id"), index=True)
+    policy_id = Column(Integer, ForeignKey("policies.id", ondelete="CASCADE"), index=True)
+    procedure_id = Column(Integer, ForeignKey("procedures.id", ondelete="CASCADE"), index=True)
 
-    policy = relationship("Policy", back_populates="documents", lazy="joined")
-    procedure = relationship("Procedure", back_populates="documents", lazy="joined")
-    user = relationship("User", back_populates="documents", lazy="joined")
+    policy = relationship("Policy", back_populates="documents", lazy="raise_on_sql")
+    procedure = relationship("Procedure", back_populates="documents", lazy="raise_on_sql")
+    user = relationship("User", back_populates="documents", lazy="raise_on_sql")
 
 
 class ComplianceSchedule(Base):
     __tablename__ = "compliance_schedule"
+    __table_args__ = (Index("ix_compliance_schedule_due_date_id", "due_date", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     due_date = Column(Date, nullable=False)
-    assigned_to = Column(Integer, ForeignKey("users.id"), index=True)
+    assigned_to = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
     status = Column(SAEnum(TaskStatusEnum, native_enum=False), default=TaskStatusEnum.PENDING)
     priority = Column(SAEnum(PriorityEnum, native_enum=False), default=PriorityEnum.MID)
-    created_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
     completed_at = Column(DateTime)
 
     # Relationships
-    related_policy_id = Column(Integer, ForeignKey("policies.id"), index=True)
-    related_procedure_id = Column(Integer, ForeignKey("procedures.id"), index=True)
+    related_policy_id = Column(Integer, ForeignKey("policies.id", ondelete="SET NULL"), index=True)
+    related_procedure_id = Column(
+        Integer, ForeignKey("procedures.id", ondelete="SET NULL"), index=True
+    )
 
-    assigned_user = relationship("User", back_populates="assigned_schedules", lazy="joined")
+    assigned_user = relationship("User", back_populates="assigned_schedules", lazy="raise_on_sql")
 
 
 class PolicyAcceptance(Base):
     __tablename__ = "policy_acceptances"
 
     id = Column(Integer, primary_key=True, index=True)
-    policy_id = Column(Integer, ForeignKey("policies.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    accepted_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    policy_id = Column(
+        Integer, ForeignKey("policies.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    accepted_at = Column(DateTime, default=utcnow)
     accepted = Column(Boolean, default=False)
     comments = Column(Text)
 
-    policy = relationship("Policy", back_populates="acceptances", lazy="joined")
-    user = relationship("User", back_populates="policy_acceptances", lazy="joined")
+    policy = relationship("Policy", back_populates="acceptances", lazy="raise_on_sql")
+    user = relationship("User", back_populates="policy_acceptances", lazy="raise_on_sql")
 
 
 class ProcedureAcceptance(Base):
     __tablename__ = "procedure_acceptances"
 
     id = Column(Integer, primary_key=True, index=True)
-    procedure_id = Column(Integer, ForeignKey("procedures.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    accepted_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    procedure_id = Column(
+        Integer, ForeignKey("procedures.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    accepted_at = Column(DateTime, default=utcnow)
     accepted = Column(Boolean, default=False)
     comments = Column(Text)
 
-    procedure = relationship("Procedure", back_populates="acceptances", lazy="joined")
-    user = relationship("User", back_populates="procedure_acceptances", lazy="joined")
+    procedure = relationship("Procedure", back_populates="acceptances", lazy="raise_on_sql")
+    user = relationship("User", back_populates="procedure_acceptances", lazy="raise_on_sql")
 
 
 class UserInvitation(Base):
@@ -288,23 +383,29 @@ class UserInvitation(Base):
     email = Column(String, nullable=False)
     role = Column(SAEnum(UserRoleEnum, native_enum=False), default=UserRoleEnum.USER)
     team = Column(String(100))
-    invited_by = Column(Integer, ForeignKey("users.id"), index=True)
-    invited_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    invited_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    invited_at = Column(DateTime, default=utcnow)
     token = Column(String(255), unique=True, nullable=False)
     expires_at = Column(DateTime, nullable=False)
     accepted = Column(Boolean, default=False)
     accepted_at = Column(DateTime)
 
     inviter = relationship(
-        "User", back_populates="invitations_sent", foreign_keys=[invited_by], lazy="joined"
+        "User", back_populates="invitations_sent", foreign_keys=[invited_by], lazy="raise_on_sql"
     )
 
 
 class Reminder(Base):
     __tablename__ = "reminders"
+    __table_args__ = (
+        Index("ix_reminders_due_date_id", "due_date", "id"),
+        Index("ix_reminders_user_id_due_date_id", "user_id", "due_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     title = Column(String(255), nullable=False)
     message = Column(Text)
     reminder_type = Column(String(50))  # task_due, policy_review, etc.
@@ -312,6 +413,6 @@ class Reminder(Base):
     due_date = Column(DateTime, nullable=False)
     sent_at = Column(DateTime)
     read_at = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.datetime.now(datetime.timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
 
-    user = relationship("User", back_populates="reminders", lazy="joined")
+    user = relationship("User", back_populates="reminders", lazy="raise_on_sql")
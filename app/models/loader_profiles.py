@@ -0,0 +1,46 @@
+# app/models/loader_profiles.py
+# Named ORM loader profiles for routes and services.
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from .core_models import Policy, Procedure
+
+'''
+Relationships in core_models never load implicitly (lazy="raise" / "raise_on_sql").
+Code that needs ORM entities with related rows names the profile it needs and gets exactly
+those eager loads, e.g.
+    stmt = with_profile(select(Policy).where(Policy.id == policy_id), "policy_tree")
+The API read paths select column projections instead (app/core/projection.py) and load no
+entities, so only the profiles with a caller (benchmarks/bench_loader_profiles.py) live here.
+Many-to-one sides use joinedload (one extra JOIN), collections use selectinload (one extra SELECT per level).
+Keep profiles narrow; add a new one rather than widening an existing one for a single caller.
+'''
+
+LOADER_PROFILES: dict[str, tuple[ORMOption, ...]] = {
+    "user_summary": (),
+    "policy_tree": (
+        joinedload(Policy.service),
+        selectinload(Policy.procedures).selectinload(Procedure.checklist_items),
+        selectinload(Policy.documents),
+        selectinload(Policy.risks),
+    ),
+}
+
+
+def loader_options(profile: str) -> tuple[ORMOption, ...]:
+    """Return the loader options registered under `profile`."""
+    try:
+        return LOADER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown loader profile: {profile}") from None
+
+
+def with_profile(stmt: Select[Any], profile: str) -> Select[Any]:
+    """Apply a named loader profile to a select() statement."""
+    return stmt.options(*loader_options(profile))
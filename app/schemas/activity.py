@@ -15,6 +15,6 @@ class ActivityLogCreate(BaseModel):
 
 class ActivityLogOut(ActivityLogCreate):
     id: int
-    timestamp: datetime
+    timestamp: Optional[datetime] = None  # nullable column, sorted last by the list route
 
     model_config = ConfigDict(from_attributes=True)
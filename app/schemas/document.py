@@ -16,7 +16,9 @@ class DocumentCreate(BaseModel):
 
 class DocumentOut(DocumentCreate):
     id: int
+    file_size: Optional[int] = None  # nullable columns
+    mime_type: Optional[str] = None
     uploaded_by: Optional[int] = None
-    uploaded_at: datetime
+    uploaded_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
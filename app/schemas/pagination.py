@@ -0,0 +1,14 @@
+# app/schemas/pagination.py
+from pydantic import BaseModel
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Envelope for keyset-paginated list responses; pass next_cursor back as ?cursor= for more."""
+
+    items: list[T]
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str] = None
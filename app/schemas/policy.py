@@ -1,8 +1,8 @@
 # app/schemas/policy.py
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
-from datetime import date
-from app.models.enums import PriorityEnum
+from datetime import date, datetime
+from app.models.enums import ComplienceStatusEnum, PriorityEnum
 
 
 class PolicyCreate(BaseModel):
@@ -16,5 +16,7 @@ class PolicyCreate(BaseModel):
 
 class PolicyOut(PolicyCreate):
     id: int
+    status: Optional[ComplienceStatusEnum] = None
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
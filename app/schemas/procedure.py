@@ -1,8 +1,8 @@
 # app/schemas/procedure.py
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
-from datetime import date
-from app.models.enums import PriorityEnum
+from datetime import date, datetime
+from app.models.enums import ComplienceStatusEnum, PriorityEnum
 
 
 class ProcedureCreate(BaseModel):
@@ -16,5 +16,17 @@ class ProcedureCreate(BaseModel):
 
 class ProcedureOut(ProcedureCreate):
     id: int
+    status: Optional[ComplienceStatusEnum] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChecklistItemOut(BaseModel):
+    id: int
+    procedure_id: int
+    description: str
+    sort_order: Optional[int] = 0
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
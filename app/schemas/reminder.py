@@ -0,0 +1,23 @@
+# app/schemas/reminder.py
+from pydantic import BaseModel, ConfigDict, constr
+from typing import Optional
+from datetime import datetime
+from app.models.enums import ReminderTypeEnum
+
+
+class ReminderCreate(BaseModel):
+    user_id: int
+    title: constr(max_length=255)  # type: ignore
+    message: Optional[str] = None
+    reminder_type: Optional[constr(max_length=50)] = None  # type: ignore
+    priority: Optional[ReminderTypeEnum] = ReminderTypeEnum.NONE
+    due_date: datetime
+
+
+class ReminderOut(ReminderCreate):
+    id: int
+    sent_at: Optional[datetime] = None
+    read_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
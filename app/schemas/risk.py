@@ -26,7 +26,26 @@ class RiskCreate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class RiskOut(RiskCreate):
+class RiskOut(BaseModel):
+    # every risks column except id is nullable, so rows created outside the API still serialize
     id: int
+    date_raised: Optional[date] = None
+    raised_by: Optional[str] = None
+    risk_category: Optional[str] = None
+    event: Optional[str] = None
+    cause: Optional[str] = None
+    consequence: Optional[str] = None
+    consequence_rating: Optional[str] = None
+    likelihood: Optional[str] = None
+    risk_rating: Optional[str] = None
+    action: Optional[str] = None
+    plan: Optional[str] = None
+    risk_owner: Optional[str] = None
+    resolve_by: Optional[date] = None
+    method: Optional[str] = None
+    progress_compliance_reporting: Optional[str] = None
+    status: Optional[str] = None
+    related_policy_id: Optional[int] = None
+    related_procedure_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
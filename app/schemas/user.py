@@ -15,6 +15,11 @@ class UserCreate(BaseModel):
     team: Optional[str] = None
 
 
+class UserLogin(BaseModel):
+    username: str  # the account email
+    password: str
+
+
 class UserUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -37,6 +42,15 @@ class UserOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PrincipalOut(BaseModel):
+    id: int
+    role: UserRoleEnum
+    team: Optional[str] = None
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserInvitationCreate(BaseModel):
     email: EmailStr
     role: UserRoleEnum = UserRoleEnum.USER
@@ -1,9 +1,22 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Log files of test runs go to a throwaway directory, not the checkout's logs/; set before
+# app.main is imported, which configures logging.
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="forizec-test-logs-"))
+
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.core.db import Base, get_db_session
+from app.core import passwords
+from app.core.db import Base, get_db_session, get_read_db_session
+from app.core.passwords import PasswordHasher
+from app.core.query_stats import track_queries
+from app.core.tokens import issue_access_token
 from app.main import create_app
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -49,7 +62,44 @@ async def async_session():
 async def client():
     app = create_app()
     app.dependency_overrides[get_db_session] = override_get_async_session
+    app.dependency_overrides[get_read_db_session] = override_get_async_session
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as ac:
         yield ac
+
+
+@pytest_asyncio.fixture
+async def api_client(client):
+    """`client` sending a Bearer access token, for the authenticated /api/v1 data routers."""
+    client.headers["Authorization"] = f"Bearer {issue_access_token(1, 'owner', None)}"
+    yield client
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Assert a query budget for a block, including queries made by requests sent from it:
+        with assert_max_queries(3):
+            await client.get("/api/v1/risks")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert (
+            stats.count <= limit
+        ), f"Expected at most {limit} queries, got {stats.count}:\n" + "\n".join(stats.statements)
+
+    return _assert_max_queries
+
+
+@pytest.fixture
+def fast_hasher(monkeypatch):
+    """Cheap bcrypt (5 rounds) in a thread pool, used by the login route and authenticate_user."""
+    config = dict(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5)
+    hasher = PasswordHasher(config, executor="thread", workers=2, max_in_flight=4)
+    monkeypatch.setattr(passwords, "password_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
@@ -0,0 +1,159 @@
+# app/tests/test_compression.py
+# Test response compression: negotiation, skip rules, levels, streaming, thread offload.
+
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, is_compressible, level_for, negotiate
+
+PAYLOAD = {"items": [{"id": i, "description": f"entry {i}", "outcome": "ok"} for i in range(200)]}
+
+
+def test_negotiate_honours_q_values_and_server_order():
+    encodings = ["zstd", "br", "gzip"]
+    assert negotiate("gzip, deflate, br, zstd", encodings) == "zstd"
+    assert negotiate("gzip;q=1.0, br;q=0.5", encodings) == "gzip"
+    assert negotiate("br;q=0, *;q=0.1", encodings) == "zstd"
+    assert negotiate("identity", encodings) is None
+    assert negotiate("", encodings) is None
+    assert negotiate("gzip;q=0", ["gzip"]) is None
+
+
+def test_skip_rules_and_levels():
+    assert is_compressible("application/json")
+    assert is_compressible("text/html; charset=utf-8")
+    assert is_compressible("image/svg+xml")
+    for media_type in ("image/png", "application/zip", "font/woff2", "text/event-stream", ""):
+        assert not is_compressible(media_type)
+
+    levels = {"*": {"gzip": 6}, "text/*": {"gzip": 7}, "text/css": {"gzip": 9}}
+    assert level_for(levels, "text/css; charset=utf-8", "gzip") == 9
+    assert level_for(levels, "text/html", "gzip") == 7
+    assert level_for(levels, "application/json", "gzip") == 6
+
+
+def build_client(**options) -> AsyncClient:
+    app = FastAPI()
+
+    @app.get("/json")
+    async def large_json():
+        return JSONResponse(PAYLOAD)
+
+    @app.get("/small")
+    async def small_json():
+        return JSONResponse({"ok": True})
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+    @app.get("/encoded")
+    async def encoded():
+        body = gzip.compress(b"x" * 4096)
+        return Response(body, media_type="text/plain", headers={"content-encoding": "gzip"})
+
+    options.setdefault("encodings", ["gzip"])
+    transport = ASGITransport(app=CompressionMiddleware(app, **options))
+    return AsyncClient(transport=transport, base_url="http://testserver")
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped_and_small_bodies_are_not():
+    async with build_client() as client:
+        response = await client.get("/json", headers={"accept-encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(json.dumps(PAYLOAD)) / 4
+        assert response.json() == PAYLOAD  # httpx decodes gzip
+
+        response = await client.get("/small", headers={"accept-encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+        response = await client.get("/json", headers={"accept-encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.asyncio
+async def test_compressed_media_and_encoded_bodies_pass_through():
+    async with build_client() as client:
+        response = await client.get("/png", headers={"accept-encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+        response = await client.get("/encoded", headers={"accept-encoding": "gzip"})
+        assert response.content == b"x" * 4096  # encoded once, by the route
+
+
+@pytest.mark.asyncio
+async def test_streaming_chunks_are_flushed_individually():
+    chunks = []
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/x-ndjson"),
+                ],
+            }
+        )
+        for i in range(3):
+            await send(
+                {"type": "http.response.body", "body": b"row %d\n" % i * 100, "more_body": True}
+            )
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def send(message):
+        chunks.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await CompressionMiddleware(app, encodings=["gzip"])(scope, None, send)
+    headers = dict(chunks[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+
+    decoder = zlib.decompressobj(31)
+    for i, message in enumerate(chunks[1:4]):
+        assert decoder.decompress(message["body"]) == b"row %d\n" % i * 100  # no waiting for more
+    decoder.decompress(chunks[4]["body"])
+    assert decoder.eof
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_compress_in_thread_pool(monkeypatch):
+    offloaded = []
+    real = compression.run_in_threadpool
+
+    async def recording(fn, *args):
+        offloaded.append(len(args[0]))
+        return await real(fn, *args)
+
+    monkeypatch.setattr(compression, "run_in_threadpool", recording)
+    async with build_client(thread_threshold=10_000) as client:
+        await client.get("/small", headers={"accept-encoding": "gzip"})
+        assert offloaded == []
+        response = await client.get("/json", headers={"accept-encoding": "gzip"})
+    assert response.json() == PAYLOAD
+    assert offloaded and offloaded[0] >= 10_000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+async def test_optional_encodings(encoding, module):
+    pytest.importorskip(module)
+    async with build_client(encodings=[encoding, "gzip"]) as client:
+        response = await client.get("/json", headers={"accept-encoding": f"gzip, {encoding}"})
+    assert response.headers["content-encoding"] == encoding
+    assert response.json() == PAYLOAD  # httpx decodes br/zstd when the package is installed
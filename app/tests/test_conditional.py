@@ -0,0 +1,135 @@
+# app/tests/test_conditional.py
+# Test conditional GET: validators from aggregates, 304 before the list query, invalidation.
+
+import datetime
+from email.utils import format_datetime
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.conditional import etag_matches
+from app.models.core_models import ChecklistItem, Policy, Procedure, Service
+
+
+def test_etag_matching_is_weak_and_handles_lists():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"abcd"', 'W/"abc"')
+
+
+def test_timestamp_defaults_are_evaluated_per_row():
+    column = Policy.__table__.c.updated_at
+    assert column.default.is_callable and column.onupdate.is_callable
+    first = column.default.arg(None)
+    assert first.tzinfo is datetime.timezone.utc
+    assert first <= column.default.arg(None)
+
+
+@pytest.mark.asyncio
+async def test_policy_list_revalidates_with_one_query(
+    api_client, async_session, assert_max_queries
+):
+    service = Service(name="Conditional")
+    policies = [Policy(service=service, title=f"policy {i}") for i in range(3)]
+    async_session.add_all(policies)
+    await async_session.commit()
+    params = {"service_id": service.id}
+
+    response = await api_client.get("/api/v1/policies", params=params)
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()["items"]] == [
+        "policy 0",
+        "policy 1",
+        "policy 2",
+    ]
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert "last-modified" not in response.headers  # deletes don't move max(updated_at)
+
+    with assert_max_queries(1) as stats:
+        response = await api_client.get(
+            "/api/v1/policies", params=params, headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "count(*)" in stats.statements[0] and "max(policies.updated_at)" in stats.statements[0]
+
+    # an update moves max(updated_at)
+    policies[1].title = "renamed"
+    await async_session.commit()
+    response = await api_client.get(
+        "/api/v1/policies", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["items"][1]["title"] == "renamed"
+    updated_etag = response.headers["etag"]
+    assert updated_etag != etag
+
+    # a delete changes the count
+    await async_session.execute(delete(Policy).where(Policy.id == policies[0].id))
+    await async_session.commit()
+    response = await api_client.get(
+        "/api/v1/policies", params=params, headers={"If-None-Match": updated_etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_procedure_honours_if_modified_since(api_client, async_session):
+    procedure = Procedure(
+        policy=Policy(service=Service(name="IMS"), title="IMS policy"), title="Procedure"
+    )
+    async_session.add(procedure)
+    await async_session.commit()
+    url = f"/api/v1/procedures/{procedure.id}"
+
+    response = await api_client.get(url)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Procedure"
+    last_modified = response.headers["last-modified"]
+    assert last_modified.endswith(" GMT")
+
+    response = await api_client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    assert response.headers["last-modified"] == last_modified
+
+    an_hour_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=1)
+    response = await api_client.get(
+        url, headers={"If-Modified-Since": format_datetime(an_hour_ago, usegmt=True)}
+    )
+    assert response.status_code == 200
+
+    # If-None-Match takes precedence over If-Modified-Since
+    response = await api_client.get(
+        url, headers={"If-None-Match": 'W/"stale"', "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 200
+
+    response = await api_client.get("/api/v1/procedures/999999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_checklist_items_in_order_with_validators(api_client, async_session):
+    procedure = Procedure(
+        policy=Policy(service=Service(name="Checklist"), title="Checklist policy"), title="P"
+    )
+    async_session.add_all(
+        [
+            procedure,
+            ChecklistItem(procedure=procedure, description="second", sort_order=2),
+            ChecklistItem(procedure=procedure, description="first", sort_order=1),
+        ]
+    )
+    await async_session.commit()
+    url = f"/api/v1/procedures/{procedure.id}/checklist-items"
+
+    response = await api_client.get(url)
+    assert [item["description"] for item in response.json()["items"]] == ["first", "second"]
+    response = await api_client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
@@ -5,7 +5,7 @@ import pytest
 import datetime
 from datetime import date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload, joinedload
 from app.models.core_models import (
     Service,
@@ -59,8 +59,8 @@ async def test_service_policy_relationship(async_session: AsyncSession):
     async_session.add(policy)
     await async_session.commit()
 
-    # version one by adding lazy in model
-    await async_session.refresh(service)
+    # version one by refreshing the collection explicitly (relationships are lazy="raise")
+    await async_session.refresh(service, ["policies"])
     assert len(service.policies) == 1
     assert service.policies[0].title == "Policy A"
 
@@ -111,7 +111,7 @@ async def test_procedure_checklist_and_activities(async_session: AsyncSession):
     async_session.add_all([policy, procedure, checklist, activity])
     await async_session.commit()
 
-    await async_session.refresh(procedure)
+    await async_session.refresh(procedure, ["checklist_items", "activities"])
     assert procedure.checklist_items[0].description == "Step 1"
     assert procedure.activities[0].performed_by == "tester"
 
@@ -125,7 +125,7 @@ async def test_user_and_documents(async_session: AsyncSession):
     async_session.add(doc)
     await async_session.commit()
 
-    await async_session.refresh(user)
+    await async_session.refresh(user, ["documents"])
     assert user.documents[0].filename == "file.txt"
     assert doc.user.email == "user@exmples.com"
 
@@ -143,7 +143,7 @@ async def test_complience_schedule_and_aasignment(async_session: AsyncSession):
     async_session.add(schedule)
     await async_session.commit()
 
-    await async_session.refresh(user)
+    await async_session.refresh(user, ["assigned_schedules"])
     assert user.assigned_schedules[0].title == "Do Task"
     assert schedule.priority == PriorityEnum.HIGH  # type: ignore
 
@@ -160,7 +160,7 @@ async def test_acceptance(async_session: AsyncSession):
     async_session.add_all([policy, procedure, pa, pra])
     await async_session.commit()
 
-    await async_session.refresh(user)
+    await async_session.refresh(user, ["policy_acceptances", "procedure_acceptances"])
     assert user.policy_acceptances[0].accepted is True
     assert user.procedure_acceptances[0].accepted is False
 
@@ -177,7 +177,7 @@ async def test_user_invitation(async_session: AsyncSession):
     async_session.add(invite)
     await async_session.commit()
 
-    await async_session.refresh(inviter)
+    await async_session.refresh(inviter, ["invitations_sent"])
     assert inviter.invitations_sent[0].email == "invitee@example.com"
 
 
@@ -194,7 +194,7 @@ async def test_reminder(async_session: AsyncSession):
     async_session.add(reminder)
     await async_session.commit()
 
-    await async_session.refresh(user)
+    await async_session.refresh(user, ["reminders"])
     assert user.reminders[0].title == "Check Policy"
     assert user.email == "user4@example.com"
 
@@ -255,6 +255,36 @@ async def test_cascade_delete_user_removes_documents(async_session: AsyncSession
     assert result.scalar_one_or_none() is None
 
 
+@pytest.mark.asyncio
+async def test_cascade_delete_service_is_done_by_the_database(
+    async_session: AsyncSession, assert_max_queries
+):
+    service = await create_service(async_session, name="IT service cascade tree")
+    policy = Policy(service=service, title="Tree policy")
+    procedure = Procedure(policy=policy, title="Tree procedure")
+    logs = [ActivityLog(procedure=procedure, description=f"log {i}") for i in range(20)]
+    schedule = ComplianceSchedule(title="Tree review", due_date=date.today())
+    async_session.add_all([policy, procedure, *logs, schedule])
+    await async_session.flush()
+    schedule.related_policy_id = policy.id
+    await async_session.commit()
+    async_session.expunge_all()  # nothing loaded: the ORM cannot cascade by itself
+
+    service = await async_session.get(Service, service.id)
+    with assert_max_queries(1):  # a single DELETE, no child SELECTs
+        await async_session.delete(service)
+        await async_session.flush()
+    await async_session.commit()
+
+    remaining = await async_session.scalar(
+        select(func.count(ActivityLog.id)).where(ActivityLog.procedure_id == procedure.id)
+    )
+    assert remaining == 0
+    assert await async_session.get(Procedure, procedure.id) is None
+    schedule = await async_session.get(ComplianceSchedule, schedule.id)
+    assert schedule is not None and schedule.related_policy_id is None  # ON DELETE SET NULL
+
+
 @pytest.mark.asyncio
 async def test_enum_presistence_policy_status_and_priority(async_session: AsyncSession):
     service = await create_service(async_session, name="IT service 5")
@@ -304,7 +334,7 @@ async def test_bidirectional_policy_risk_navigation(async_session: AsyncSession)
     await async_session.commit()
 
     # Forward: Policy to Risk
-    await async_session.refresh(policy)
+    await async_session.refresh(policy, ["risks"])
     assert policy.risks[0].event == "Cyber Attack"
 
     # Backward Risk to policy
@@ -322,7 +352,7 @@ async def test_bidirectional_user_document_navigation(async_session: AsyncSessio
     await async_session.commit()
 
     # Forward: User to document
-    await async_session.refresh(user)
+    await async_session.refresh(user, ["documents"])
     assert user.documents[0].filename == "doc.pdf"
 
     # Backward Document to user
@@ -0,0 +1,59 @@
+# app/tests/test_db_routing.py
+# Test replica routing and read-your-writes stickiness.
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core import db
+from app.core.db_routing import ReadYourWrites, ReplicaPool
+from app.models.core_models import Service
+from app.tests.conftest import engine_test
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    monkeypatch.setattr(db, "replica_pool", ReplicaPool([replica_engine]))
+    yield replica_engine
+
+
+def test_round_robin_cycles_replicas():
+    engines = [create_async_engine("sqlite+aiosqlite:///:memory:") for _ in range(2)]
+    pool = ReplicaPool(engines)
+    assert [pool.choose() for _ in range(4)] == engines * 2
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        ReplicaPool([create_async_engine("sqlite+aiosqlite:///:memory:")], strategy="random")
+
+
+def test_read_your_writes_window(monkeypatch):
+    tracker = ReadYourWrites(window=5)
+    tracker.mark("user:1")
+    assert tracker.is_recent("user:1")
+    assert not tracker.is_recent("user:2")
+
+    expired = ReadYourWrites(window=0)
+    expired.mark("user:1")
+    assert not expired.is_recent("user:1")
+
+
+def test_selects_go_to_replica_and_writes_to_primary(replica):
+    session = AsyncSession(bind=engine_test, sync_session_class=db.RoutingSession)
+    sync = session.sync_session
+    assert sync.get_bind(clause=select(Service)) is replica.sync_engine
+    assert sync.get_bind(clause=select(Service).with_for_update()) is engine_test.sync_engine
+    assert sync.get_bind(clause=insert(Service)) is engine_test.sync_engine
+
+
+def test_pinned_session_reads_from_primary(replica):
+    session = AsyncSession(bind=engine_test, sync_session_class=db.RoutingSession)
+    session.info["use_primary"] = True
+    assert session.sync_session.get_bind(clause=select(Service)) is engine_test.sync_engine
+
+
+def test_no_replicas_uses_primary():
+    session = AsyncSession(bind=engine_test, sync_session_class=db.RoutingSession)
+    assert session.sync_session.get_bind(clause=select(Service)) is engine_test.sync_engine
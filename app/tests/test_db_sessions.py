@@ -0,0 +1,126 @@
+# app/tests/test_db_sessions.py
+# Test the lazy, read-aware session dependencies in app/core/db.py.
+
+import pytest
+from sqlalchemy import event, insert, select, text, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import db
+from app.models.core_models import Service
+from app.tests.conftest import engine_test
+
+
+@pytest.fixture
+def tracked_session_maker(monkeypatch):
+    maker = sessionmaker(
+        engine_test,  # type: ignore
+        class_=AsyncSession,
+        sync_session_class=db.TrackedSession,
+        expire_on_commit=False,
+    )  # type: ignore
+    monkeypatch.setattr(db, "async_session_maker", maker)
+    return maker
+
+
+def make_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+async def drive(dependency, request, body):
+    """Run a yield dependency the way FastAPI does: body inside, then close the generator."""
+    gen = dependency(request)
+    session = await gen.__anext__()
+    await body(session)
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_untouched_session_reports_no_db_use(tracked_session_maker):
+    request = make_request()
+
+    async def body(session):
+        pass
+
+    await drive(db.get_db_session, request, body)
+    assert db.db_was_touched(request) is False
+
+
+@pytest.mark.asyncio
+async def test_read_session_reports_use_and_skips_commit(tracked_session_maker):
+    request = make_request()
+    commits = []
+
+    async def body(session):
+        event.listen(session.sync_session, "after_commit", commits.append)
+        await session.execute(select(Service.id).limit(1))
+
+    await drive(db.get_read_db_session, request, body)
+    assert db.db_was_touched(request) is True
+    assert commits == []
+
+
+@pytest.mark.asyncio
+async def test_write_session_commits(tracked_session_maker):
+    request = make_request()
+
+    async def body(session):
+        session.add(Service(name="Committed service"))
+
+    await drive(db.get_db_session, request, body)
+
+    async with tracked_session_maker() as check:  # type: ignore
+        found = await check.scalar(select(Service).where(Service.name == "Committed service"))
+    assert found is not None
+
+
+@pytest.mark.asyncio
+async def test_read_session_refuses_writes(tracked_session_maker):
+    request = make_request()
+    gen = db.get_read_db_session(request)
+    session = await gen.__anext__()
+    session.add(Service(name="Should not be written"))
+    with pytest.raises(InvalidRequestError):
+        await session.flush()
+    with pytest.raises(InvalidRequestError):
+        await gen.athrow(InvalidRequestError("propagated"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "statement",
+    [
+        insert(Service).values(name="Core insert on a read session"),
+        update(Service).values(name="Core update on a read session"),
+        text("DELETE FROM services"),
+    ],
+)
+async def test_read_session_refuses_core_dml(tracked_session_maker, statement):
+    request = make_request()
+    gen = db.get_read_db_session(request)
+    session = await gen.__anext__()
+    with pytest.raises(InvalidRequestError):
+        await session.execute(statement)
+    with pytest.raises(InvalidRequestError):
+        await gen.athrow(InvalidRequestError("propagated"))
+
+
+@pytest.mark.asyncio
+async def test_write_session_commits_core_dml(tracked_session_maker):
+    # Core insert/update never flush the session; they must still be committed.
+    request = make_request()
+
+    async def body(session):
+        await session.execute(insert(Service).values(name="Core inserted"))
+        await session.execute(
+            update(Service).where(Service.name == "Core inserted").values(name="Core updated")
+        )
+
+    await drive(db.get_db_session, request, body)
+
+    async with tracked_session_maker() as check:  # type: ignore
+        names = set(await check.scalars(select(Service.name).where(Service.name.like("Core %"))))
+    assert names == {"Core updated"}
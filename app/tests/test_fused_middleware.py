@@ -0,0 +1,122 @@
+# app/tests/test_fused_middleware.py
+# Test that FusedMiddleware answers exactly like the stacked middlewares it replaces.
+
+import json
+import re
+from base64 import b64decode, b64encode
+
+import itsdangerous
+import pytest
+from httpx import ASGITransport, AsyncClient
+from itsdangerous.url_safe import URLSafeSerializer
+
+from app.core.config import settings
+from app.main import create_app
+
+VOLATILE_HEADERS = {"x-process-time", "x-db-time", "x-request-id"}
+
+
+def session_cookie(data: dict, secret: str | None = None) -> str:
+    signer = itsdangerous.TimestampSigner(secret or settings.SECRET_KEY)
+    value = signer.sign(b64encode(json.dumps(data).encode())).decode()
+    return f"fourize_sessionid={value}"
+
+
+def csrf_token(value: str = "token") -> str:
+    return URLSafeSerializer(settings.CSRF_SECRET, "csrftoken").dumps(value)
+
+
+def normalized(response) -> tuple:
+    headers = []
+    for name, value in response.headers.multi_items():
+        if name in VOLATILE_HEADERS:
+            continue
+        if name == "set-cookie":  # token values are random, session values carry a timestamp
+            value = re.sub(r"^([^=]+)=[^;]*", r"\1=<value>", value)
+        headers.append((name, value))
+    return response.status_code, sorted(headers), response.content
+
+
+async def responses(monkeypatch, fused: bool, env: str, cases) -> list[tuple]:
+    monkeypatch.setattr(settings, "FUSED_MIDDLEWARE", fused)
+    monkeypatch.setattr(settings, "ENV", env)
+    monkeypatch.setattr(settings, "ALLOWED_HOSTS", ["testserver", "www.example.com"])
+    monkeypatch.setattr(settings, "ALLOWED_ORIGIN", ["https://good.example"])
+    results = []
+    transport = ASGITransport(app=create_app())
+    async with AsyncClient(transport=transport) as client:
+        for method, url, headers in cases:
+            results.append(normalized(await client.request(method, url, headers=headers)))
+    return results
+
+
+PREFLIGHT = {"origin": "https://good.example", "access-control-request-method": "GET"}
+SESSION = session_cookie({"user_id": 1, "session_version": 0})
+TOKEN = csrf_token()
+
+DEV_CASES = [
+    ("GET", "http://testserver/api/v1/admin/pool-stats", {}),
+    ("GET", "http://testserver/api/v1/admin/pool-stats", {"origin": "https://a.example"}),
+    (
+        "GET",
+        "http://testserver/api/v1/admin/pool-stats",
+        {"origin": "https://a.example", "cookie": f"{SESSION}; csrftoken={TOKEN}"},
+    ),
+    ("OPTIONS", "http://testserver/api/v1/risks", PREFLIGHT),
+    ("OPTIONS", "http://testserver/api/v1/risks", {**PREFLIGHT, "cookie": SESSION}),
+    ("POST", "http://testserver/", {}),
+    ("POST", "http://testserver/", {"cookie": f"csrftoken={TOKEN}", "x-csrftoken": TOKEN}),
+    (
+        "POST",
+        "http://testserver/",
+        {"cookie": f"csrftoken={TOKEN}", "x-csrftoken": csrf_token("x")},
+    ),
+    ("POST", "http://testserver/api/v1/user/logout", {"cookie": SESSION}),
+    ("POST", "http://testserver/api/v1/user/logout", {}),
+    ("GET", "http://testserver/api/v1/admin/pool-stats", {"cookie": session_cookie({}, "wrong")}),
+]
+
+PROD_CASES = [
+    ("GET", "https://testserver/api/v1/admin/pool-stats", {}),
+    ("GET", "https://evil.example/api/v1/admin/pool-stats", {}),
+    ("GET", "https://example.com/api/v1/admin/pool-stats", {}),
+    ("GET", "http://testserver/api/v1/admin/pool-stats?x=1", {}),
+    ("GET", "https://testserver/api/v1/admin/pool-stats", {"origin": "https://good.example"}),
+    ("GET", "https://testserver/api/v1/admin/pool-stats", {"origin": "https://bad.example"}),
+    ("OPTIONS", "https://testserver/api/v1/risks", PREFLIGHT),
+    ("OPTIONS", "https://testserver/api/v1/risks", {**PREFLIGHT, "origin": "https://bad.example"}),
+    (
+        "OPTIONS",
+        "https://testserver/api/v1/risks",
+        {**PREFLIGHT, "access-control-request-method": "PATCH"},
+    ),
+    (
+        "OPTIONS",
+        "https://testserver/api/v1/risks",
+        {**PREFLIGHT, "access-control-request-headers": "x-custom"},
+    ),
+    ("POST", "https://testserver/", {"cookie": SESSION}),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("env, cases", [("dev", DEV_CASES), ("prod", PROD_CASES)])
+async def test_fused_matches_stacked_middlewares(monkeypatch, env, cases):
+    stacked = await responses(monkeypatch, False, env, cases)
+    fused = await responses(monkeypatch, True, env, cases)
+    for case, expected, actual in zip(cases, stacked, fused):
+        assert actual == expected, case
+
+
+@pytest.mark.asyncio
+async def test_fused_session_round_trip(monkeypatch):
+    monkeypatch.setattr(settings, "FUSED_MIDDLEWARE", True)
+    transport = ASGITransport(app=create_app())
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/api/v1/admin/pool-stats", headers={"cookie": SESSION})
+    value = response.cookies["fourize_sessionid"]
+    signer = itsdangerous.TimestampSigner(settings.SECRET_KEY)
+    assert json.loads(b64decode(signer.unsign(value))) == {
+        "user_id": 1,
+        "session_version": 0,
+    }
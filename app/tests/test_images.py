@@ -0,0 +1,113 @@
+# app/tests/test_images.py
+# Test responsive image variants: widths, formats, fallback, manifest, <picture> markup, uploads.
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+Image = pytest.importorskip("PIL.Image")
+
+from app.core import images  # noqa: E402
+from app.core.assets import MANIFEST_NAME, StaticManifest, collect_static  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.images import picture_html, render_variants  # noqa: E402
+
+
+@pytest.fixture
+def image_settings(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_WIDTHS", [80, 160, 320])
+    monkeypatch.setattr(settings, "IMAGE_FORMATS", ["webp"])
+
+
+def save_image(path, mode="RGBA", size=(200, 100), fmt="PNG"):
+    color = (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)
+    Image.new(mode, size, color).save(path, fmt)
+    return path
+
+
+def test_variant_widths_never_upscale():
+    assert images.variant_widths(1024, [80, 160, 320, 640, 1280]) == [80, 160, 320, 640, 1024]
+    assert images.variant_widths(640, [80, 160, 640]) == [80, 160, 640]
+    assert images.variant_widths(50, [80, 160]) == [50]
+
+
+def test_render_variants_writes_widths_formats_and_fallback(tmp_path):
+    transparent = save_image(tmp_path / "logo.png")
+    meta = render_variants(
+        str(transparent), str(tmp_path / "out"), "img/logo.png", [80, 320], ["webp"], {}
+    )
+    assert (meta["width"], meta["height"], meta["fallback"]) == (200, 100, "png")
+    assert list(meta["variants"]) == ["webp", "png"]
+    assert [v["width"] for v in meta["variants"]["webp"]] == [80, 200]
+    small = meta["variants"]["webp"][0]
+    assert small["path"].startswith("img/logo-80w.") and small["path"].endswith(".webp")
+    with Image.open(tmp_path / "out" / small["path"]) as variant:
+        assert variant.size == (80, 40)
+
+    opaque = save_image(tmp_path / "photo.jpg", mode="RGB", fmt="JPEG")
+    meta = render_variants(str(opaque), str(tmp_path / "out"), "photo.jpg", [80], [], {"jpeg": 70})
+    assert meta["fallback"] == "jpeg"
+    assert meta["variants"]["jpeg"][0]["path"].endswith(".jpg")
+
+
+def test_picture_html_lists_sources_then_fallback():
+    meta = {
+        "width": 200,
+        "height": 100,
+        "fallback": "png",
+        "variants": {
+            "webp": [{"path": "a-80w.webp", "width": 80}, {"path": "a-200w.webp", "width": 200}],
+            "png": [{"path": "a-80w.png", "width": 80}, {"path": "a-200w.png", "width": 200}],
+        },
+    }
+    html = picture_html(
+        meta, lambda path: f"/static/{path}", 'Logo "A"', "40px", **{"class": "logo"}
+    )
+    assert html.startswith('<picture><source type="image/webp"')
+    assert 'srcset="/static/a-80w.webp 80w, /static/a-200w.webp 200w" sizes="40px">' in html
+    assert 'src="/static/a-200w.png"' in html
+    assert 'width="200" height="100" alt="Logo &#34;A&#34;"' in html
+    assert html.endswith('class="logo"></picture>')
+
+
+@pytest.mark.asyncio
+async def test_landing_page_serves_responsive_logo(tmp_path, monkeypatch, image_settings):
+    from app.main import create_app
+
+    source, target = tmp_path / "static", tmp_path / "staticfiles"
+    source.mkdir()
+    save_image(source / "logo.png")
+    (source / "modern.css").write_text("body { margin: 0; }")
+    collect_static(source, target, workers=1)
+    manifest = StaticManifest.load(target / MANIFEST_NAME)
+    assert [v["width"] for v in manifest.images["logo.png"]["variants"]["png"]] == [80, 160, 200]
+    webp = manifest.images["logo.png"]["variants"]["webp"][0]["path"]
+    assert webp in manifest.hashed  # variants are served immutable too
+
+    monkeypatch.setattr(settings, "STATIC_ROOT", target)
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        page = await client.get("/")
+        assert page.text.count("<picture>") == 1
+        assert f"http://test/static/{webp} 80w" in page.text
+        assert 'sizes="40px"' in page.text
+        response = await client.get(f"/static/{webp}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert "immutable" in response.headers["cache-control"]
+
+
+@pytest.mark.asyncio
+async def test_optimize_upload_runs_in_worker_process(tmp_path, image_settings):
+    try:
+        meta = await images.optimize_upload(
+            save_image(tmp_path / "upload.png"), "7/upload.png", tmp_path / "media"
+        )
+        assert meta is not None and meta["fallback"] == "png"
+        assert (tmp_path / "media" / meta["variants"]["webp"][0]["path"]).exists()
+        assert images._upload_executor is not None  # created on first use
+
+        (tmp_path / "notes.png").write_bytes(b"not an image")
+        assert await images.optimize_upload(tmp_path / "notes.png", "notes.png") is None
+        assert await images.optimize_upload(tmp_path / "notes.txt", "notes.txt") is None
+    finally:
+        images.shutdown_upload_executor()
@@ -0,0 +1,144 @@
+# app/tests/test_index_advisor.py
+# Test pattern extraction, index coverage checks, EXPLAIN estimates and the generated revision.
+
+import json
+import multiprocessing
+from collections import Counter
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import index_advisor
+from app.core.db import Base
+from app.core.index_advisor import IndexCandidate, advise, extract_candidates, is_covered
+from app.models import core_models  # noqa: F401  (registers the tables on Base.metadata)
+
+ACTIVITY_PAGE = (
+    "SELECT activity_logs.id, activity_logs.description FROM activity_logs "
+    "WHERE activity_logs.procedure_id = ? AND activity_logs.timestamp < ? "
+    "ORDER BY activity_logs.timestamp DESC LIMIT ? OFFSET ?"
+)
+RISKS_BY_STATUS = (
+    "SELECT risks.id, risks.event FROM risks WHERE risks.status = ? "
+    "AND risks.resolve_by < ? ORDER BY risks.resolve_by LIMIT ?"
+)
+POLICIES_BY_STATUS = (
+    "SELECT policies.id FROM policies JOIN services AS services_1 ON services_1.id = policies.service_id "
+    "WHERE policies.service_id = ? AND policies.status = ? ORDER BY policies.title"
+)
+
+
+def test_extract_equality_then_range_and_order_by():
+    assert extract_candidates(ACTIVITY_PAGE) == [
+        IndexCandidate("activity_logs", ("procedure_id",), ("timestamp",))
+    ]
+    assert extract_candidates(POLICIES_BY_STATUS) == [
+        IndexCandidate("policies", ("service_id", "status"), ("title",))
+    ]
+
+
+def test_extract_resolves_aliases_and_skips_join_conditions():
+    statement = (
+        "SELECT policies_1.id FROM policies AS policies_1 "
+        "WHERE policies_1.service_id = services.id AND policies_1.status IN (?) "
+        "ORDER BY policies_1.created_at"
+    )
+    assert extract_candidates(statement) == [
+        IndexCandidate("policies", ("status",), ("created_at",))
+    ]
+
+
+def test_single_column_patterns_are_not_candidates():
+    assert extract_candidates("SELECT risks.id FROM risks WHERE risks.procedure_id = ?") == []
+
+
+def test_is_covered_by_prefix():
+    candidate = IndexCandidate("policies", ("service_id", "status"), ("title",))
+    assert is_covered(candidate, [("status", "service_id", "title", "id")])
+    assert not is_covered(candidate, [("service_id", "title", "status")])
+    assert not is_covered(candidate, [("service_id",)])
+
+
+def test_advise_ranks_and_drops_unique_and_covered_patterns():
+    shapes = Counter(
+        {
+            RISKS_BY_STATUS: 7,
+            POLICIES_BY_STATUS: 3,
+            "SELECT users.id FROM users WHERE users.email = ? AND users.is_active = ?": 50,
+            ACTIVITY_PAGE: 20,  # served by ix_activity_logs_procedure_id_timestamp_id
+        }
+    )
+    advice = advise(shapes, Base.metadata, min_count=2)
+    assert [(a.candidate.name, a.count) for a in advice] == [
+        ("ix_risks_status_resolve_by", 7),
+        ("ix_policies_service_id_status_title", 3),
+    ]
+    assert advise(shapes, Base.metadata, min_count=5)[0].count == 7
+    assert len(advise(shapes, Base.metadata, min_count=5)) == 1
+
+
+def test_load_patterns_from_slow_query_log(tmp_path):
+    log = tmp_path / "slow_queries.log"
+    lines = [{"statement": ACTIVITY_PAGE.replace("?", "5", 1)}, {"statement": ACTIVITY_PAGE}]
+    log.write_text("\n".join(json.dumps(line) for line in lines) + "\nnot json\n")
+    shapes = index_advisor.load_patterns(log)
+    assert sum(shapes.values()) == 2 and len(shapes) == 1
+
+
+def test_recorder_saves_and_merges(tmp_path):
+    path = tmp_path / "query_patterns.json"
+    for _ in range(2):
+        index_advisor.recorder.record(ACTIVITY_PAGE)
+        index_advisor.recorder.record("INSERT INTO risks (title) VALUES (?)")
+        index_advisor.save_query_patterns(path)
+    assert index_advisor.load_patterns(path) == Counter({ACTIVITY_PAGE: 2})
+
+
+def _record_and_save(path):
+    for _ in range(50):
+        index_advisor.recorder.record(ACTIVITY_PAGE)
+    index_advisor.save_query_patterns(path)
+
+
+@pytest.mark.skipif(index_advisor.fcntl is None, reason="needs fcntl.flock")
+def test_workers_saving_at_once_lose_nothing(tmp_path):
+    path = tmp_path / "query_patterns.json"
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_record_and_save, args=(path,)) for _ in range(6)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+    assert [worker.exitcode for worker in workers] == [0] * 6
+    assert index_advisor.load_patterns(path) == Counter({ACTIVITY_PAGE: 300})
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_estimate_benefit_with_explain(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'advisor.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    [item] = advise(Counter({POLICIES_BY_STATUS: 1}), Base.metadata)
+
+    await index_advisor.estimate_benefit(engine, item)
+    async with engine.connect() as conn:
+        indexes = (await conn.exec_driver_sql("PRAGMA index_list(policies)")).fetchall()
+    await engine.dispose()
+
+    assert item.error is None
+    assert any("USE TEMP B-TREE" in step for step in item.plan_before)
+    assert any(item.candidate.name in step for step in item.plan_after)
+    assert item.benefit is not None and item.benefit > 0
+    assert item.candidate.name not in {row[1] for row in indexes}  # dropped again
+
+
+def test_render_revision_is_valid_migration():
+    [item] = advise(Counter({RISKS_BY_STATUS: 4}), Base.metadata)
+    source = index_advisor.render_revision([item], "abc123", "17b34ce81d9a", "advised indexes")
+    namespace: dict = {}
+    exec(compile(source, "revision.py", "exec"), namespace)
+    assert namespace["revision"] == "abc123"
+    assert namespace["down_revision"] == "17b34ce81d9a"
+    assert "batch_op.create_index(batch_op.f('ix_risks_status_resolve_by')" in source
+    assert "Index('ix_risks_status_resolve_by', 'status', 'resolve_by')" in source
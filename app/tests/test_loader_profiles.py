@@ -0,0 +1,55 @@
+# app/tests/test_loader_profiles.py
+# Test named loader profiles and the raise-by-default relationships.
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.core_models import ChecklistItem, Policy, Procedure, Risk, Service, User
+from app.models.loader_profiles import loader_options, with_profile
+
+
+async def create_policy_tree(async_session, title):
+    service = Service(name=f"{title} service")
+    policy = Policy(service=service, title=title)
+    procedure = Procedure(policy=policy, title=f"{title} procedure")
+    checklist = ChecklistItem(procedure=procedure, description="step")
+    risk = Risk(related_policy=policy, event="Outage")
+    async_session.add_all([service, policy, procedure, checklist, risk])
+    await async_session.commit()
+    return policy.id
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError):
+        loader_options("does_not_exist")
+
+
+@pytest.mark.asyncio
+async def test_policy_tree_profile_loads_tree(async_session: AsyncSession):
+    policy_id = await create_policy_tree(async_session, "Tree Policy")
+    async_session.expunge_all()
+
+    policy = await async_session.scalar(
+        with_profile(select(Policy).where(Policy.id == policy_id), "policy_tree")
+    )
+    assert policy.service.name == "Tree Policy service"  # type: ignore
+    assert policy.procedures[0].checklist_items[0].description == "step"  # type: ignore
+    assert policy.risks[0].event == "Outage"  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_summary_profile_does_not_load_collections(async_session: AsyncSession):
+    user = User(email="summary@example.com", hashed_password="x", first_name="S", last_name="U")
+    async_session.add(user)
+    await async_session.commit()
+    async_session.expunge_all()
+
+    loaded = await async_session.scalar(
+        with_profile(select(User).where(User.id == user.id), "user_summary")
+    )
+    assert loaded is not None
+    assert loaded.email == "summary@example.com"
+    with pytest.raises(InvalidRequestError):
+        _ = loaded.documents
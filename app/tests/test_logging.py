@@ -0,0 +1,119 @@
+# app/tests/test_logging.py
+# Test queued logging (drop policy), the JSON formatter, request ids and access-log sampling.
+
+import json
+import logging
+import sys
+
+import pytest
+
+from app.core.config import settings
+from app.core.logging_config import (
+    BoundedQueueHandler,
+    JSONFormatter,
+    RequestIdFilter,
+    new_request_id,
+    request_id_var,
+)
+
+
+def drain(handler: BoundedQueueHandler) -> list[str]:
+    messages = []
+    while not handler.queue.empty():
+        messages.append(handler.queue.get_nowait().getMessage())
+    return messages
+
+
+def test_full_queue_drops_info_and_evicts_for_warnings():
+    handler = BoundedQueueHandler(maxsize=2)
+    logger = logging.getLogger("forizec.tests.queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(3):
+            logger.info("info %d", i)
+        assert handler.dropped == 1
+        logger.warning("disk full")  # evicts "info 0"
+        assert handler.dropped == 2
+        assert drain(handler) == ["info 1", "disk full"]
+
+        logger.info("later")
+        assert drain(handler) == ["Log queue full: dropped 2 records", "later"]
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_json_formatter_includes_request_id_extra_and_exception():
+    logger = logging.getLogger("forizec.tests.json")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logger.makeRecord(
+            logger.name,
+            logging.ERROR,
+            "views.py",
+            12,
+            "failed %s",
+            ("GET",),
+            sys.exc_info(),
+            extra={"status": 500},
+        )
+    token = request_id_var.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "failed GET"
+    assert entry["level"] == "ERROR" and entry["logger"] == "forizec.tests.json"
+    assert entry["request_id"] == "req-1" and entry["status"] == 500
+    assert entry["time"].endswith("Z")
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_new_request_id_accepts_only_plain_client_ids():
+    assert new_request_id("abc-123_x.y") == "abc-123_x.y"
+    assert new_request_id("bad id\n") != "bad id\n"
+    assert len(new_request_id("x" * 65)) == 32
+    assert new_request_id(None) != new_request_id(None)
+
+
+class Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(RequestIdFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_log():
+    capture = Capture()
+    logger = logging.getLogger("forizec")
+    logger.addHandler(capture)
+    yield capture.records
+    logger.removeHandler(capture)
+
+
+@pytest.mark.asyncio
+async def test_request_id_header_and_log_records(client, access_log):
+    response = await client.get("/api/v1/admin/pool-stats", headers={"X-Request-ID": "trace-42"})
+    assert response.headers["x-request-id"] == "trace-42"
+    access = [r for r in access_log if getattr(r, "path", None) == "/api/v1/admin/pool-stats"]
+    assert access[0].request_id == "trace-42"
+    assert access[0].status == 200 and access[0].sample_rate == 1.0
+
+    response = await client.get("/api/v1/admin/pool-stats")
+    assert len(response.headers["x-request-id"]) == 32
+    assert request_id_var.get() is None  # reset after the request
+
+
+@pytest.mark.asyncio
+async def test_access_log_samples_only_successes(client, access_log, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_ACCESS_SAMPLE_RATE", 0.0)
+    await client.get("/api/v1/admin/pool-stats")
+    await client.get("/api/v1/missing")
+    statuses = [r.status for r in access_log if hasattr(r, "sample_rate")]
+    assert statuses == [404]
@@ -0,0 +1,163 @@
+# app/tests/test_metrics.py
+# Test the metrics registry, its Prometheus text export, multi-worker merging and the endpoint.
+
+import json
+import os
+import re
+import subprocess
+
+import pytest
+
+from app.core import metrics, middleware
+from app.core.config import settings
+from app.core.metrics import REQUEST_DURATION, MetricsRegistry, merge, render
+
+
+def sample(text: str, line_prefix: str) -> float:
+    match = re.search(rf"^{re.escape(line_prefix)} (\S+)$", text, re.MULTILINE)
+    assert match, f"{line_prefix} not in:\n{text}"
+    return float(match.group(1))
+
+
+def test_export_prometheus_text():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    errors = registry.counter("errors_total", "Errors.", ("kind",))
+    latency.observe("/a", value=0.05)
+    latency.observe("/a", value=0.5)
+    latency.observe("/a", value=3)
+    errors.inc('say "hi"\n')
+
+    text = registry.export()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2\n' in text  # cumulative
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3\n' in text
+    assert sample(text, 'latency_seconds_count{route="/a"}') == 3
+    assert sample(text, 'latency_seconds_sum{route="/a"}') == pytest.approx(3.55)
+    assert 'errors_total{kind="say \\"hi\\"\\n"} 1\n' in text
+
+
+def test_merge_sums_workers_and_drops_gauges_of_exited_ones():
+    exited = subprocess.Popen(["true"])
+    exited.wait()
+
+    def snapshot(pid, requests, in_progress):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.").inc(amount=requests)
+        registry.gauge("in_progress", "In flight.").inc(amount=in_progress)
+        registry.histogram("latency_seconds", "Latency.", buckets=(1.0,)).observe(value=0.5)
+        return {**registry.snapshot(), "pid": pid}
+
+    merged = merge([snapshot(os.getpid(), 2, 1), snapshot(exited.pid, 3, 5)])
+    assert merged["requests_total"]["samples"] == [[[], 5.0]]
+    assert merged["in_progress"]["samples"] == [[[], 1.0]]
+    assert merged["latency_seconds"]["samples"] == [[[], {"counts": [2, 0], "sum": 1.0}]]
+
+
+def test_export_merges_snapshots_in_directory(tmp_path):
+    other = MetricsRegistry()
+    other.counter("requests_total", "Requests.", ("route",)).inc("/a", amount=4)
+    other.flush(tmp_path, final=True)
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.", ("route",)).inc("/a")
+
+    text = registry.export(tmp_path)
+    assert sample(text, 'requests_total{route="/a"}') == 5
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert json.loads((tmp_path / f"{registry.key}.json").read_text())["pid"] == os.getpid()
+
+
+@pytest.mark.skipif(metrics.fcntl is None, reason="folding needs fcntl.flock")
+def test_export_folds_exited_workers_into_the_archive(tmp_path):
+    exited = subprocess.Popen(["true"])
+    exited.wait()
+
+    def exited_worker(requests):
+        gone = MetricsRegistry()
+        gone.counter("requests_total", "Requests.").inc(amount=requests)
+        gone.gauge("in_progress", "In flight.").inc()
+        gone.flush(tmp_path)
+        snapshot = tmp_path / f"{gone.key}.json"
+        data = json.loads(snapshot.read_text())
+        snapshot.write_text(json.dumps({**data, "pid": exited.pid}))
+
+    live = MetricsRegistry()
+    live.counter("requests_total", "Requests.").inc()
+    live.gauge("in_progress", "In flight.").inc()
+    exited_worker(2)
+    assert sample(live.export(tmp_path), "requests_total") == 3
+    exited_worker(3)
+    text = live.export(tmp_path)
+    assert sample(text, "requests_total") == 6  # totals survive folding
+    assert sample(text, "in_progress") == 1  # gauges of exited workers are dropped
+
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == sorted(
+        ["archive.json", f"{live.key}.json"]
+    )
+    archived = json.loads((tmp_path / "archive.json").read_text())["families"]
+    assert archived["requests_total"]["samples"] == [[[], 5.0]]
+    assert archived["in_progress"]["samples"] == []
+
+
+def test_render_non_finite_values():
+    families = {
+        "temperature": {
+            "type": "gauge",
+            "help": "Odd values.",
+            "labels": ["kind"],
+            "samples": [
+                [["hot"], float("inf")],
+                [["cold"], float("-inf")],
+                [["odd"], float("nan")],
+            ],
+        }
+    }
+    text = render(families)
+    assert 'temperature{kind="hot"} +Inf\n' in text
+    assert 'temperature{kind="cold"} -Inf\n' in text
+    assert 'temperature{kind="odd"} NaN\n' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests_templates_and_exceptions(client):
+    await client.get("/api/v1/admin/pool-stats")
+    await client.get("/api/v1/missing")
+    await client.get("/")
+
+    response = await client.get("/api/v1/admin/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    pool_stats = 'method="GET",route="/api/v1/admin/pool-stats",status="200"'
+    assert sample(text, f"http_request_duration_seconds_count{{{pool_stats}}}") >= 1
+    unmatched = 'method="GET",route="<unmatched>",status="404"'
+    assert sample(text, f"http_request_duration_seconds_count{{{unmatched}}}") >= 1
+    exception = 'handler="starlette_http_exception_handler",exception="HTTPException"'
+    assert sample(text, f"http_exceptions_total{{{exception}}}") >= 1
+    assert sample(text, 'template_render_seconds_count{template="public/index.html"}') >= 1
+    # the scrape itself is in flight while it is rendered
+    assert sample(text, 'http_requests_in_progress{method="GET"}') == 1
+    assert "# TYPE db_pool_events_total counter" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_only_for_allowlisted_clients(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ALLOWLIST", ["10.0.0.0/8"])
+    response = await client.get("/api/v1/admin/metrics")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_disabled_metrics_record_nothing(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    calls = []
+    gauge = middleware.REQUESTS_IN_PROGRESS
+    monkeypatch.setattr(gauge, "inc", lambda *labels, **kw: calls.append(("inc", labels)))
+    monkeypatch.setattr(gauge, "dec", lambda *labels, **kw: calls.append(("dec", labels)))
+    before = REQUEST_DURATION.samples()
+
+    await client.get("/api/v1/admin/pool-stats")
+    assert calls == []
+    assert REQUEST_DURATION.samples() == before
+    assert (await client.get("/api/v1/admin/metrics")).status_code == 404
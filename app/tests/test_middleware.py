@@ -0,0 +1,90 @@
+# app/tests/test_middleware.py
+# Test the raw ASGI request logging middleware: headers, true streaming, and the full stack.
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.core.middleware import RequestLoggingMiddleware
+from app.main import create_app
+
+
+def http_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+def make_receive():
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()  # the client never disconnects
+        return {}
+
+    return receive
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_pass_through_unbuffered():
+    release = asyncio.Event()
+
+    async def chunks():
+        yield b"first"
+        await release.wait()  # only released once the client has the first chunk
+        yield b"second"
+
+    app = FastAPI()
+
+    @app.get("/export")
+    async def export():
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+        if message.get("body") == b"first":
+            release.set()
+
+    await asyncio.wait_for(
+        RequestLoggingMiddleware(app)(http_scope("/export"), make_receive(), send), 5
+    )
+    start = sent[0]
+    assert start["status"] == 200
+    names = {name for name, _ in start["headers"]}
+    assert {b"x-process-time", b"x-db-query-count", b"x-db-time"} <= names
+    assert [m["body"] for m in sent[1:] if m["body"]] == [b"first", b"second"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_stack_serves_requests():
+    """The full app stack answers; its overhead is measured in benchmarks/bench_middleware.py."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    stack = create_app().build_middleware_stack()
+    for _ in range(3):
+        sent.clear()
+        await stack(http_scope("/api/v1/admin/pool-stats"), make_receive(), send)
+        start = sent[0]
+        assert start["status"] == 200
+        names = {name for name, _ in start["headers"]}
+        assert {b"x-process-time", b"x-request-id", b"content-type"} <= names
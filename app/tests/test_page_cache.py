@@ -0,0 +1,159 @@
+# app/tests/test_page_cache.py
+# Test the rendered page/fragment cache: size-bounded LRU, TTL, tags, {% cache %} and render_cached.
+
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from jinja2 import TemplateSyntaxError
+
+from app.core import page_cache
+from app.core.page_cache import RenderCache, render_cached
+from app.core.templating import create_environment, create_templates
+
+
+def test_cache_is_bounded_by_bytes_and_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(page_cache.time, "monotonic", lambda: now[0])
+    cache = RenderCache(max_bytes=10, ttl=60)
+    cache.put(("a",), "aaaa")
+    cache.put(("b",), b"bbbb")
+    assert cache.get(("a",)) == "aaaa"  # a is now the most recently used
+    cache.put(("c",), "éé")  # 4 bytes encoded: b is evicted
+    assert cache.get(("b",)) is None
+    assert cache.size == 8 and len(cache) == 2
+
+    cache.put(("big",), "x" * 11)  # larger than the whole cache: not stored
+    cache.put(("off",), "x", ttl=0)
+    assert cache.get(("big",)) is None and cache.get(("off",)) is None
+
+    now[0] += 61
+    assert cache.get(("a",)) is None
+    assert cache.size == 4
+
+
+def test_invalidate_tags():
+    cache = RenderCache(max_bytes=1000, ttl=60)
+    cache.put(("risks",), "r", tags=["risks"])
+    cache.put(("both",), "b", tags=["risks", "policies"])
+    cache.put(("policies",), "p", tags=["policies"])
+    assert cache.invalidate_tags("risks") == 2
+    assert cache.get(("both",)) is None and cache.get(("policies",)) == "p"
+    cache.put(("both",), "b", tags=["policies"])  # re-added without the tag
+    assert cache.invalidate_tags("risks") == 0
+    assert cache.invalidate_tags("policies") == 2 and cache.size == 0
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "panel.html").write_text(
+        '<p>{{ title }}</p>{% cache "panel", role, ttl=60, tags=["risks"] %}'
+        "<b>{{ load() }}</b>{% endcache %}"
+    )
+    return directory
+
+
+def test_fragment_cache_block(template_dir, tmp_path):
+    env = create_environment(template_dir, tmp_path / "bytecode")
+    env.render_cache = cache = RenderCache(max_bytes=1000, ttl=300)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return f"<{len(calls)}>"
+
+    template = env.get_template("panel.html")
+    assert template.render(title="A", role="owner", load=load) == "<p>A</p><b>&lt;1&gt;</b>"
+    # the rest of the page still renders; the block comes from the cache, still escaped once
+    assert template.render(title="B", role="owner", load=load) == "<p>B</p><b>&lt;1&gt;</b>"
+    assert template.render(title="B", role="viewer", load=load) == "<p>B</p><b>&lt;2&gt;</b>"
+    cache.invalidate_tags("risks")
+    assert template.render(title="B", role="owner", load=load) == "<p>B</p><b>&lt;3&gt;</b>"
+
+    env.render_cache = None  # caching disabled
+    template.render(title="B", role="owner", load=load)
+    assert len(calls) == 4
+
+
+def test_fragment_cache_rejects_unknown_options(tmp_path):
+    env = create_environment(tmp_path)
+    with pytest.raises(TemplateSyntaxError, match="timeout"):
+        env.from_string('{% cache "x", timeout=5 %}{% endcache %}')
+    with pytest.raises(TemplateSyntaxError, match="needs a name"):
+        env.from_string("{% cache %}{% endcache %}")
+
+
+@pytest.mark.asyncio
+async def test_render_cached_keys_on_route_vary_and_template_mtime(template_dir, tmp_path):
+    (template_dir / "page.html").write_text("<h1>{{ who }} {{ n }}</h1>")
+    app = FastAPI()
+    app.state.templates = create_templates(template_dir, tmp_path / "bytecode")
+    cache = app.state.templates.env.render_cache
+    contexts = []
+
+    @app.get("/page")
+    async def page(request: Request, who: str = "all"):
+        async def context():
+            contexts.append(who)
+            return {"who": who, "n": len(contexts)}
+
+        return await render_cached(
+            request, "page.html", context, vary=request.headers.get("x-role")
+        )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/page")
+        assert first.text == "<h1>all 1</h1>"
+        second = await client.get("/page")
+        assert second.text == first.text and second.headers["content-type"].startswith("text/html")
+        assert contexts == ["all"] and cache.hits == 1
+
+        assert (await client.get("/page?who=x")).text == "<h1>x 2</h1>"
+        assert (await client.get("/page", headers={"x-role": "owner"})).text == "<h1>all 3</h1>"
+
+        path = template_dir / "page.html"
+        path.write_text("<h2>{{ who }}</h2>")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        assert (await client.get("/page")).text == "<h2>all</h2>"
+
+
+@pytest.mark.asyncio
+async def test_render_cached_stats_each_loaded_template_once(template_dir, tmp_path, monkeypatch):
+    (template_dir / "page.html").write_text("<h1>cached</h1>")
+    app = FastAPI()
+    app.state.templates = create_templates(template_dir, tmp_path / "bytecode", auto_reload=False)
+    stats = []
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        stats.append(str(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(page_cache.os, "stat", counting_stat)
+
+    @app.get("/page")
+    async def page(request: Request):
+        return await render_cached(request, "page.html")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/page")  # loads the template: Jinja and render_cached stat it here
+        loaded = len(stats)
+        for _ in range(3):
+            assert (await client.get("/page")).text == "<h1>cached</h1>"
+    assert str(template_dir / "page.html") in stats
+    assert len(stats) == loaded  # cache hits don't touch the file system
+
+
+@pytest.mark.asyncio
+async def test_home_page_served_from_cache():
+    from app.main import create_app
+
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/")
+        second = await client.get("/")
+    assert second.status_code == 200 and second.content == first.content
+    assert app.state.render_cache.hits == 1
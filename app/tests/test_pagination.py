@@ -0,0 +1,158 @@
+# app/tests/test_pagination.py
+# Test keyset pagination: cursors, page envelopes and the list routes built on them.
+
+import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.pagination import Keyset, PageParams, decode_cursor, encode_cursor, keyset_page
+from app.models.core_models import ActivityLog, Policy, Procedure, Reminder, Service, User
+
+ACTIVITY_ORDER = Keyset((ActivityLog.timestamp, ActivityLog.id), descending=True)
+
+
+def test_cursor_round_trip_restores_types():
+    when = datetime.datetime(2025, 3, 1, 12, 30)
+    cursor = encode_cursor(ACTIVITY_ORDER, [when, 42])
+    assert decode_cursor(ACTIVITY_ORDER, cursor) == [when, 42]
+
+
+def test_cursor_from_another_keyset_is_rejected():
+    cursor = encode_cursor(Keyset((Reminder.due_date, Reminder.id)), ["2025-01-01T00:00:00", 1])
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(ACTIVITY_ORDER, cursor)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        decode_cursor(ACTIVITY_ORDER, "not-a-cursor")
+
+
+def test_page_query_uses_keyset_not_offset():
+    cursor = encode_cursor(ACTIVITY_ORDER, [datetime.datetime(2025, 1, 1), 7])
+    stmt = keyset_page(select(ActivityLog), ACTIVITY_ORDER, PageParams(cursor=cursor, limit=10))
+    sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "OFFSET" not in sql
+    assert "activity_logs.timestamp < '2025-01-01 00:00:00'" in sql
+    assert "activity_logs.timestamp IS NULL" in sql  # NULL timestamps come after every date
+    assert "ORDER BY activity_logs.timestamp DESC NULLS LAST, activity_logs.id DESC" in sql
+    assert "LIMIT 11" in sql
+
+
+@pytest.mark.asyncio
+async def test_activity_logs_walk_all_pages(api_client, async_session, assert_max_queries):
+    procedure = Procedure(
+        policy=Policy(service=Service(name="Paging"), title="Paging policy"), title="Paging"
+    )
+    start = datetime.datetime(2025, 1, 1)
+    same_second = start + datetime.timedelta(days=1)
+    logs = [
+        ActivityLog(procedure=procedure, description=f"log {i}", timestamp=start) for i in range(3)
+    ] + [
+        ActivityLog(procedure=procedure, description=f"tie {i}", timestamp=same_second)
+        for i in range(4)
+    ]
+    async_session.add_all([procedure, *logs])
+    await async_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"procedure_id": procedure.id, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        with assert_max_queries(1):
+            response = await api_client.get("/api/v1/activity-logs", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert page["limit"] == 3
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if cursor is None:
+            break
+
+    expected = sorted(logs, key=lambda log: (log.timestamp, log.id), reverse=True)
+    assert seen == [log.id for log in expected]  # ties on timestamp broken by id, no repeats
+
+
+@pytest.mark.asyncio
+async def test_activity_logs_walk_past_null_timestamps(api_client, async_session):
+    procedure = Procedure(
+        policy=Policy(service=Service(name="Undated"), title="Undated policy"), title="Undated"
+    )
+    dated = [
+        ActivityLog(
+            procedure=procedure, description=f"dated {i}", timestamp=datetime.datetime(2025, 1, i)
+        )
+        for i in range(1, 4)
+    ]
+    undated = [ActivityLog(procedure=procedure, description=f"undated {i}") for i in range(3)]
+    async_session.add_all([procedure, *dated, *undated])
+    await async_session.flush()
+    for log in undated:
+        log.timestamp = None
+    await async_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {
+            "procedure_id": procedure.id,
+            "limit": 2,
+            **({"cursor": cursor} if cursor else {}),
+        }
+        page = (await api_client.get("/api/v1/activity-logs", params=params)).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    newest_first = [log.id for log in reversed(dated)]
+    assert seen == newest_first + sorted((log.id for log in undated), reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_reminders_soonest_first_and_bad_cursor(api_client, async_session):
+    user = User(email="paging@example.com", hashed_password="x", first_name="P", last_name="G")
+    due = datetime.datetime(2025, 6, 1)
+    async_session.add_all(
+        [
+            Reminder(user=user, title=f"r{i}", due_date=due + datetime.timedelta(days=-i))
+            for i in range(3)
+        ]
+    )
+    await async_session.commit()
+
+    response = await api_client.get("/api/v1/reminders", params={"user_id": user.id, "limit": 2})
+    page = response.json()
+    assert [item["title"] for item in page["items"]] == ["r2", "r1"]
+    assert page["has_more"] is True
+
+    response = await api_client.get("/api/v1/reminders", params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path", ["/api/v1/risks", "/api/v1/documents", "/api/v1/compliance-schedules"]
+)
+async def test_list_routes_return_page_envelope(api_client, path):
+    response = await api_client.get(path, params={"limit": 5})
+    assert response.status_code == 200
+    assert set(response.json()) == {"items", "limit", "has_more", "next_cursor"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/policies",
+        "/api/v1/procedures",
+        "/api/v1/risks",
+        "/api/v1/activity-logs",
+        "/api/v1/documents",
+        "/api/v1/reminders",
+        "/api/v1/compliance-schedules",
+    ],
+)
+async def test_list_routes_need_a_principal(client, path):
+    assert (await client.get(path)).status_code == 401
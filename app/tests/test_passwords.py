@@ -0,0 +1,133 @@
+# app/tests/test_passwords.py
+# Test the password hashing service: worker pool, in-flight cap, rehash on login.
+
+import asyncio
+import threading
+import time
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core import passwords
+from app.core.passwords import PasswordHasher
+from app.models.core_models import User
+
+
+def bcrypt_config(rounds: int) -> dict:
+    return dict(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip(fast_hasher):
+    hashed = await fast_hasher.hash("correct horse")
+    assert hashed.startswith("$2b$05$")
+    assert await fast_hasher.verify("correct horse", hashed)
+    assert not await fast_hasher.verify("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_thread_hasher_keeps_its_config_to_itself(fast_hasher):
+    # the module context stays the settings' one for everyone else in the process
+    context = passwords.pwd_context
+    assert (await fast_hasher.hash("pw")).startswith("$2b$05$")
+    assert passwords.pwd_context is context
+    assert passwords.pwd_context.to_dict() == CryptContext(**passwords.context_config()).to_dict()
+
+
+@pytest.mark.asyncio
+async def test_outdated_cost_and_scheme_are_rehashed(fast_hasher):
+    old = CryptContext(**bcrypt_config(4)).hash("pw")
+    assert fast_hasher.needs_update(old)
+    valid, new_hash = await fast_hasher.verify_and_update("pw", old)
+    assert valid and new_hash.startswith("$2b$05$")
+
+    migrating = PasswordHasher(
+        dict(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto"), executor="thread"
+    )
+    valid, new_hash = await migrating.verify_and_update("pw", old)
+    migrating.shutdown()
+    assert valid and new_hash.startswith("$pbkdf2-sha256$")
+
+
+@pytest.mark.asyncio
+async def test_in_flight_work_is_capped():
+    hasher = PasswordHasher(bcrypt_config(4), executor="thread", workers=4, max_in_flight=2)
+    running, peak, lock = 0, 0, threading.Lock()
+
+    def slow():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(hasher._run(slow) for _ in range(8)))
+    hasher.shutdown()
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_burst():
+    hasher = PasswordHasher(bcrypt_config(10), executor="process", workers=2)
+    hashed = await hasher.hash("pw")  # also starts the worker processes
+    lags = []
+
+    async def ticker():
+        for _ in range(20):
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - started - 0.005)
+
+    started = time.perf_counter()
+    await asyncio.gather(ticker(), *(hasher.verify("pw", hashed) for _ in range(4)))
+    burst = time.perf_counter() - started
+    hasher.shutdown()
+    assert max(lags) < burst / 2  # inline bcrypt would stall the loop for the whole burst
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_upgrades_outdated_hash(async_session, fast_hasher):
+    user = User(
+        email="rehash@example.com",
+        hashed_password=CryptContext(**bcrypt_config(4)).hash("s3cret-pass"),
+        first_name="Re",
+        last_name="Hash",
+    )
+    async_session.add(user)
+    await async_session.commit()
+
+    assert await passwords.authenticate_user(async_session, "rehash@example.com", "nope") is None
+    assert await passwords.authenticate_user(async_session, "nobody@example.com", "x") is None
+    assert user.hashed_password.startswith("$2b$04$")
+
+    found = await passwords.authenticate_user(async_session, "rehash@example.com", "s3cret-pass")
+    assert found is user
+    assert user.hashed_password.startswith("$2b$05$")
+    assert user in async_session.dirty  # stored by the request's commit
+
+
+@pytest.mark.asyncio
+async def test_login_route(client, async_session, fast_hasher):
+    async_session.add(
+        User(
+            email="login@example.com",
+            hashed_password=await fast_hasher.hash("s3cret-pass"),
+            first_name="Log",
+            last_name="In",
+        )
+    )
+    await async_session.commit()
+
+    response = await client.post(
+        "/api/v1/user/login", json={"username": "login@example.com", "password": "nope"}
+    )
+    assert response.status_code == 401
+
+    response = await client.post(
+        "/api/v1/user/login", json={"username": "login@example.com", "password": "s3cret-pass"}
+    )
+    assert response.status_code == 200
+    assert response.json()["email"] == "login@example.com"
+    assert "fourize_sessionid" in response.cookies
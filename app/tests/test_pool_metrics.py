@@ -0,0 +1,57 @@
+# app/tests/test_pool_metrics.py
+# Test connection pool instrumentation and the pool-stats endpoint.
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.pool_metrics import POOL_METRICS, InstrumentedQueuePool, install_pool_metrics
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_record_checkouts_and_waits(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    metrics = install_pool_metrics(engine, "test-pool")
+
+    async def query():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(query() for _ in range(3)))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 3
+    assert snapshot["checkins"] == 3
+    assert snapshot["connects"] == 1
+    assert snapshot["peak_checked_out"] == 1
+    assert snapshot["checkout_wait_seconds"]["count"] == 3
+    # two of the three had to wait for the single connection
+    assert snapshot["checkout_wait_seconds"]["max"] >= 0.005
+    assert snapshot["connection_age_seconds"]["count"] == 3
+
+    await engine.dispose()
+    assert engine.sync_engine.pool.metrics is metrics  # type: ignore[attr-defined]
+    POOL_METRICS.pop("test-pool")
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(client):
+    response = await client.get("/api/v1/admin/pool-stats")
+    assert response.status_code == 200
+    assert "primary" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint_only_for_allowlisted_clients(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ALLOWLIST", ["10.0.0.0/8"])
+    response = await client.get("/api/v1/admin/pool-stats")
+    assert response.status_code == 404
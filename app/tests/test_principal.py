@@ -0,0 +1,213 @@
+# app/tests/test_principal.py
+# Test the principal cache: LRU/TTL bounds, query-free cache hits, invalidation on role changes.
+
+import datetime
+
+import pytest
+
+from app.core import principal as principal_module
+from app.core.principal import Principal, PrincipalCache, principal_cache
+from app.models.core_models import Document, Reminder, User
+from app.models.enums import UserRoleEnum
+
+
+@pytest.fixture(autouse=True)
+def empty_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def make_principal(user_id: int, role=UserRoleEnum.USER) -> Principal:
+    return Principal(id=user_id, role=role, team=None, is_active=True)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PrincipalCache(ttl=60, max_entries=2)
+    cache.put(0, make_principal(1))
+    cache.put(0, make_principal(2))
+    assert cache.get(1, 0) is not None  # 1 is now more recent than 2
+    cache.put(0, make_principal(3))
+    assert cache.get(2, 0) is None
+    assert cache.get(1, 0) is not None and cache.get(3, 0) is not None
+
+
+def test_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(principal_module.time, "monotonic", lambda: now[0])
+    cache = PrincipalCache(ttl=30)
+    cache.put(0, make_principal(1))
+    now[0] += 29
+    assert cache.get(1, 0) is not None
+    now[0] += 2
+    assert cache.get(1, 0) is None
+    assert len(cache) == 0
+
+
+def test_cache_keys_on_session_version_and_invalidates_all_versions():
+    cache = PrincipalCache(ttl=60)
+    cache.put(0, make_principal(1))
+    cache.put(1, make_principal(1))
+    cache.put(0, make_principal(2))
+    assert cache.get(1, 2) is None
+    cache.invalidate(1)
+    assert cache.get(1, 0) is None and cache.get(1, 1) is None
+    assert cache.get(2, 0) is not None
+
+
+async def create_user(session, hasher, email: str, role=UserRoleEnum.USER) -> int:
+    user = User(
+        email=email,
+        hashed_password=await hasher.hash("s3cret-pass"),
+        first_name="P",
+        last_name="C",
+        role=role,
+    )
+    session.add(user)
+    await session.commit()
+    return user.id
+
+
+async def login(client, email: str) -> str:
+    client.cookies.clear()
+    response = await client.post(
+        "/api/v1/user/login", json={"username": email, "password": "s3cret-pass"}
+    )
+    assert response.status_code == 200
+    return client.cookies["fourize_sessionid"]
+
+
+def use_session(client, cookie: str) -> None:
+    client.cookies.clear()
+    client.cookies.set("fourize_sessionid", cookie)
+
+
+def csrf_headers(client) -> dict:
+    """Double-submit header for a cookie-authenticated write (the login set the CSRF cookie)."""
+    return {"x-csrftoken": client.cookies["csrftoken"]}
+
+
+@pytest.mark.asyncio
+async def test_me_is_served_from_cache(client, async_session, fast_hasher, assert_max_queries):
+    user_id = await create_user(async_session, fast_hasher, "me@example.com")
+    assert (await client.get("/api/v1/user/me")).status_code == 401
+
+    await login(client, "me@example.com")
+    with assert_max_queries(1):
+        response = await client.get("/api/v1/user/me")
+    assert response.json() == {"id": user_id, "role": "user", "team": None, "is_active": True}
+    with assert_max_queries(0):
+        assert (await client.get("/api/v1/user/me")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_and_deactivation_revokes(client, async_session, fast_hasher):
+    member_id = await create_user(async_session, fast_hasher, "member@example.com")
+    await create_user(async_session, fast_hasher, "owner@example.com", UserRoleEnum.OWNER)
+
+    member_cookie = await login(client, "member@example.com")
+    assert (await client.get("/api/v1/user/me")).json()["role"] == "user"
+    response = await client.patch(
+        f"/api/v1/users/{member_id}", json={"role": "owner"}, headers=csrf_headers(client)
+    )
+    assert response.status_code == 403
+
+    await login(client, "owner@example.com")
+    response = await client.patch(
+        f"/api/v1/users/{member_id}", json={"role": "owner"}, headers=csrf_headers(client)
+    )
+    assert response.status_code == 200
+    assert principal_cache.get(member_id, 0) is None
+
+    use_session(client, member_cookie)
+    assert (await client.get("/api/v1/user/me")).status_code == 401  # role change revokes
+    member_cookie = await login(client, "member@example.com")
+    assert (await client.get("/api/v1/user/me")).json()["role"] == "owner"
+
+    await login(client, "owner@example.com")
+    response = await client.patch(
+        f"/api/v1/users/{member_id}", json={"is_active": False}, headers=csrf_headers(client)
+    )
+    assert response.status_code == 200
+
+    use_session(client, member_cookie)
+    assert (await client.get("/api/v1/user/me")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_demoted_session_is_rejected_despite_a_warm_cache(
+    client, async_session, fast_hasher, assert_max_queries
+):
+    admin_id = await create_user(
+        async_session, fast_hasher, "admin@example.com", UserRoleEnum.OWNER
+    )
+    await create_user(async_session, fast_hasher, "head@example.com", UserRoleEnum.OWNER)
+    admin_cookie = await login(client, "admin@example.com")
+    assert (await client.get("/api/v1/user/me")).json()["role"] == "owner"
+    with assert_max_queries(0):  # served from the cache filled above
+        assert (await client.get("/api/v1/user/me")).status_code == 200
+
+    await login(client, "head@example.com")
+    response = await client.patch(
+        f"/api/v1/users/{admin_id}", json={"role": "user"}, headers=csrf_headers(client)
+    )
+    assert response.status_code == 200
+
+    use_session(client, admin_cookie)
+    assert (await client.get("/api/v1/user/me")).status_code == 401
+    await login(client, "admin@example.com")
+    assert (await client.get("/api/v1/user/me")).json()["role"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_cookie_session_writes_need_csrf_header(client, async_session, fast_hasher):
+    member_id = await create_user(async_session, fast_hasher, "csrf-member@example.com")
+    await create_user(async_session, fast_hasher, "csrf-owner@example.com", UserRoleEnum.OWNER)
+    await login(client, "csrf-owner@example.com")
+
+    # a cross-site form sends the cookies but cannot read the CSRF cookie to echo it
+    response = await client.patch(f"/api/v1/users/{member_id}", json={"role": "owner"})
+    assert response.status_code == 403
+    response = await client.patch(
+        f"/api/v1/users/{member_id}", json={"role": "owner"}, headers={"x-csrftoken": "forged"}
+    )
+    assert response.status_code == 403
+    assert (await client.get("/api/v1/user/me")).status_code == 200  # safe methods need none
+
+    response = await client.patch(
+        f"/api/v1/users/{member_id}", json={"role": "owner"}, headers=csrf_headers(client)
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_users_list_only_their_own_reminders_and_documents(
+    client, async_session, fast_hasher
+):
+    alice = await create_user(async_session, fast_hasher, "alice@example.com")
+    await create_user(async_session, fast_hasher, "bob@example.com")
+    await create_user(async_session, fast_hasher, "boss@example.com", UserRoleEnum.OWNER)
+    async_session.add_all(
+        [
+            Reminder(user_id=alice, title="alice's", due_date=datetime.datetime(2025, 6, 1)),
+            Document(filename="a.pdf", original_filename="a.pdf", file_path="a", uploaded_by=alice),
+        ]
+    )
+    await async_session.commit()
+
+    def titles(response):
+        assert response.status_code == 200
+        return [item.get("title", item.get("filename")) for item in response.json()["items"]]
+
+    await login(client, "bob@example.com")
+    assert titles(await client.get("/api/v1/reminders")) == []
+    assert titles(await client.get("/api/v1/reminders", params={"user_id": alice})) == []
+    assert titles(await client.get("/api/v1/documents")) == []
+
+    await login(client, "alice@example.com")
+    assert titles(await client.get("/api/v1/reminders")) == ["alice's"]
+    assert titles(await client.get("/api/v1/documents")) == ["a.pdf"]
+
+    await login(client, "boss@example.com")
+    assert titles(await client.get("/api/v1/reminders", params={"user_id": alice})) == ["alice's"]
+    assert "a.pdf" in titles(await client.get("/api/v1/documents"))
@@ -0,0 +1,56 @@
+# app/tests/test_projection.py
+# Test the column-projection read path against the ORM path.
+
+import datetime
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from app.core.projection import projection, select_projection, validate_rows
+from app.models.core_models import ComplianceSchedule, Risk
+from app.schemas.compliance import ComplianceScheduleOut
+from app.schemas.risk import RiskOut
+
+
+def test_projection_follows_schema_fields():
+    columns = [col.key for col in projection(RiskOut, Risk)]
+    assert columns == list(RiskOut.model_fields)
+    assert "email_body" not in columns  # model-only columns are not fetched
+
+
+def test_projection_rejects_required_field_without_column():
+    class Broken(BaseModel):
+        id: int
+        owner_name: str
+
+    with pytest.raises(ValueError, match="owner_name"):
+        projection(Broken, Risk)
+
+
+@pytest.mark.asyncio
+async def test_projection_matches_orm_path(async_session):
+    async_session.add_all(
+        [
+            ComplianceSchedule(title=f"Audit {i}", due_date=datetime.date(2025, 1, i + 1))
+            for i in range(3)
+        ]
+    )
+    await async_session.commit()
+    order = (ComplianceSchedule.id,)
+
+    objects = (await async_session.scalars(select(ComplianceSchedule).order_by(*order))).all()
+    expected = [ComplianceScheduleOut.model_validate(obj) for obj in objects]
+
+    stmt = select_projection(ComplianceScheduleOut, ComplianceSchedule).order_by(*order)
+    rows = (await async_session.execute(stmt)).all()
+
+    assert validate_rows(ComplianceScheduleOut, rows) == expected
+
+
+@pytest.mark.asyncio
+async def test_list_route_selects_only_schema_columns(api_client, assert_max_queries):
+    with assert_max_queries(1) as stats:
+        response = await api_client.get("/api/v1/risks")
+    assert response.status_code == 200
+    assert "email_body" not in stats.statements[0]
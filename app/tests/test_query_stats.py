@@ -0,0 +1,48 @@
+# app/tests/test_query_stats.py
+# Test per-request query counting and the N+1 detector.
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.query_stats import normalize_statement, track_queries
+from app.models.core_models import Service
+
+
+def test_normalize_collapses_literals_and_in_lists():
+    a = normalize_statement("SELECT * FROM risks WHERE id = 1 AND status = 'open'")
+    b = normalize_statement("SELECT *  FROM risks WHERE id = 42 AND status = 'closed'")
+    assert a == b == "SELECT * FROM risks WHERE id = ? AND status = ?"
+    assert normalize_statement("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == normalize_statement(
+        "SELECT 1 FROM t WHERE id IN (?)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_track_queries_flags_repeated_shapes(async_session: AsyncSession):
+    with track_queries() as stats:
+        for service_id in range(6):
+            await async_session.execute(select(Service).where(Service.id == service_id))
+    assert stats.count == 6
+    assert stats.total_time > 0
+    [(shape, count)] = stats.repeated_shapes(threshold=5)
+    assert count == 6
+    assert "FROM services" in shape
+
+
+@pytest.mark.asyncio
+async def test_assert_max_queries_fixture(async_session: AsyncSession, assert_max_queries):
+    with assert_max_queries(1):
+        await async_session.execute(select(Service.id).limit(1))
+
+    with pytest.raises(AssertionError):
+        with assert_max_queries(1):
+            await async_session.execute(select(Service.id).limit(1))
+            await async_session.execute(select(Service.id).limit(1))
+
+
+@pytest.mark.asyncio
+async def test_query_headers_on_response(client):
+    response = await client.get("/api/v1/admin/pool-stats")
+    assert response.headers["X-DB-Query-Count"] == "0"
+    assert response.headers["X-DB-Time"].endswith("seconds")
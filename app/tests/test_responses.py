@@ -0,0 +1,110 @@
+# app/tests/test_responses.py
+# Test the fast JSON path: FastJSONResponse encoding and FastJSONRoute response models.
+
+import datetime
+import enum
+import json
+
+import pytest
+import pytest_asyncio
+from fastapi import APIRouter, FastAPI, Response, status
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.core.responses import FastJSONResponse, FastJSONRoute, JSONBytes
+
+
+class Colour(str, enum.Enum):
+    RED = "red"
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    colour: Colour
+    due: datetime.date
+    seen: datetime.datetime
+
+
+class ItemOut(BaseModel):
+    id: int
+    colour: Colour
+    due: datetime.date
+    seen: datetime.datetime
+
+
+SEEN = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+
+def test_render_encodes_like_orjson():
+    body = FastJSONResponse(
+        {
+            "when": SEEN,
+            "day": datetime.date(2024, 5, 1),
+            "colour": Colour.RED,
+            "ratio": float("nan"),
+        }
+    ).body
+    assert body == (
+        b'{"when":"2024-05-01T12:30:00Z","day":"2024-05-01","colour":"red","ratio":null}'
+    )
+    assert FastJSONResponse(JSONBytes(b'{"ready":true}')).body == b'{"ready":true}'
+
+
+@pytest_asyncio.fixture
+async def fast_client():
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/items", response_model=list[ItemOut])
+    async def items():
+        # extra attributes (name) must still be filtered out by the response model
+        return [Item(id=1, name="secret", colour=Colour.RED, due=SEEN.date(), seen=SEEN)]
+
+    @router.post("/items", response_model=ItemOut, status_code=status.HTTP_201_CREATED)
+    async def create(response: Response):
+        response.headers["X-Item"] = "1"
+        return {"id": 1, "colour": "red", "due": "2024-05-01", "seen": SEEN, "name": "x"}
+
+    @router.get("/sparse", response_model=ItemOut, response_model_exclude={"seen"})
+    async def sparse():
+        return {"id": 2, "colour": "red", "due": "2024-05-01", "seen": SEEN}
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(router)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_route_serializes_response_model_to_bytes(fast_client):
+    response = await fast_client.get("/items")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == (
+        b'[{"id":1,"colour":"red","due":"2024-05-01","seen":"2024-05-01T12:30:00Z"}]'
+    )
+
+    response = await fast_client.post("/items")
+    assert response.status_code == 201
+    assert response.headers["x-item"] == "1"
+    assert response.json() == {
+        "id": 1,
+        "colour": "red",
+        "due": "2024-05-01",
+        "seen": "2024-05-01T12:30:00Z",
+    }
+
+    response = await fast_client.get("/sparse")
+    assert response.json() == {"id": 2, "colour": "red", "due": "2024-05-01"}
+
+
+@pytest.mark.asyncio
+async def test_error_handlers_use_fast_response(api_client):
+    response = await api_client.get("/api/v1/policies/not-a-number")
+    assert response.status_code == 422
+    detail = json.loads(response.content)["detail"]
+    assert detail[0]["loc"] == ["path", "policy_id"]
+
+    response = await api_client.get("/api/v1/policies/999999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Policy not found"}
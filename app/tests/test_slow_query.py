@@ -0,0 +1,58 @@
+# app/tests/test_slow_query.py
+# Test the slow-query log and its EXPLAIN capture.
+
+import json
+import logging
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core import slow_query
+from app.core.config import settings
+from app.core.db import Base
+from app.core.query_stats import add_query_observer, track_queries
+from app.models.core_models import Service
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+
+    def emit(self, record):
+        self.entries.append(json.loads(record.getMessage()))
+
+
+def install_slow_log(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    handler = ListHandler()
+    monkeypatch.setattr(slow_query.slow_logger, "handlers", [handler])
+    monkeypatch.setattr(slow_query, "_limiter", slow_query.RateLimiter(per_minute=60))
+    add_query_observer(slow_query._on_query)  # already installed by app.main; idempotent
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_slow_select_logged_with_plan_and_route(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    slow_log = install_slow_log(monkeypatch)
+
+    async with AsyncSession(engine) as session:
+        with track_queries(route="/risks"):
+            await session.execute(select(Service).where(Service.name == "x"))
+    await slow_query.drain_pending_explains()
+    await engine.dispose()
+
+    [entry] = slow_log.entries
+    assert entry["route"] == "/risks"
+    assert "FROM services" in entry["statement"]
+    assert "'x'" in entry["parameters"]
+    assert any("services" in line for line in entry["plan"])
+
+
+def test_rate_limiter_caps_entries():
+    limiter = slow_query.RateLimiter(per_minute=2)
+    assert [limiter.allow() for _ in range(3)] == [True, True, False]
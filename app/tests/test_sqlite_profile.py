@@ -0,0 +1,150 @@
+# app/tests/test_sqlite_profile.py
+# Test the SQLite engine profile and the single-writer queue.
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import db
+from app.core.db import Base
+from app.core.sqlite import SQLiteWriteQueue, install_sqlite_pragmas, sqlite_engine_options
+from app.models.core_models import Service
+
+
+@pytest_asyncio.fixture
+async def sqlite_file_engine(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+    engine = create_async_engine(url, **sqlite_engine_options(url, pool_size=2))
+    install_sqlite_pragmas(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied_on_connect(sqlite_file_engine):
+    async with sqlite_file_engine.connect() as conn:
+        assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+        assert (await conn.scalar(text("PRAGMA synchronous"))) == 1  # NORMAL
+        assert (await conn.scalar(text("PRAGMA busy_timeout"))) > 0
+
+
+def test_memory_database_keeps_static_pool():
+    assert "pool_size" not in sqlite_engine_options("sqlite+aiosqlite:///:memory:", pool_size=5)
+
+
+@pytest.mark.asyncio
+async def test_write_queue_commits_concurrent_writes(sqlite_file_engine):
+    maker = sessionmaker(sqlite_file_engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+    queue = SQLiteWriteQueue(maker, max_batch=8)  # type: ignore
+
+    async def add_service(i):
+        async def write(session):
+            session.add(Service(name=f"queued {i}"))
+            await session.flush()
+            return i
+
+        return await queue.submit(write)
+
+    results = await asyncio.gather(*(add_service(i) for i in range(40)))
+    await queue.stop()
+
+    assert sorted(results) == list(range(40))
+    async with maker() as session:  # type: ignore
+        assert await session.scalar(select(func.count(Service.id))) == 40
+
+
+
+@pytest.mark.asyncio
+async def test_full_write_queue_makes_submit_wait(sqlite_file_engine):
+    maker = sessionmaker(sqlite_file_engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+    queue = SQLiteWriteQueue(maker, max_batch=1, max_pending=2)  # type: ignore
+    queued = []
+
+    async def write(session):
+        queued.append(queue._queue.qsize())
+        session.add(Service(name=f"bounded {len(queued)}"))
+        await session.flush()
+
+    await asyncio.gather(*(queue.submit(write) for _ in range(10)))
+    await queue.stop()
+
+    assert len(queued) == 10
+    assert max(queued) <= 2
+
+@pytest.mark.asyncio
+async def test_failing_write_does_not_roll_back_its_batch(sqlite_file_engine):
+    maker = sessionmaker(sqlite_file_engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+    queue = SQLiteWriteQueue(maker)  # type: ignore
+
+    async def good(session):
+        session.add(Service(name="kept"))
+        await session.flush()
+
+    async def bad(session):
+        session.add(Service(name="dropped"))
+        await session.flush()
+        raise RuntimeError("boom")
+
+    outcomes = await asyncio.gather(queue.submit(good), queue.submit(bad), return_exceptions=True)
+    await queue.stop()
+
+    assert outcomes[0] is None
+    assert isinstance(outcomes[1], RuntimeError)
+    async with maker() as session:  # type: ignore
+        names = set(await session.scalars(select(Service.name)))
+    assert names == {"kept"}
+
+
+@pytest.mark.asyncio
+async def test_request_writes_go_through_the_writer_connection(
+    sqlite_file_engine, tmp_path, monkeypatch
+):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+    writer = create_async_engine(url, **sqlite_engine_options(url, pool_size=1))
+    install_sqlite_pragmas(writer)
+    monkeypatch.setattr(db, "engine", sqlite_file_engine)
+    monkeypatch.setattr(db, "writer_engine", writer)
+    maker = sessionmaker(
+        sqlite_file_engine,  # type: ignore
+        class_=AsyncSession,
+        sync_session_class=db.RoutingSession,
+        expire_on_commit=False,
+    )  # type: ignore
+    monkeypatch.setattr(db, "async_session_maker", maker)
+    statements = {"read": [], "writer": []}
+    for name, engine in (("read", sqlite_file_engine), ("writer", writer)):
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, sql, *args, name=name: statements[name].append(sql.split()[0]),
+        )
+
+    async def request_write(i):
+        request = Request({"type": "http", "method": "POST", "path": "/", "headers": []})
+        gen = db.get_db_session(request)
+        session = await gen.__anext__()
+        await session.scalar(select(func.count(Service.id)))
+        session.add(Service(name=f"request {i}"))
+        await session.flush()
+        await asyncio.sleep(0)  # let the other request run while this one holds the writer
+        await session.execute(
+            update(Service).where(Service.name == f"request {i}").values(name=f"written {i}")
+        )
+        with pytest.raises(StopAsyncIteration):
+            await gen.__anext__()
+
+    await asyncio.gather(request_write(1), request_write(2))
+    await writer.dispose()
+
+    assert {"INSERT", "UPDATE"}.isdisjoint(statements["read"])
+    assert statements["writer"].count("INSERT") == 2 and statements["writer"].count("UPDATE") == 2
+    async with sqlite_file_engine.connect() as conn:
+        names = set(await conn.scalars(select(Service.name)))
+    assert names == {"written 1", "written 2"}
@@ -0,0 +1,133 @@
+# app/tests/test_static_assets.py
+# Test the collectstatic build (minify, hashing, bundles, precompression) and how /static serves it.
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.assets import (
+    IMMUTABLE,
+    MANIFEST_NAME,
+    PrecompressedStaticFiles,
+    StaticManifest,
+    collect_static,
+    minify_css,
+)
+from app.core.config import settings
+
+CSS = """/* ===== header ===== */
+.nav :hover { color : red ; }
+.nav > a,
+.nav > b {
+    width: calc(100% - 2px);
+    content: "a , b ;  }";
+}
+"""
+
+
+def test_minify_css_keeps_meaning():
+    assert minify_css(CSS) == (
+        '.nav :hover{color :red}.nav>a,.nav>b{width:calc(100% - 2px);content:"a , b ;  }"}'
+    )
+    assert minify_css("/*! license */ a { b: c; }") == "/*! license */ a{b:c}"
+
+
+@pytest.fixture
+def build(tmp_path):
+    source, target = tmp_path / "static", tmp_path / "staticfiles"
+    (source / "img").mkdir(parents=True)
+    (source / "base.css").write_text(CSS * 20)
+    (source / "pages.css").write_text(".page { margin: 0 auto; }\n" * 50)
+    (source / "img" / "logo.png").write_bytes(b"\x89PNG" + b"\0" * 2048)
+    (source / ".DS_Store").write_bytes(b"junk")
+    collected = collect_static(source, target, {"site.css": ["base.css", "pages.css"]})
+    return source, target, {asset.name: asset for asset in collected}
+
+
+def test_collect_static_writes_hashed_precompressed_files(build):
+    source, target, collected = build
+    manifest = json.loads((target / MANIFEST_NAME).read_text())["paths"]
+    assert set(manifest) == {"base.css", "pages.css", "site.css", "img/logo.png"}
+
+    hashed = manifest["site.css"]
+    assert hashed.startswith("site.") and hashed.endswith(".css") and hashed != "site.css"
+    site = (target / hashed).read_bytes()
+    assert site == (target / "base.css").read_bytes() + b"\n" + (target / "pages.css").read_bytes()
+    assert len(site) < len(CSS * 20) + len(".page { margin: 0 auto; }\n" * 50)
+    assert gzip.decompress((target / (hashed + ".gz")).read_bytes()) == site
+    assert collected["site.css"].variants["gzip"] < collected["site.css"].size
+
+    # images are not precompressed; dotfiles are not collected
+    assert manifest["img/logo.png"].startswith("img/logo.")
+    assert not (target / (manifest["img/logo.png"] + ".gz")).exists()
+    assert not (target / ".DS_Store").exists()
+
+    # a changed source gets a new name; the old hashed file stays for pages already rendered
+    (source / "pages.css").write_text(".page { margin: 1px; }\n")
+    collect_static(source, target, {"site.css": ["base.css", "pages.css"]})
+    new_hashed = json.loads((target / MANIFEST_NAME).read_text())["paths"]["site.css"]
+    assert new_hashed != hashed
+    assert (target / hashed).exists() and (target / new_hashed).exists()
+
+
+def test_collect_static_rejects_unknown_bundle_members(tmp_path):
+    (tmp_path / "static").mkdir()
+    with pytest.raises(FileNotFoundError, match="missing.css"):
+        collect_static(tmp_path / "static", tmp_path / "out", {"site.css": ["missing.css"]})
+
+
+@pytest.mark.asyncio
+async def test_serves_precompressed_variant_with_immutable_caching(build):
+    _, target, _ = build
+    manifest = StaticManifest.load(target / MANIFEST_NAME)
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=target, manifest=manifest))
+    hashed = manifest.resolve("site.css")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(f"/static/{hashed}", headers={"accept-encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/css")
+        assert response.headers["cache-control"] == IMMUTABLE
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert response.content == (target / hashed).read_bytes()  # httpx decoded it
+
+        etag = response.headers["etag"]
+        response = await client.get(
+            f"/static/{hashed}", headers={"accept-encoding": "gzip", "if-none-match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == IMMUTABLE
+
+        # no acceptable encoding: the plain hashed file
+        response = await client.get(f"/static/{hashed}", headers={"accept-encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["cache-control"] == IMMUTABLE
+
+        # unhashed copies work but are not immutable
+        response = await client.get("/static/site.css", headers={"accept-encoding": "gzip"})
+        assert response.status_code == 200
+        assert "immutable" not in response.headers.get("cache-control", "")
+
+        response = await client.get("/static/missing.css")
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_templates_resolve_assets_through_manifest(build, monkeypatch):
+    from app.main import create_app
+
+    _, target, _ = build
+    monkeypatch.setattr(settings, "STATIC_ROOT", target)
+    (target / MANIFEST_NAME).write_text(
+        json.dumps({"version": 1, "paths": {"modern.css": "modern.0123456789ab.css"}})
+    )
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/")
+    assert 'href="http://test/static/modern.0123456789ab.css"' in response.text
+    assert "/static/modern.css" not in response.text
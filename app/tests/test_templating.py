@@ -0,0 +1,55 @@
+# app/tests/test_templating.py
+# Test the template bytecode cache and eager compilation at startup.
+
+import jinja2
+import pytest
+
+from app.core.templating import create_environment, create_templates, precompile_templates
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "templates"
+    (directory / "public").mkdir(parents=True)
+    (directory / "base.html").write_text("<title>{% block title %}{% endblock %}</title>")
+    (directory / "public" / "page.html").write_text(
+        '{% extends "base.html" %}{% block title %}{{ name }}{% endblock %}'
+    )
+    (directory / ".gitkeep").write_text("")
+    return directory
+
+
+def test_precompile_fills_bytecode_cache_used_by_new_environments(
+    template_dir, tmp_path, monkeypatch
+):
+    cache_dir = tmp_path / "cache"
+    compiled = precompile_templates(create_environment(template_dir, cache_dir))
+    assert set(compiled) == {"base.html", "public/page.html"}
+    assert len(list(cache_dir.glob("__jinja2_*.cache"))) == 2
+
+    # a fresh environment (a new worker) loads the bytecode instead of compiling
+    def no_compile(self, *args, **kwargs):
+        raise AssertionError("template was compiled again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(jinja2.Environment, "compile", no_compile)
+        env = create_environment(template_dir, cache_dir)
+        assert env.get_template("public/page.html").render(name="Hi") == "<title>Hi</title>"
+
+    # an edited template no longer matches its checksum and is compiled again
+    (template_dir / "base.html").write_text("<h1>{% block title %}{% endblock %}</h1>")
+    env = create_environment(template_dir, cache_dir)
+    assert env.get_template("public/page.html").render(name="Hi") == "<h1>Hi</h1>"
+
+
+def test_precompile_skips_broken_templates(template_dir, tmp_path):
+    (template_dir / "broken.html").write_text("{% if %}")
+    env = create_environment(template_dir, tmp_path / "cache")
+    assert set(precompile_templates(env)) == {"base.html", "public/page.html"}
+
+
+def test_templates_autoescape_and_reload_setting(template_dir, tmp_path):
+    (template_dir / "echo.html").write_text("{{ value }}")
+    templates = create_templates(template_dir, tmp_path / "cache", auto_reload=False)
+    assert not templates.env.auto_reload
+    assert templates.get_template("echo.html").render(value="<b>") == "&lt;b&gt;"
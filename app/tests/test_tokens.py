@@ -0,0 +1,128 @@
+# app/tests/test_tokens.py
+# Test signed API tokens: verification, key rotation, deny-list, and the token endpoints.
+
+import time
+
+import pytest
+
+from app.core import tokens
+from app.core.tokens import KeyRing, TokenDenyList, TokenError
+from app.models.core_models import User
+
+
+@pytest.fixture(autouse=True)
+def fresh_deny_list(monkeypatch):
+    monkeypatch.setattr(tokens, "deny_list", TokenDenyList())
+
+
+def test_round_trip_and_tampering():
+    token = tokens.issue_access_token(7, "user", "blue")
+    claims = tokens.verify_token(token)
+    assert (claims["sub"], claims["role"], claims["team"]) == ("7", "user", "blue")
+
+    header, payload, signature = token.split(".")
+    forged = tokens._b64encode(b'{"sub":"1","role":"owner","typ":"access","exp":9999999999}')
+    for bad in (f"{header}.{forged}.{signature}", token[:-2], "a.b", "not a token"):
+        with pytest.raises(TokenError):
+            tokens.verify_token(bad)
+    with pytest.raises(TokenError, match="refresh"):
+        tokens.verify_token(token, tokens.REFRESH)
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    token = tokens.issue_access_token(7, "user", None)
+    later = time.time() + 3600
+    monkeypatch.setattr(tokens.time, "time", lambda: later)
+    with pytest.raises(TokenError, match="expired"):
+        tokens.verify_token(token)
+
+
+def test_key_rotation(monkeypatch):
+    monkeypatch.setattr(tokens, "key_ring", KeyRing({"k1": "old-secret"}))
+    old = tokens.issue_access_token(1, "user", None)
+
+    monkeypatch.setattr(tokens, "key_ring", KeyRing({"k1": "old-secret", "k2": "new-secret"}))
+    new = tokens.issue_access_token(1, "user", None)
+    assert '"kid":"k2"' in tokens._b64decode(new.split(".")[0]).decode()
+    assert tokens.verify_token(old) and tokens.verify_token(new)
+
+    monkeypatch.setattr(tokens, "key_ring", KeyRing({"k2": "new-secret"}))
+    with pytest.raises(TokenError, match="Unknown signing key"):
+        tokens.verify_token(old)
+    with pytest.raises(ValueError):
+        KeyRing({"k1": "x"}, active_kid="k9")
+
+
+def test_deny_list_keeps_entries_until_expiry_only():
+    deny_list = TokenDenyList(max_entries=4)
+    now = int(time.time())
+    deny_list.deny("gone", now - 1)
+    assert "gone" not in deny_list and len(deny_list) == 0
+    for i in range(10):
+        deny_list.deny(f"jti{i}", now + 100 + i)
+    assert len(deny_list) <= 4
+    assert "jti9" in deny_list  # the longest-lived revocations are kept
+
+
+async def create_user(session, hasher, email: str) -> int:
+    user = User(
+        email=email, hashed_password=await hasher.hash("s3cret-pass"), first_name="T", last_name="K"
+    )
+    session.add(user)
+    await session.commit()
+    return user.id
+
+
+@pytest.mark.asyncio
+async def test_token_flow(client, async_session, fast_hasher, assert_max_queries):
+    await create_user(async_session, fast_hasher, "api@example.com")
+    assert (await client.get("/api/v1/risks")).status_code == 401
+
+    response = await client.post(
+        "/api/v1/auth/token", json={"username": "api@example.com", "password": "s3cret-pass"}
+    )
+    assert response.status_code == 200
+    pair = response.json()
+    assert pair["token_type"] == "bearer"
+    bearer = {"Authorization": f"Bearer {pair['access_token']}"}
+
+    with assert_max_queries(1):  # the list query only: no session or user lookup
+        assert (await client.get("/api/v1/risks", headers=bearer)).status_code == 200
+    response = await client.get("/api/v1/risks", headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert response.json()["detail"] == "Invalid token"  # the verification error is only logged
+
+    response = await client.post(
+        "/api/v1/auth/token/refresh", json={"refresh_token": pair["refresh_token"]}
+    )
+    assert response.status_code == 200
+    refreshed = response.json()
+    response = await client.post(
+        "/api/v1/auth/token/refresh", json={"refresh_token": pair["refresh_token"]}
+    )
+    assert response.status_code == 401  # rotated: the old refresh token is spent
+
+    response = await client.post("/api/v1/auth/token/revoke", json={"token": pair["access_token"]})
+    assert response.status_code == 204
+    assert (await client.get("/api/v1/risks", headers=bearer)).status_code == 401
+    bearer = {"Authorization": f"Bearer {refreshed['access_token']}"}
+    assert (await client.get("/api/v1/risks", headers=bearer)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_refresh_fails_after_deactivation(client, async_session, fast_hasher):
+    user_id = await create_user(async_session, fast_hasher, "gone@example.com")
+    response = await client.post(
+        "/api/v1/auth/token", json={"username": "gone@example.com", "password": "s3cret-pass"}
+    )
+    refresh_token = response.json()["refresh_token"]
+
+    user = await async_session.get(User, user_id)
+    user.session_version += 1
+    await async_session.commit()
+
+    response = await client.post(
+        "/api/v1/auth/token/refresh", json={"refresh_token": refresh_token}
+    )
+    assert response.status_code == 401
@@ -2,10 +2,12 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 
+from app.core.page_cache import render_cached
+
 
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return request.app.state.templates.TemplateResponse(request, "public/index.html", {})
+    return await render_cached(request, "public/index.html", tags=["public"])
@@ -0,0 +1,139 @@
+# benchmarks/bench_cascade_delete.py
+# Deleting a large Service tree: ORM cascade (children loaded and deleted row by row)
+# vs ON DELETE CASCADE with passive_deletes (one DELETE, the database removes the tree).
+#
+# Run: python -m benchmarks.bench_cascade_delete
+
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.core.db import Base
+from app.core.sqlite import install_sqlite_pragmas
+from app.models.core_models import (
+    ActivityLog,
+    ChecklistItem,
+    Policy,
+    Procedure,
+    Risk,
+    Service,
+)
+
+POLICIES = 10
+PROCEDURES_PER_POLICY = 20
+CHECKLIST_PER_PROCEDURE = 10
+ACTIVITIES_PER_PROCEDURE = 500  # years of history: 100k activity log rows in total
+
+ORM_CASCADE = (
+    selectinload(Service.policies).options(
+        selectinload(Policy.documents),
+        selectinload(Policy.acceptances),
+        selectinload(Policy.risks),
+        selectinload(Policy.procedures).options(
+            selectinload(Procedure.checklist_items),
+            selectinload(Procedure.activities),
+            selectinload(Procedure.documents),
+            selectinload(Procedure.acceptances),
+            selectinload(Procedure.risks),
+        ),
+    ),
+)
+
+
+async def build_tree(maker) -> tuple[int, int]:
+    async with maker() as session:
+        service = Service(name="bench")
+        session.add(service)
+        await session.flush()
+        policy_ids = (
+            await session.scalars(
+                insert(Policy).returning(Policy.id),
+                [{"service_id": service.id, "title": f"p{i}"} for i in range(POLICIES)],
+            )
+        ).all()
+        procedure_ids = (
+            await session.scalars(
+                insert(Procedure).returning(Procedure.id),
+                [
+                    {"policy_id": policy_id, "title": f"proc{i}"}
+                    for policy_id in policy_ids
+                    for i in range(PROCEDURES_PER_POLICY)
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(ChecklistItem),
+            [
+                {"procedure_id": pid, "description": "step", "sort_order": i}
+                for pid in procedure_ids
+                for i in range(CHECKLIST_PER_PROCEDURE)
+            ],
+        )
+        await session.execute(
+            insert(ActivityLog),
+            [
+                {"procedure_id": pid, "description": "done", "performed_by": "bench"}
+                for pid in procedure_ids
+                for _ in range(ACTIVITIES_PER_PROCEDURE)
+            ],
+        )
+        await session.execute(
+            insert(Risk), [{"related_procedure_id": pid, "event": "r"} for pid in procedure_ids]
+        )
+        await session.commit()
+        rows = await session.scalar(select(func.count(ActivityLog.id)))
+        return service.id, rows or 0
+
+
+async def delete_tree(maker, service_id: int, load_children: bool) -> None:
+    async with maker() as session:
+        if load_children:  # what the ORM did before passive_deletes
+            service = await session.scalar(
+                select(Service).options(*ORM_CASCADE).where(Service.id == service_id)
+            )
+        else:
+            service = await session.get(Service, service_id)
+        await session.delete(service)
+        await session.commit()
+
+
+async def run(path: Path, load_children: bool) -> tuple[int, float, float]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    install_sqlite_pragmas(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+    service_id, rows = await build_tree(maker)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await delete_tree(maker, service_id, load_children)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    async with maker() as session:  # type: ignore
+        assert not await session.scalar(select(func.count(ActivityLog.id)))
+    await engine.dispose()
+    return rows, elapsed, peak / 1024 / 1024
+
+
+async def main():
+    print(f"{'mode':<34}{'activity rows':>14}{'seconds':>10}{'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, load_children, name in (
+            ("ORM cascade (children loaded)", True, "orm.db"),
+            ("ON DELETE CASCADE, passive", False, "passive.db"),
+        ):
+            rows, elapsed, peak = await run(Path(tmp) / name, load_children)
+            print(f"{label:<34}{rows:>14}{elapsed:>10.2f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+# benchmarks/bench_compression.py
+# Compression of the bodies we serve: Page[ActivityLogOut]/Page[RiskOut] JSON at the default (50)
+# and max (200) page size, a large export, the rendered landing page and our CSS.
+# Size and time per encoding/level, then event-loop stall for a large export: inline vs thread pool.
+#
+# Run: python -m benchmarks.bench_compression
+
+import asyncio
+import datetime
+import random
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import COMPRESSORS, CompressionMiddleware
+from app.core.config import settings
+from app.schemas.activity import ActivityLogOut
+from app.schemas.pagination import Page
+from app.schemas.risk import RiskOut
+
+LEVELS = {"gzip": (1, 5, 6, 9), "br": (1, 4, 5, 9, 11), "zstd": (1, 3, 6, 12)}
+WORDS = "control review staff policy incident breach audit training access backup vendor".split()
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def activity_page(size: int) -> bytes:
+    rng = random.Random(size)
+    now = datetime.datetime(2026, 1, 1)
+    items = [
+        ActivityLogOut(
+            id=10_000 - i,
+            procedure_id=rng.randint(1, 300),
+            description=sentence(rng, 12),
+            performed_by=rng.choice(["alice@example.com", "bob@example.com", "ops"]),
+            outcome=rng.choice(["ok", "failed", "needs follow-up"]),
+            timestamp=now - datetime.timedelta(minutes=37 * i),
+        )
+        for i in range(size)
+    ]
+    return (
+        Page(items=items, limit=size, has_more=True, next_cursor="eyJrIjoiYWJjZCJ9")
+        .model_dump_json()
+        .encode()
+    )
+
+
+def risk_page(size: int) -> bytes:
+    rng = random.Random(size)
+    items = [
+        RiskOut(
+            id=i,
+            date_raised=datetime.date(2025, 1, 1) + datetime.timedelta(days=i),
+            raised_by="risk@example.com",
+            risk_category=rng.choice(["privacy", "security", "operational"]),
+            event=sentence(rng, 8),
+            cause=sentence(rng, 10),
+            consequence=sentence(rng, 10),
+            consequence_rating=rng.choice(["low", "mid", "high"]),
+            likelihood=rng.choice(["rare", "possible", "likely"]),
+            risk_rating=rng.choice(["low", "mid", "high", "critical"]),
+            action=sentence(rng, 14),
+            status=rng.choice(["open", "closed"]),
+            related_policy_id=rng.randint(1, 40),
+        )
+        for i in range(size)
+    ]
+    return (
+        Page(items=items, limit=size, has_more=False, next_cursor=None).model_dump_json().encode()
+    )
+
+
+async def landing_page() -> bytes:
+    from app.main import create_app
+
+    transport = ASGITransport(app=create_app())
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        return (await client.get("/", headers={"accept-encoding": "identity"})).content
+
+
+def best_ms(fn, repeat: int = 7) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def compress(encoding: str, level: int, body: bytes) -> bytes:
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(body) + compressor.finish()
+
+
+async def loop_stall(body: bytes, thread_threshold: int) -> tuple[float, float]:
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/json")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def send(message):
+        pass
+
+    middleware = CompressionMiddleware(app, encodings=["gzip"], thread_threshold=thread_threshold)
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - started - 0.001) * 1000)
+
+    async def requests():
+        for _ in range(5):
+            await middleware(scope, None, send)
+        done.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(ticker(), requests())
+    return max(lags), (time.perf_counter() - started) * 1000
+
+
+async def main():
+    payloads = {
+        "activity page 50": activity_page(50),
+        "activity page 200": activity_page(200),
+        "risk page 50": risk_page(50),
+        "risk page 200": risk_page(200),
+        "activity export 20k": activity_page(20_000),
+        "landing page HTML": await landing_page(),
+        "modern.css": (settings.STATIC_DIR / "modern.css").read_bytes(),
+    }
+    print(f"encodings available: {', '.join(COMPRESSORS)}")
+    print(f"{'payload':<22}{'bytes':>10}  {'enc':<5}{'level':>6}{'bytes':>10}{'ratio':>8}{'ms':>9}")
+    for name, body in payloads.items():
+        for encoding in COMPRESSORS:
+            for level in LEVELS[encoding]:
+                out = compress(encoding, level, body)
+                ms = best_ms(lambda enc=encoding, lvl=level, data=body: compress(enc, lvl, data))
+                print(
+                    f"{name:<22}{len(body):>10}  {encoding:<5}{level:>6}{len(out):>10}"
+                    f"{len(body) / len(out):>8.1f}{ms:>9.2f}"
+                )
+
+    body = payloads["activity export 20k"]
+    print(f"\n5 x {len(body) // 1024} KiB JSON export through CompressionMiddleware (gzip)")
+    for label, threshold in (
+        ("inline", 1 << 62),
+        ("thread pool", settings.COMPRESSION_THREAD_THRESHOLD),
+    ):
+        lag, total = await loop_stall(body, threshold)
+        print(f"{label:<12} max loop stall {lag:7.1f} ms   total {total:7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+# benchmarks/bench_loader_profiles.py
+# Row-count benchmark: legacy blanket eager loading vs named loader profiles.
+#
+# Run: python -m benchmarks.bench_loader_profiles
+
+import asyncio
+from collections import Counter
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker
+
+from app.core.db import Base
+from app.models.core_models import (
+    ActivityLog,
+    ChecklistItem,
+    Document,
+    Policy,
+    PolicyAcceptance,
+    Procedure,
+    ProcedureAcceptance,
+    Risk,
+    Service,
+    User,
+)
+from app.models.loader_profiles import with_profile
+
+POLICIES = 20
+PROCEDURES_PER_POLICY = 10
+CHECKLIST_PER_PROCEDURE = 5
+ACTIVITIES_PER_PROCEDURE = 50
+USERS = 25
+
+
+def legacy_eager_options(mapper, path=()):
+    """
+    Rebuild the old graph: every collection selectin, every many-to-one joined,
+    recursing until a mapper repeats (roughly what SQLAlchemy did with the old lazy= settings).
+    """
+    options = []
+    for rel in mapper.relationships:
+        target = rel.mapper
+        if target in path or target is mapper:
+            continue
+        loader = selectinload if rel.uselist else joinedload
+        nested = legacy_eager_options(target, (*path, mapper))
+        option = loader(rel.class_attribute)
+        options.append(option.options(*nested) if nested else option)
+    return options
+
+
+async def seed(session):
+    users = [
+        User(email=f"u{i}@example.com", hashed_password="x", first_name="U", last_name=str(i))
+        for i in range(USERS)
+    ]
+    service = Service(name="Bench service")
+    session.add_all([service, *users])
+    for p in range(POLICIES):
+        policy = Policy(service=service, title=f"Policy {p}")
+        session.add(PolicyAcceptance(policy=policy, user=users[p % USERS], accepted=True))
+        session.add(Risk(related_policy=policy, event="risk"))
+        for r in range(PROCEDURES_PER_POLICY):
+            procedure = Procedure(policy=policy, title=f"Procedure {p}.{r}")
+            session.add(ProcedureAcceptance(procedure=procedure, user=users[r % USERS]))
+            session.add(
+                Document(
+                    filename="f",
+                    original_filename="f",
+                    file_path="/tmp/f",
+                    user=users[(p + r) % USERS],
+                    policy=policy,
+                    procedure=procedure,
+                )
+            )
+            session.add_all(
+                ChecklistItem(procedure=procedure, description="step")
+                for _ in range(CHECKLIST_PER_PROCEDURE)
+            )
+            session.add_all(
+                ActivityLog(procedure=procedure, description="did", performed_by="bench")
+                for _ in range(ACTIVITIES_PER_PROCEDURE)
+            )
+    await session.commit()
+
+
+async def count_loaded(session_maker, stmt) -> Counter:
+    loaded: Counter = Counter()
+
+    def on_load(target, context):
+        loaded[type(target).__name__] += 1
+
+    event.listen(Base, "load", on_load, propagate=True)
+    try:
+        async with session_maker() as session:
+            await session.scalar(stmt)
+    finally:
+        event.remove(Base, "load", on_load)
+    return loaded
+
+
+async def main():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_maker() as session:  # type: ignore
+        await seed(session)
+
+    cases = [
+        (
+            "User by id",
+            select(User).where(User.id == 1),
+            "user_summary",
+        ),
+        (
+            "Policy by id",
+            select(Policy).where(Policy.id == 1),
+            "policy_tree",
+        ),
+    ]
+    print(f"{'query':<16}{'mode':<22}{'rows':>8}  breakdown")
+    for label, stmt, profile in cases:
+        legacy = stmt.options(*legacy_eager_options(inspect(stmt.column_descriptions[0]["entity"])))
+        for mode, query in (
+            ("legacy eager", legacy),
+            (f"profile={profile}", with_profile(stmt, profile)),
+        ):
+            loaded = await count_loaded(session_maker, query)
+            breakdown = ", ".join(f"{k}={v}" for k, v in loaded.most_common())
+            print(f"{label:<16}{mode:<22}{sum(loaded.values()):>8}  {breakdown}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
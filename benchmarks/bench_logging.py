@@ -0,0 +1,149 @@
+# benchmarks/bench_logging.py
+# Logging cost per request at high request rates. RequestLoggingMiddleware wraps a trivial route
+# and is driven by raw ASGI calls in a tight loop, the busiest a worker gets. Handlers write to
+# real files (5 MB rotation, like forizec.log) in a temp dir.
+# - "event loop" is time per request spent in the request path.
+# - "incl. drain" also waits for the listener to flush, i.e. total CPU on this (1-CPU) box.
+# The "stalling disk" rows make every 500th write block for 5 ms, as a rotation or a busy disk does.
+#
+# Run: python -m benchmarks.bench_logging
+
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.logging_config import RequestIdFilter, make_formatter, queue_handlers
+from app.core.middleware import RequestLoggingMiddleware
+
+REQUESTS = 20_000
+ROUNDS = 3
+OLD_FORMAT = "%(levelname)s | %(asctime)s | %(name)s | %(filename)s:%(lineno)d | %(message)s"
+
+SETUPS = {
+    # name: (queued, log format, 2xx sample rate)
+    "no handlers": (None, None, 1.0),
+    "direct, text (old)": (False, "old", 1.0),
+    "queue, text": (True, "text", 1.0),
+    "queue, json": (True, "json", 1.0),
+    "queue, json, 10% 2xx": (True, "json", 0.1),
+    "direct, stalling disk": (False, "stall", 1.0),
+    "queue, stalling disk": (True, "stall", 1.0),
+}
+STALL_EVERY, STALL_SECONDS = 500, 0.005  # e.g. rotation or a busy disk: 5 ms every 500 writes
+
+
+class StallingHandler(RotatingFileHandler):
+    def emit(self, record):
+        self.writes = getattr(self, "writes", 0) + 1
+        if self.writes % STALL_EVERY == 0:
+            time.sleep(STALL_SECONDS)
+        super().emit(record)
+
+
+def file_handlers(directory: Path, log_format: str) -> list[logging.Handler]:
+    if log_format == "old":
+        formatter = logging.Formatter(OLD_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+    else:
+        formatter = make_formatter("text" if log_format == "stall" else log_format)
+    handler_class = StallingHandler if log_format == "stall" else RotatingFileHandler
+    handlers = []
+    for name in ("console.log", "forizec.log"):  # stands in for stdout + forizec.log
+        handler = handler_class(directory / name, maxBytes=5 * 1024 * 1024, backupCount=5)
+        handler.setFormatter(formatter)
+        handler.addFilter(RequestIdFilter())  # done by the queue handler when queued
+        handlers.append(handler)
+    return handlers
+
+
+def scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message) -> None:
+    pass
+
+
+async def run(asgi_app) -> list[float]:
+    timings = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        await asgi_app(scope(), receive, send)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return PlainTextResponse("pong")
+
+    asgi_app = RequestLoggingMiddleware(app)
+    logger = logging.getLogger("forizec")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    settings.QUERY_STATS_ENABLED = False
+    print(
+        f"{'setup':<22}{'event loop us':>14}{'p99.9 us':>10}{'incl. drain us':>16}{'dropped':>9}"
+        f"  ({REQUESTS} requests, best of {ROUNDS})"
+    )
+    for name, (queued, log_format, sample_rate) in SETUPS.items():
+        settings.LOG_ACCESS_SAMPLE_RATE = sample_rate
+        results = []
+        for _ in range(ROUNDS):
+            with tempfile.TemporaryDirectory() as directory:
+                handlers = file_handlers(Path(directory), log_format) if log_format else []
+                listener = queue_handler = None
+                if queued:
+                    queue_handler, listener = queue_handlers(handlers)
+                    logger.handlers = [queue_handler]
+                else:
+                    logger.handlers = handlers
+                start = time.perf_counter()
+                timings = await run(asgi_app)
+                if listener is not None:
+                    listener.stop()
+                total = time.perf_counter() - start
+                for handler in handlers:
+                    handler.close()
+                results.append(
+                    (
+                        sum(timings) / REQUESTS * 1e6,
+                        statistics.quantiles(timings, n=1000)[998] * 1e6,
+                        total / REQUESTS * 1e6,
+                        queue_handler.dropped if queue_handler else 0,
+                    )
+                )
+        loop_us, p999_us, total_us, dropped = min(results)
+        print(f"{name:<22}{loop_us:>14.1f}{p999_us:>10.1f}{total_us:>16.1f}{dropped:>9}")
+    logger.handlers = []
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
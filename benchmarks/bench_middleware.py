@@ -0,0 +1,160 @@
+# benchmarks/bench_middleware.py
+# Latency each middleware layer adds on a trivial route, driven by raw ASGI calls (no HTTP client),
+# and the stacked security layers vs FusedMiddleware. Two request shapes: an API call without
+# cookies, and a browser request carrying session + CSRF cookies and an Origin header.
+# "RequestLogging, legacy" is the BaseHTTPMiddleware version RequestLoggingMiddleware replaced.
+#
+# Run: python -m benchmarks.bench_middleware
+
+import asyncio
+import json
+import time
+from base64 import b64encode
+
+import itsdangerous
+from fastapi import FastAPI
+from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import PlainTextResponse
+from itsdangerous.url_safe import URLSafeSerializer
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.middleware import (
+    CustomResponseCSRFMiddleware,
+    FusedMiddleware,
+    RequestLoggingMiddleware,
+    cors_options,
+    csrf_options,
+    logger,
+    session_options,
+)
+from app.core.query_stats import track_queries
+
+REQUESTS = 5000
+ROUNDS = 5
+HOSTS = ["testserver"]
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, kept as the baseline."""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.perf_counter()
+        with track_queries(route=request.url.path) as query_stats:
+            response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        response.headers["X-Process-Time"] = f"{process_time:.4f} seconds"
+        response.headers["X-DB-Query-Count"] = str(query_stats.count)
+        response.headers["X-DB-Time"] = f"{query_stats.total_time:.4f} seconds"
+        logger.info(
+            f"{request.method} {request.url} - {response.status_code} [{process_time:.4f}s]"
+        )
+        return response
+
+
+def stacked(app):
+    app = CORSMiddleware(app, **cors_options())
+    app = SessionMiddleware(app, **session_options())
+    app = CustomResponseCSRFMiddleware(app, **csrf_options())
+    app = HTTPSRedirectMiddleware(app)
+    return TrustedHostMiddleware(app, allowed_hosts=HOSTS)
+
+
+def fused(app):
+    return FusedMiddleware(
+        app,
+        cors=cors_options(),
+        session=session_options(),
+        csrf=csrf_options(),
+        allowed_hosts=HOSTS,
+        https_redirect=True,
+    )
+
+
+LAYERS = [
+    ("RequestLogging", RequestLoggingMiddleware),
+    ("RequestLogging, legacy", LegacyRequestLoggingMiddleware),
+    ("CORS", lambda app: CORSMiddleware(app, **cors_options())),
+    ("Session", lambda app: SessionMiddleware(app, **session_options())),
+    ("CSRF", lambda app: CustomResponseCSRFMiddleware(app, **csrf_options())),
+    ("HTTPSRedirect", HTTPSRedirectMiddleware),
+    ("TrustedHost", lambda app: TrustedHostMiddleware(app, allowed_hosts=HOSTS)),
+    ("Compression", CompressionMiddleware),
+    ("security, stacked", stacked),
+    ("security, fused", fused),
+]
+
+
+def browser_headers() -> list[tuple[bytes, bytes]]:
+    signer = itsdangerous.TimestampSigner(settings.SECRET_KEY)
+    session = signer.sign(b64encode(json.dumps({"user_id": 1}).encode())).decode()
+    csrf = URLSafeSerializer(settings.CSRF_SECRET, "csrftoken").dumps("token")
+    cookie = f"fourize_sessionid={session}; {settings.CSRF_COOKIE_NAME}={csrf}"
+    return [
+        (b"origin", b"https://app.example"),
+        (b"cookie", cookie.encode()),
+        (b"accept-encoding", b"gzip"),
+    ]
+
+
+SHAPES = {"api": [], "browser": browser_headers()}
+
+
+def scope(extra_headers: list[tuple[bytes, bytes]]) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "https",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), *extra_headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 443),
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message) -> None:
+    pass
+
+
+async def per_request_us(asgi_app, headers) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await asgi_app(scope(headers), receive, send)
+        best = min(best, (time.perf_counter() - started) / REQUESTS)
+    return best * 1e6
+
+
+async def main():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return PlainTextResponse("pong")
+
+    router = app.router  # the route without FastAPI's own error/exception middleware
+    print(f"{'layer':<24}" + "".join(f"{shape + ' +us':>14}" for shape in SHAPES))
+    bare = {shape: await per_request_us(router, headers) for shape, headers in SHAPES.items()}
+    print(f"{'(bare route)':<24}" + "".join(f"{bare[shape]:>14.1f}" for shape in SHAPES))
+    for name, layer in LAYERS:
+        wrapped = layer(router)
+        added = [await per_request_us(wrapped, h) - bare[s] for s, h in SHAPES.items()]
+        print(f"{name:<24}" + "".join(f"{us:>14.1f}" for us in added))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
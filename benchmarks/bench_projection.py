@@ -0,0 +1,93 @@
+# benchmarks/bench_projection.py
+# List read of ActivityLog rows into ActivityLogOut JSON at 10k and 100k rows:
+# ORM entities + per-object model_validate vs the column projection, bulk-validated.
+#
+# Run: python -m benchmarks.bench_projection
+
+import asyncio
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base
+from app.core.projection import select_projection, validate_rows
+from app.models.core_models import ActivityLog, Policy, Procedure, Service
+from app.schemas.activity import ActivityLogOut
+
+SIZES = (10_000, 100_000)
+ROUNDS = 3
+
+list_adapter = TypeAdapter(list[ActivityLogOut])
+
+
+async def orm_path(session) -> bytes:
+    objects = (await session.scalars(select(ActivityLog).order_by(ActivityLog.id))).all()
+    items = [ActivityLogOut.model_validate(obj) for obj in objects]
+    session.expunge_all()  # a request-scoped session would drop the identity map too
+    return list_adapter.dump_json(items)
+
+
+async def projection_validated(session) -> bytes:
+    stmt = select_projection(ActivityLogOut, ActivityLog).order_by(ActivityLog.id)
+    rows = (await session.execute(stmt)).all()
+    return list_adapter.dump_json(validate_rows(ActivityLogOut, rows))
+
+
+async def measure(maker, fn) -> tuple[float, float, int]:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        async with maker() as session:
+            started = time.perf_counter()
+            body = await fn(session)
+            best = min(best, time.perf_counter() - started)
+    async with maker() as session:  # separate run: tracemalloc slows everything down
+        tracemalloc.start()
+        await fn(session)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak / 1024 / 1024, len(body)
+
+
+async def main():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+
+    async with maker() as session:  # type: ignore
+        procedure = Procedure(policy=Policy(service=Service(name="bench"), title="p"), title="p")
+        session.add(procedure)
+        await session.commit()
+        procedure_id = procedure.id
+
+    loaded = 0
+    print(f"{'rows':>8}  {'path':<26}{'seconds':>9}{'rows/s':>11}{'peak MiB':>10}{'JSON KiB':>10}")
+    for size in SIZES:
+        async with maker() as session:  # type: ignore
+            await session.execute(
+                insert(ActivityLog),
+                [
+                    {"procedure_id": procedure_id, "description": f"entry {i}", "outcome": "ok"}
+                    for i in range(size - loaded)
+                ],
+            )
+            await session.commit()
+        loaded = size
+        for label, fn in (
+            ("ORM + model_validate", orm_path),
+            ("projection, bulk validate", projection_validated),
+        ):
+            elapsed, peak, body = await measure(maker, fn)
+            print(
+                f"{size:>8}  {label:<26}{elapsed:>9.3f}{size / elapsed:>11.0f}"
+                f"{peak:>10.1f}{body / 1024:>10.0f}"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
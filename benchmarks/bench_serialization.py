@@ -0,0 +1,103 @@
+# benchmarks/bench_serialization.py
+# Response serialization for list endpoints at 1k/10k/100k items: FastAPI's stock path (validate,
+# dump to Python in JSON mode, json.dumps in JSONResponse) vs FastJSONRoute + FastJSONResponse
+# (validate, dump straight to JSON bytes). p99 at 100k rests on few samples; read it as a max.
+#
+# Run: python -m benchmarks.bench_serialization
+
+import asyncio
+import datetime
+import statistics
+import time
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import FastJSONResponse, _JSONResponseField
+from app.schemas.activity import ActivityLogOut
+from app.schemas.risk import RiskOut
+
+SIZES = {1_000: 200, 10_000: 30, 100_000: 6}  # items -> samples
+
+
+def risk_row(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i,
+        date_raised=datetime.date(2024, 1, 1) + datetime.timedelta(days=i % 365),
+        raised_by=f"user {i % 50}",
+        risk_category="Operational",
+        event=f"Event {i}: supplier outage affecting the weekly delivery run",
+        cause="Single supplier for critical parts",
+        consequence="Delayed production",
+        consequence_rating="Major",
+        likelihood="Possible",
+        risk_rating="High",
+        action="Qualify a second supplier",
+        plan="Quarterly review",
+        risk_owner="Operations",
+        resolve_by=datetime.date(2025, 6, 30),
+        method="Mitigate",
+        progress_compliance_reporting="On track",
+        status="Open",
+        related_policy_id=i % 20 or None,
+        related_procedure_id=None,
+    )
+
+
+def activity_row(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i,
+        procedure_id=i % 40 + 1,
+        description=f"Checklist run {i} completed",
+        performed_by=f"user {i % 50}",
+        outcome="Pass",
+        timestamp=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        + datetime.timedelta(minutes=i),
+    )
+
+
+async def stock(field, rows) -> bytes:
+    content = await serialize_response(field=field, response_content=rows)
+    return JSONResponse(content).body
+
+
+async def fast(field, rows) -> bytes:
+    content = await serialize_response(field=field, response_content=rows)
+    return FastJSONResponse(content).body
+
+
+async def timings(render, field, rows, samples: int) -> list[float]:
+    await render(field, rows)  # warm-up
+    result = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await render(field, rows)
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def p99(values: list[float]) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[98]
+
+
+async def main():
+    models = [("RiskOut", RiskOut, risk_row), ("ActivityLogOut", ActivityLogOut, activity_row)]
+    print(f"{'model':<16}{'items':>8}{'path':>7}{'p50 ms':>10}{'p99 ms':>10}{'bytes':>12}")
+    for name, model, make_row in models:
+        field = create_model_field(f"Response_{name}", list[model], mode="serialization")
+        paths = [("stock", stock, field), ("fast", fast, _JSONResponseField(field))]
+        for size, samples in SIZES.items():
+            rows = [make_row(i) for i in range(size)]
+            for label, render, path_field in paths:
+                values = await timings(render, path_field, rows, samples)
+                body = await render(path_field, rows)
+                print(
+                    f"{name:<16}{size:>8}{label:>7}{statistics.median(values):>10.1f}"
+                    f"{p99(values):>10.1f}{len(body):>12}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
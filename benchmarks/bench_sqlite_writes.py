@@ -0,0 +1,105 @@
+# benchmarks/bench_sqlite_writes.py
+# Concurrent write throughput on a file SQLite database:
+# old engine options (Postgres pool sizing, default journal) vs the SQLite profile + single-writer queue.
+#
+# Run: python -m benchmarks.bench_sqlite_writes
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db import Base
+from app.core.sqlite import SQLiteWriteQueue, install_sqlite_pragmas, sqlite_engine_options
+from app.models.core_models import ActivityLog, Policy, Procedure, Service
+
+WRITERS = 50
+WRITES_PER_WRITER = 20
+
+
+async def prepare(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+    async with maker() as session:  # type: ignore
+        procedure = Procedure(policy=Policy(service=Service(name="bench"), title="p"), title="p")
+        session.add(procedure)
+        await session.commit()
+        return maker, procedure.id
+
+
+async def write_one(session, procedure_id):
+    # typical handler shape: read something, then write
+    await session.scalar(select(func.count(ActivityLog.id)))
+    session.add(ActivityLog(procedure_id=procedure_id, description="bench", performed_by="bench"))
+    await session.flush()
+
+
+async def run_legacy(path: Path):
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = create_async_engine(url, pool_size=10, max_overflow=20, pool_timeout=30)
+    maker, procedure_id = await prepare(engine)
+    errors = 0
+
+    async def writer():
+        nonlocal errors
+        for _ in range(WRITES_PER_WRITER):
+            try:
+                async with maker() as session:  # type: ignore
+                    await write_one(session, procedure_id)
+                    await session.commit()
+            except OperationalError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(WRITERS)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return elapsed, errors
+
+
+async def run_profile(path: Path):
+    url = f"sqlite+aiosqlite:///{path}"
+    engine = create_async_engine(url, **sqlite_engine_options(url, pool_size=1))
+    install_sqlite_pragmas(engine)
+    maker, procedure_id = await prepare(engine)
+    queue = SQLiteWriteQueue(maker)  # type: ignore
+    errors = 0
+
+    async def writer():
+        nonlocal errors
+        for _ in range(WRITES_PER_WRITER):
+            try:
+                await queue.submit(lambda session: write_one(session, procedure_id))
+            except OperationalError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(WRITERS)))
+    elapsed = time.perf_counter() - started
+    await queue.stop()
+    await engine.dispose()
+    return elapsed, errors
+
+
+async def main():
+    total = WRITERS * WRITES_PER_WRITER
+    print(f"{WRITERS} concurrent writers x {WRITES_PER_WRITER} writes = {total} writes")
+    print(f"{'mode':<28}{'seconds':>10}{'writes/s':>12}{'locked errors':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, runner, name in (
+            ("legacy engine options", run_legacy, "legacy.db"),
+            ("sqlite profile + queue", run_profile, "profile.db"),
+        ):
+            elapsed, errors = await runner(Path(tmp) / name)
+            ok = total - errors
+            print(f"{label:<28}{elapsed:>10.2f}{ok / elapsed:>12.0f}{errors:>16}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+# benchmarks/bench_templates.py
+# Cold start of views/public.read_root ("/"): each sample is a fresh Python process that builds the
+# app, runs the lifespan and times its first and second requests. Three setups: no bytecode cache
+# (the old behaviour), a warm bytecode cache, and a warm cache plus precompiling in the lifespan.
+#
+# Run: python -m benchmarks.bench_templates
+
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROCESSES = 15
+MODES = {
+    "no cache": dict(cache=False, precompile=False),
+    "bytecode cache": dict(cache=True, precompile=False),
+    "cache + precompile": dict(cache=True, precompile=True),
+}
+
+
+async def child(cache_dir: str | None, precompile: bool) -> dict[str, float]:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.config import settings
+
+    settings.TEMPLATE_CACHE_DIR = Path(cache_dir) if cache_dir else None
+    settings.TEMPLATE_PRECOMPILE = precompile
+    from app.main import create_app
+
+    app = create_app()
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        startup = time.perf_counter() - start
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                response = await client.get("/")
+                timings.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.status_code
+    return {"startup": startup * 1000, "first": timings[0] * 1000, "second": timings[1] * 1000}
+
+
+def run_child(cache_dir: str | None, precompile: bool) -> dict[str, float]:
+    flag = "1" if precompile else ""
+    args = [sys.executable, "-m", "benchmarks.bench_templates", "child", cache_dir or "", flag]
+    output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        run_child(cache_dir, precompile=True)  # fill the bytecode cache
+        print(f"{'setup':<20}{'startup ms':>12}{'first ms':>10}{'second ms':>11}  (medians)")
+        for label, mode in MODES.items():
+            runs = [
+                run_child(cache_dir if mode["cache"] else None, mode["precompile"])
+                for _ in range(PROCESSES)
+            ]
+            medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            print(
+                f"{label:<20}{medians['startup']:>12.1f}{medians['first']:>10.1f}"
+                f"{medians['second']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["child"]:
+        result = asyncio.run(child(sys.argv[2] or None, bool(sys.argv[3])))
+        print(json.dumps(result))
+    else:
+        main()
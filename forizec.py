@@ -4,9 +4,11 @@ import subprocess
 import sys
 from pathlib import Path
 
+import httpx
 import typer
 from rich.console import Console
 from rich.markdown import Markdown
+from rich.table import Table
 
 from app.core.config import settings
 
@@ -187,6 +189,137 @@ def heads():
     run_alembic_command("heads")
 
 
+# ---------
+# Static assets
+# ---------
+
+
+@app.command()
+def collectstatic(
+    clear: bool = typer.Option(
+        False, "--clear", help="Delete the previous build (and its old hashed files) first."
+    ),
+    minify: bool = typer.Option(settings.STATIC_MINIFY, help="Minify CSS."),
+    images: bool = typer.Option(True, help="Render responsive image variants (needs Pillow)."),
+    workers: int = typer.Option(0, help="Image processes; 0 -> IMAGE_WORKERS or CPU count."),
+):
+    """Build STATIC_ROOT: minified CSS bundles, content-hashed names, .br/.gz files, images, manifest."""
+    from app.core.assets import MANIFEST_NAME, collect_static
+
+    console.print(f"[yellow]Collecting {settings.STATIC_DIR} into {settings.STATIC_ROOT}[/yellow]")
+    try:
+        collected = collect_static(
+            settings.STATIC_DIR,
+            settings.STATIC_ROOT,
+            settings.STATIC_BUNDLES,
+            minify=minify,
+            clear=clear,
+            images=images,
+            workers=workers or None,
+        )
+    except FileNotFoundError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from None
+
+    table = Table(title=f"{len(collected)} static assets")
+    table.add_column("Asset", style="cyan")
+    table.add_column("Hashed name")
+    table.add_column("Size", justify="right")
+    table.add_column("gzip", justify="right")
+    table.add_column("br", justify="right")
+    for asset in collected:
+        table.add_row(
+            asset.name,
+            asset.hashed,
+            str(asset.size),
+            str(asset.variants.get("gzip", "-")),
+            str(asset.variants.get("br", "-")),
+        )
+    console.print(table)
+    print_image_variants({asset.name: asset.image for asset in collected if asset.image})
+    console.print(f"[green]Wrote {settings.STATIC_ROOT / MANIFEST_NAME}[/green]")
+    console.print("Restart the server to serve the new build.")
+
+
+def print_image_variants(images: dict[str, dict]) -> None:
+    if not images:
+        return
+    table = Table(title="Responsive image variants (bytes per width)")
+    table.add_column("Image", style="cyan")
+    table.add_column("Original", justify="right")
+    table.add_column("Format")
+    table.add_column("Variants")
+    for name, meta in images.items():
+        for fmt, variants in meta["variants"].items():
+            sizes = ", ".join(f"{v['width']}w {v['size']}" for v in variants)
+            table.add_row(name, f"{meta['width']}x{meta['height']}", fmt, sizes)
+    console.print(table)
+
+
+@app.command()
+def optimize_images(
+    paths: list[Path] = typer.Argument(..., help="Image files or directories to process."),
+    workers: int = typer.Option(0, help="Processes; 0 -> IMAGE_WORKERS or CPU count."),
+):
+    """Render responsive variants of images (e.g. existing uploads) into MEDIA_DIR/images."""
+    import json
+
+    from app.core.images import Image, build_image_variants, is_raster
+
+    if Image is None:
+        console.print("[red]Pillow is not installed: pip install Pillow[/red]")
+        raise typer.Exit(code=1)
+    sources: dict[str, Path] = {}
+    for path in paths:
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for file in files:
+            if file.is_file() and is_raster(file.name):
+                base = path if path.is_dir() else path.parent
+                sources[file.relative_to(base).as_posix()] = file
+    if not sources:
+        console.print("[yellow]No PNG/JPEG/WebP images found.[/yellow]")
+        raise typer.Exit(code=1)
+
+    target = settings.MEDIA_DIR / "images"
+    images = build_image_variants(sources, target, workers or None)
+    manifest_path = target / "manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    manifest.setdefault("images", {}).update(images)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    print_image_variants(images)
+    console.print(f"[green]Wrote {manifest_path}[/green]")
+
+
+@app.command()
+def compiletemplates(
+    clear: bool = typer.Option(False, "--clear", help="Delete cached bytecode first."),
+):
+    """Compile every template into TEMPLATE_CACHE_DIR so new workers start without compiling."""
+    import shutil
+
+    from app.core.templating import create_environment, precompile_templates, template_names
+
+    cache_dir = settings.TEMPLATE_CACHE_DIR
+    if cache_dir is None:
+        console.print("[red]TEMPLATE_CACHE_DIR is not set; there is nothing to fill.[/red]")
+        raise typer.Exit(code=1)
+    if clear and cache_dir.exists():
+        shutil.rmtree(cache_dir)
+    env = create_environment(settings.TEMPLATES_DIR, cache_dir)
+    compiled = precompile_templates(env)
+
+    table = Table(title=f"{len(compiled)} templates")
+    table.add_column("Template", style="cyan")
+    table.add_column("ms", justify="right")
+    for name, seconds in compiled.items():
+        table.add_row(name, f"{seconds * 1000:.1f}")
+    console.print(table)
+    failed = len(template_names(env)) - len(compiled)
+    if failed:
+        console.print(f"[red]{failed} templates were skipped (see the log).[/red]")
+    console.print(f"[green]Bytecode cached in {cache_dir}[/green]")
+
+
 # ---------
 # Extra utility commands
 # ---------
@@ -238,6 +371,125 @@ def dburl():
     console.print(Markdown(f"**Database URL:** `{settings.DATABASE_URL}`"), style="bold green")
 
 
+@app.command()
+def poolstats(
+    url: str = typer.Option("http://127.0.0.1:8000", help="Base URL of a running Forizec server.")
+):
+    """Show connection pool metrics of a running server."""
+    endpoint = f"{url.rstrip('/')}{settings.API_V1_STR}/admin/pool-stats"
+    try:
+        response = httpx.get(endpoint, timeout=5)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        console.print(f"[red]Could not read pool stats from {endpoint}: {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    for name, stats in response.json().items():
+        table = Table(title=f"Pool: {name} ({stats.get('pool_class')})")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right")
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                value = ", ".join(f"{k}={v}" for k, v in value.items() if k != "buckets")
+            table.add_row(key, str(value))
+        console.print(table)
+
+
+@app.command()
+def advise_indexes(
+    source: list[Path] = typer.Option(
+        None,
+        "--source",
+        help="Patterns file or slow-query log to replay (repeatable). "
+        "Defaults to QUERY_PATTERNS_FILE and LOG_DIR/slow_queries.log.",
+    ),
+    min_count: int = typer.Option(5, help="Ignore patterns seen fewer times than this."),
+    explain: bool = typer.Option(
+        False,
+        help="Estimate each index with EXPLAIN before/after. Creates each index for a moment: "
+        "needs --database-url, point it at a staging copy.",
+    ),
+    database_url: str = typer.Option(
+        None, "--database-url", help="Database to run the --explain estimates against."
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print the report, write no revision."),
+):
+    """Propose composite indexes from observed query patterns as an Alembic revision."""
+    import asyncio
+    from collections import Counter
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.db import Base
+    from app.core.index_advisor import (
+        advise,
+        estimate_benefit,
+        load_patterns,
+        model_snippet,
+        write_revision,
+    )
+    from app.core.logging_config import SLOW_QUERY_LOG_FILE
+    from app.models import core_models  # noqa: F401  (registers the tables on Base.metadata)
+
+    if explain and not database_url:
+        console.print("[red]--explain creates indexes: pass --database-url (a staging copy).[/red]")
+        raise typer.Exit(code=1)
+
+    sources = source or [
+        p for p in (settings.QUERY_PATTERNS_FILE, SLOW_QUERY_LOG_FILE) if p.exists()
+    ]
+    if not sources:
+        console.print("[yellow]No query patterns recorded yet.[/yellow]")
+        console.print("Set INDEX_ADVISOR_RECORD=true or let the slow-query log fill, then retry.")
+        raise typer.Exit(code=1)
+
+    shapes: Counter = Counter()
+    for path in sources:
+        console.print(f"[cyan]Reading {path}[/cyan]")
+        shapes.update(load_patterns(path))
+
+    advice = advise(shapes, Base.metadata, min_count=min_count)
+    if not advice:
+        console.print("[green]No missing composite indexes for the observed patterns.[/green]")
+        return
+
+    if explain:
+
+        async def _estimate():
+            engine = create_async_engine(database_url)
+            try:
+                for item in advice:
+                    await estimate_benefit(engine, item)
+            finally:
+                await engine.dispose()
+
+        asyncio.run(_estimate())
+
+    table = Table(title=f"Index candidates ({sum(shapes.values())} statements replayed)")
+    table.add_column("Index", style="cyan")
+    table.add_column("Seen", justify="right")
+    table.add_column("Cost before", justify="right")
+    table.add_column("Cost after", justify="right")
+    table.add_column("Benefit", justify="right")
+    for item in advice:
+        benefit = f"{item.benefit:.0%}" if item.benefit is not None else (item.error or "-")
+        table.add_row(
+            f"{item.candidate.table} ({', '.join(item.candidate.columns)})",
+            str(item.count),
+            "-" if item.cost_before is None else f"{item.cost_before:g}",
+            "-" if item.cost_after is None else f"{item.cost_after:g}",
+            benefit,
+        )
+    console.print(table)
+
+    if dry_run:
+        return
+    path = write_revision(advice)
+    console.print(f"[green]Wrote candidate revision {path}[/green]")
+    console.print("Add the matching indexes to the models before the next makemigrations:")
+    console.print(model_snippet(advice), markup=False)
+
+
 @app.command()
 def test_relationships(
     k: bool = typer.Option(
@@ -6,7 +6,7 @@ import os
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import pool
+from sqlalchemy import event, pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
@@ -76,6 +76,14 @@ async def run_async_migrations() -> None:
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
+    if _is_sqlite(db_url):
+        # batch mode recreates tables (copy, DROP, rename); with foreign_keys=ON the DROP
+        # would fire ON DELETE CASCADE on the child tables, so enforcement is off while migrating
+        @event.listens_for(connectable.sync_engine, "connect")
+        def _disable_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=OFF")
+            cursor.close()
 
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
@@ -0,0 +1,364 @@
+"""on delete cascade for child foreign keys
+
+Revision ID: 8c51d0a4e2b7
+Revises: 17b34ce81d9a
+Create Date: 2026-10-17 09:12:40.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c51d0a4e2b7'
+down_revision: Union[str, Sequence[str], None] = '17b34ce81d9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('policies', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_policies_service_id_services'), type_='foreignkey')
+        batch_op.create_foreign_key(
+            batch_op.f('fk_policies_service_id_services'),
+            'services',
+            ['service_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('procedures', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_procedures_policy_id_policies'), type_='foreignkey')
+        batch_op.create_foreign_key(
+            batch_op.f('fk_procedures_policy_id_policies'),
+            'policies',
+            ['policy_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('checklist_items', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_checklist_items_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_checklist_items_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_activity_logs_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_activity_logs_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('risks', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_risks_related_policy_id_policies'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_risks_related_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_risks_related_policy_id_policies'),
+            'policies',
+            ['related_policy_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_risks_related_procedure_id_procedures'),
+            'procedures',
+            ['related_procedure_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_documents_uploaded_by_users'), type_='foreignkey')
+        batch_op.drop_constraint(batch_op.f('fk_documents_policy_id_policies'), type_='foreignkey')
+        batch_op.drop_constraint(
+            batch_op.f('fk_documents_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_documents_uploaded_by_users'),
+            'users',
+            ['uploaded_by'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_documents_policy_id_policies'),
+            'policies',
+            ['policy_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_documents_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('compliance_schedule', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_compliance_schedule_assigned_to_users'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_compliance_schedule_related_policy_id_policies'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_compliance_schedule_related_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_compliance_schedule_assigned_to_users'),
+            'users',
+            ['assigned_to'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_compliance_schedule_related_policy_id_policies'),
+            'policies',
+            ['related_policy_id'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_compliance_schedule_related_procedure_id_procedures'),
+            'procedures',
+            ['related_procedure_id'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+
+    with op.batch_alter_table('policy_acceptances', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_policy_acceptances_policy_id_policies'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_policy_acceptances_user_id_users'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_policy_acceptances_policy_id_policies'),
+            'policies',
+            ['policy_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_policy_acceptances_user_id_users'),
+            'users',
+            ['user_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('procedure_acceptances', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_procedure_acceptances_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_procedure_acceptances_user_id_users'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_procedure_acceptances_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_procedure_acceptances_user_id_users'),
+            'users',
+            ['user_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('user_invitations', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_user_invitations_invited_by_users'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_user_invitations_invited_by_users'),
+            'users',
+            ['invited_by'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_reminders_user_id_users'), type_='foreignkey')
+        batch_op.create_foreign_key(
+            batch_op.f('fk_reminders_user_id_users'),
+            'users',
+            ['user_id'],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('policies', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_policies_service_id_services'), type_='foreignkey')
+        batch_op.create_foreign_key(
+            batch_op.f('fk_policies_service_id_services'), 'services', ['service_id'], ['id']
+        )
+
+    with op.batch_alter_table('procedures', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_procedures_policy_id_policies'), type_='foreignkey')
+        batch_op.create_foreign_key(
+            batch_op.f('fk_procedures_policy_id_policies'), 'policies', ['policy_id'], ['id']
+        )
+
+    with op.batch_alter_table('checklist_items', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_checklist_items_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_checklist_items_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+        )
+
+    with op.batch_alter_table('activity_logs', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_activity_logs_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_activity_logs_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+        )
+
+    with op.batch_alter_table('risks', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_risks_related_policy_id_policies'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_risks_related_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_risks_related_policy_id_policies'),
+            'policies',
+            ['related_policy_id'],
+            ['id'],
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_risks_related_procedure_id_procedures'),
+            'procedures',
+            ['related_procedure_id'],
+            ['id'],
+        )
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_documents_uploaded_by_users'), type_='foreignkey')
+        batch_op.drop_constraint(batch_op.f('fk_documents_policy_id_policies'), type_='foreignkey')
+        batch_op.drop_constraint(
+            batch_op.f('fk_documents_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_documents_uploaded_by_users'), 'users', ['uploaded_by'], ['id']
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_documents_policy_id_policies'), 'policies', ['policy_id'], ['id']
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_documents_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+        )
+
+    with op.batch_alter_table('compliance_schedule', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_compliance_schedule_assigned_to_users'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_compliance_schedule_related_policy_id_policies'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_compliance_schedule_related_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_compliance_schedule_assigned_to_users'), 'users', ['assigned_to'], ['id']
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_compliance_schedule_related_policy_id_policies'),
+            'policies',
+            ['related_policy_id'],
+            ['id'],
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_compliance_schedule_related_procedure_id_procedures'),
+            'procedures',
+            ['related_procedure_id'],
+            ['id'],
+        )
+
+    with op.batch_alter_table('policy_acceptances', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_policy_acceptances_policy_id_policies'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_policy_acceptances_user_id_users'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_policy_acceptances_policy_id_policies'),
+            'policies',
+            ['policy_id'],
+            ['id'],
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_policy_acceptances_user_id_users'), 'users', ['user_id'], ['id']
+        )
+
+    with op.batch_alter_table('procedure_acceptances', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_procedure_acceptances_procedure_id_procedures'), type_='foreignkey'
+        )
+        batch_op.drop_constraint(
+            batch_op.f('fk_procedure_acceptances_user_id_users'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_procedure_acceptances_procedure_id_procedures'),
+            'procedures',
+            ['procedure_id'],
+            ['id'],
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_procedure_acceptances_user_id_users'), 'users', ['user_id'], ['id']
+        )
+
+    with op.batch_alter_table('user_invitations', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_user_invitations_invited_by_users'), type_='foreignkey'
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_user_invitations_invited_by_users'), 'users', ['invited_by'], ['id']
+        )
+
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_reminders_user_id_users'), type_='foreignkey')
+        batch_op.create_foreign_key(
+            batch_op.f('fk_reminders_user_id_users'), 'users', ['user_id'], ['id']
+        )